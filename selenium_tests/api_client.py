@@ -0,0 +1,98 @@
+"""
+Client for the users REST API served by server/routes/api.js.
+
+Used to set up and inspect test data without going through the browser.
+All requests share one keep-alive session, and bulk creation fans out over
+a thread pool sized to the connection pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class UsersApi:
+    """Keep-alive client for the /users endpoints."""
+
+    def __init__(self, api_url, pool_size=16, timeout=30):
+        self.api_url = api_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def list_users(self, limit=None):
+        """Return all users (or the first `limit`) in insertion order."""
+        params = {"limit": limit} if limit is not None else None
+        response = self.session.get(f"{self.api_url}/users", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def create_user(self, name, email, age):
+        """Create a user and return the saved document."""
+        response = self.session.post(
+            f"{self.api_url}/addUser",
+            json={"name": name, "email": email, "age": age},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def update_user(self, user_id, name, email, age):
+        """Update a user. Returns False if the user does not exist."""
+        response = self.session.put(
+            f"{self.api_url}/users/{user_id}",
+            json={"name": name, "email": email, "age": age},
+            timeout=self.timeout,
+        )
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def delete_user(self, user_id):
+        """Delete a user. Returns False if the user was already gone."""
+        response = self.session.delete(f"{self.api_url}/users/{user_id}", timeout=self.timeout)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def create_users(self, users, concurrency=None):
+        """
+        Create many users concurrently and return their ids in input order.
+
+        `users` is an iterable of dicts with name, email and age. If any
+        creation fails, for whatever reason, the first error is raised once
+        all requests have finished, with the ids that were created attached
+        as `created_ids` so callers can still clean them up.
+        """
+        users = list(users)
+        ids = [None] * len(users)
+        errors = []
+        with ThreadPoolExecutor(max_workers=concurrency or self.pool_size) as executor:
+            futures = {
+                executor.submit(self.create_user, user["name"], user["email"], user["age"]): i
+                for i, user in enumerate(users)
+            }
+            for future in as_completed(futures):
+                try:
+                    ids[futures[future]] = future.result()["_id"]
+                except Exception as error:  # Not only HTTP errors: a reply without "_id" too
+                    errors.append(error)
+        if errors:
+            error = errors[0]
+            error.created_ids = [user_id for user_id in ids if user_id is not None]
+            raise error
+        return ids
+
+    def delete_users(self, user_ids, concurrency=None):
+        """Delete many users concurrently. Returns how many actually existed."""
+        with ThreadPoolExecutor(max_workers=concurrency or self.pool_size) as executor:
+            return sum(executor.map(self.delete_user, user_ids))
+
+    def close(self):
+        self.session.close()
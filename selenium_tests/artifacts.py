@@ -0,0 +1,145 @@
+"""
+Failure-only screenshot and DOM artifacts.
+
+With `--artifact-steps N`, page objects capture a screenshot and the DOM
+after every step into a per-test ring buffer of the last N steps, held in
+memory as the base64 JPEG and HTML string the browser returned, with
+nothing decoded or written on the test thread. When a test passes the
+buffer is dropped. When it fails, the buffer plus a final capture is handed
+to a background thread, which decodes it and writes one compressed zip per
+test. Step captures cost two browser round trips each, so they are off by
+default and only the capture at failure is taken. Write errors are raised
+by the next flush() or by close().
+"""
+
+import base64
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+UNSAFE_CHARS = re.compile(r"[^\w.-]+")
+DOM_SNAPSHOT_JS = "return document.documentElement ? document.documentElement.outerHTML : '';"
+
+
+class Capture:
+    """One screenshot/DOM pair, still encoded as the browser returned it."""
+
+    __slots__ = ("label", "timestamp", "screenshot", "dom")
+
+    def __init__(self, label, timestamp, screenshot, dom):
+        self.label = label
+        self.timestamp = timestamp
+        self.screenshot = screenshot
+        self.dom = dom
+
+
+def take_capture(driver, label):
+    """Grab a screenshot (JPEG via CDP where available, it is cheaper than PNG) and the DOM."""
+    try:
+        screenshot = ("jpg", driver.execute_cdp_cmd(
+            "Page.captureScreenshot", {"format": "jpeg", "quality": 70, "optimizeForSpeed": True}
+        )["data"])
+    except (AttributeError, WebDriverException):
+        try:
+            screenshot = ("png", driver.get_screenshot_as_base64())
+        except WebDriverException:
+            screenshot = None
+    try:
+        dom = driver.execute_script(DOM_SNAPSHOT_JS)
+    except WebDriverException:
+        dom = None
+    return Capture(label, time.time(), screenshot, dom)
+
+
+class StepArtifacts:
+    """Ring buffer of the most recent step captures of one test's driver, plus the capture at failure."""
+
+    def __init__(self, nodeid, driver, capacity=0):
+        self.nodeid = nodeid
+        self.driver = driver
+        self.steps = deque(maxlen=capacity)
+        self.failure = None
+
+    def capture(self, label):
+        """Record a step. Older steps fall out of the buffer; capacity 0 disables step captures."""
+        if self.steps.maxlen:
+            self.steps.append(take_capture(self.driver, label))
+
+    def capture_failure(self):
+        """Record the page as it was when the test failed."""
+        self.failure = take_capture(self.driver, "failure")
+
+    def __iter__(self):
+        yield from self.steps
+        if self.failure is not None:
+            yield self.failure
+
+
+class ArtifactWriteError(RuntimeError):
+    """Raised when writing artifacts in the background failed."""
+
+
+class ArtifactRecorder:
+    """
+    Hands out per-test buffers and writes failed tests' buffers to
+    `directory` on a single background thread.
+    """
+
+    def __init__(self, directory, capacity=0):
+        self.directory = directory
+        self.capacity = capacity
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts")
+        self._pending = []
+
+    def start(self, nodeid, driver):
+        return StepArtifacts(nodeid, driver, self.capacity)
+
+    def path_for(self, nodeid):
+        return os.path.join(self.directory, UNSAFE_CHARS.sub("_", nodeid).strip("_") + ".zip")
+
+    def flush(self, artifacts):
+        """
+        Queue a buffer for writing in the background. Returns the zip path, or
+        None if empty. Raises ArtifactWriteError if an earlier write failed.
+        """
+        self._check_writes(wait=False)
+        captures = list(artifacts)
+        if not captures:
+            return None
+        path = self.path_for(artifacts.nodeid)
+        self._pending.append((path, self._executor.submit(self._write, path, captures)))
+        return path
+
+    def _check_writes(self, wait):
+        """Forget finished writes and raise for the ones that failed."""
+        finished = [(path, future) for path, future in self._pending if wait or future.done()]
+        self._pending = [entry for entry in self._pending if entry not in finished]
+        errors = [(path, future.exception()) for path, future in finished if future.exception() is not None]
+        if errors:
+            raise ArtifactWriteError("Writing artifacts failed: " + "; ".join(
+                f"{path}: {error!r}" for path, error in errors
+            ))
+
+    def _write(self, path, captures):
+        os.makedirs(self.directory, exist_ok=True)
+        with zipfile.ZipFile(path, "w") as archive:
+            for number, capture in enumerate(captures, 1):
+                clock = time.strftime("%H%M%S", time.localtime(capture.timestamp))
+                stem = f"{number:02d}-{clock}-{UNSAFE_CHARS.sub('_', capture.label)}"
+                if capture.screenshot:
+                    extension, data = capture.screenshot
+                    # Images are already compressed; only the DOM benefits from deflate
+                    archive.writestr(f"{stem}.{extension}", base64.b64decode(data), zipfile.ZIP_STORED)
+                if capture.dom is not None:
+                    archive.writestr(f"{stem}.html", capture.dom, zipfile.ZIP_DEFLATED)
+        return path
+
+    def close(self):
+        """Wait for pending writes; raises ArtifactWriteError if any failed."""
+        self._executor.shutdown(wait=True)
+        self._check_writes(wait=True)
@@ -0,0 +1,60 @@
+"""
+Tracking and cleanup of users created by tests.
+
+Ids are collected from two places: responses to POST /api/addUser made
+through the shared UsersApi session (seeding, contract mode), observed with
+a requests response hook, and creations made by the app in the browser,
+which the UI tracker records in sessionStorage (see TAKE_CREATED_USERS_JS).
+At teardown every collected user is deleted concurrently over the pooled
+API connection.
+"""
+
+import threading
+from urllib.parse import urlparse
+
+
+class CreatedUsers:
+    """Ids of the users created during one test. Use as a context manager to observe the API."""
+
+    def __init__(self, api):
+        self.api = api
+        self.ids = set()
+        self._lock = threading.Lock()
+
+    def add(self, *user_ids):
+        with self._lock:
+            self.ids.update(user_ids)
+
+    def observe(self, response, *args, **kwargs):
+        """requests response hook: record the _id of every user created through the session."""
+        request = response.request
+        if request.method == "POST" and urlparse(request.url).path.endswith("/addUser") and response.ok:
+            try:
+                self.add(response.json()["_id"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        return response
+
+    def harvest(self, driver):
+        """Collect ids of users the app created in the browser. Call before the browser is reset."""
+        # Imported here so API-only runs never load Selenium
+        from selenium.common.exceptions import WebDriverException
+        from .pages.base_page import TAKE_CREATED_USERS_JS
+
+        try:
+            self.add(*(driver.execute_script(TAKE_CREATED_USERS_JS) or []))
+        except WebDriverException:
+            pass  # No app page loaded (e.g. about:blank has no sessionStorage)
+
+    def delete_all(self, concurrency=None):
+        """Delete every recorded user concurrently. Returns how many still existed."""
+        with self._lock:
+            user_ids, self.ids = sorted(self.ids), set()
+        return self.api.delete_users(user_ids, concurrency=concurrency) if user_ids else 0
+
+    def __enter__(self):
+        self.api.session.hooks["response"].append(self.observe)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.api.session.hooks["response"].remove(self.observe)
@@ -1,35 +1,246 @@
 import pytest
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-import chromedriver_binary  # This will add ChromeDriver to PATH
-from dotenv import load_dotenv
+import hashlib
+import json
 import time
+from selenium_tests.api_client import UsersApi
+from selenium_tests.cleanup import CreatedUsers
+from selenium_tests.impact import ImpactRecorder
+from selenium_tests.parallel import namespaced_email
+from selenium_tests.readiness import frontend_probe, users_api_probe, wait_until_ready
+from selenium_tests.standin_backend import StandinBackend
 
-# Load environment variables
-load_dotenv()
+# Selenium, chromedriver_binary and the browser-side helpers are imported in
+# the fixtures that need them, so collection and API-only runs never pay for
+# them and never start Chrome.
+
+def pytest_addoption(parser):
+    # Load environment variables before they are read as option defaults
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    parser.addoption(
+        "--standin-backend",
+        action="store_true",
+        default=os.getenv("STANDIN_BACKEND") == "1",
+        help="Serve the API from the in-process stand-in instead of the Node server",
+    )
+    parser.addoption(
+        "--page-mode",
+        choices=("ui", "api"),
+        default=os.getenv("PAGE_MODE", "ui"),
+        help="Run contract tests through the browser (ui) or straight against the REST API (api)",
+    )
+    parser.addoption(
+        "--record-impact",
+        action="store_true",
+        help="Record which files each test depends on (see impact.py)",
+    )
+    parser.addoption(
+        "--impacted",
+        action="store_true",
+        help="Only run tests affected by changes since their last recorded run (implies --record-impact)",
+    )
+    parser.addoption(
+        "--profile-webdriver",
+        action="store_true",
+        default=os.getenv("PROFILE_WEBDRIVER") == "1",
+        help="Time every WebDriver command and report per test and per page-object method",
+    )
+    parser.addoption(
+        "--telemetry",
+        action="store_true",
+        default=os.getenv("TELEMETRY") == "1",
+        help="Record per-test durations, WebDriver command counts and browser metrics in SQLite",
+    )
+    parser.addoption(
+        "--telemetry-db",
+        default=os.getenv("TELEMETRY_DB"),
+        help="Telemetry database (default .telemetry.sqlite, see telemetry.py)",
+    )
+    parser.addoption(
+        "--artifact-steps",
+        type=int,
+        default=int(os.getenv("ARTIFACT_STEPS", "0")),
+        metavar="N",
+        help="Keep a screenshot and DOM of the last N page-object steps per test, saved if it fails (see artifacts.py)",
+    )
+    parser.addoption(
+        "--shard",
+        default=os.getenv("SHARD"),
+        metavar="i/N",
+        help="Run only the i-th of N duration-balanced shards of the selected tests (see sharding.py)",
+    )
+    parser.addoption(
+        "--shard-durations",
+        default=os.getenv("SHARD_DURATIONS"),
+        help="Duration history used to balance the shards (default .test_durations.json)",
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "browser: test drives Chrome; added automatically, deselect with -m 'not browser'"
+    )
+    config.addinivalue_line(
+        "markers", "contract: test written against the page object; runs in both --page-mode=ui and api"
+    )
+    if config.getoption("impacted") or config.getoption("record_impact"):
+        config.pluginmanager.register(
+            ImpactRecorder(select=config.getoption("impacted")), "impact-recorder"
+        )
+    if config.getoption("telemetry"):
+        from selenium_tests.telemetry import DEFAULT_DB, TelemetryRecorder
+        config.pluginmanager.register(
+            TelemetryRecorder(config, config.getoption("telemetry_db") or DEFAULT_DB), "telemetry"
+        )
+    if config.getoption("shard"):
+        from selenium_tests.sharding import DEFAULT_DURATIONS, ShardSelector, parse_shard
+        try:
+            index, count = parse_shard(config.getoption("shard"))
+        except ValueError as error:
+            raise pytest.UsageError(str(error))
+        config.pluginmanager.register(
+            ShardSelector(index, count, config.getoption("shard_durations") or DEFAULT_DURATIONS), "shard-selector"
+        )
+    if config.getoption("profile_webdriver"):
+        from selenium_tests.perf.webdriver_profiler import WebDriverProfiler
+        config.pluginmanager.register(WebDriverProfiler(), "webdriver-profiler")
+
+@pytest.fixture(scope="session")
+def driver_pool(app_ready):
+    """
+    Fixture providing a pool of warm Chrome sessions for this process.
+    Under pytest-xdist every worker process gets its own pool. Nothing is
+    imported or launched until the first browser test needs it.
+    DRIVER_POOL_SIZE sets how many browsers are kept launched and
+    DRIVER_MAX_USES how many tests a browser serves before it is recycled.
+    """
+    import chromedriver_binary  # This will add ChromeDriver to PATH
+    from selenium_tests.driver_pool import DriverPool
+    
+    pool = DriverPool(
+        size=int(os.getenv("DRIVER_POOL_SIZE", "1")),
+        max_uses=int(os.getenv("DRIVER_MAX_USES", "25")),
+    )
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+@pytest.fixture(scope="session")
+def artifact_recorder(pytestconfig):
+    """
+    Fixture collecting screenshots and DOM snapshots of failed tests.
+    ARTIFACT_DIR sets where the per-test zips go and --artifact-steps
+    (ARTIFACT_STEPS) how many recent steps are captured in memory per test
+    (0, the default, keeps only the capture taken at failure).
+    """
+    from selenium_tests.artifacts import ArtifactRecorder
+    
+    recorder = ArtifactRecorder(
+        os.getenv("ARTIFACT_DIR", "test-reports/artifacts"),
+        capacity=pytestconfig.getoption("artifact_steps"),
+    )
+    try:
+        yield recorder
+    finally:
+        recorder.close()
 
 @pytest.fixture(scope="session")
-def driver():
+def wait_timeouts():
     """
-    Fixture to create and manage Chrome WebDriver instance.
-    Using session scope to reuse the same browser for all tests.
+    Fixture providing page-object wait timeouts learned from earlier runs.
+    WAIT_HISTORY sets the history file (empty for fixed timeouts) and
+    WAIT_TIMEOUT_FACTOR the multiple of the p99 latency to wait for.
     """
-    chrome_options = Options()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--headless")  # Run in headless mode for Docker
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
+    from selenium_tests.wait_timeouts import DEFAULT_HISTORY, WaitTimeouts
+    
+    timeouts = WaitTimeouts(
+        os.getenv("WAIT_HISTORY", DEFAULT_HISTORY) or None,
+        factor=float(os.getenv("WAIT_TIMEOUT_FACTOR", "3")),
+    )
+    try:
+        yield timeouts
+    finally:
+        timeouts.save()
 
+@pytest.fixture
+def driver(driver_pool, artifact_recorder, wait_timeouts, created_users, request):
+    """
+    Fixture handing each test a clean Chrome WebDriver instance.
+    The browser comes from the pool and is reset (cookies, storage,
+    about:blank) when the test finishes instead of being relaunched.
+    Browser performance metrics of the last page are attached to the report,
+    and recent page-object steps are saved as artifacts if the test fails.
+    Page objects built on it use the learned wait timeouts.
+    Users the app created are handed to created_users before the reset.
+    """
+    driver = driver_pool.acquire()
+    profiler = request.config.pluginmanager.get_plugin("webdriver-profiler")
+    if profiler:
+        profiler.attach(driver)
+    telemetry = request.config.pluginmanager.get_plugin("telemetry")
+    if telemetry:
+        telemetry.attach(driver)
+    driver.artifacts = artifact_recorder.start(request.node.nodeid, driver)
+    driver.wait_timeouts = wait_timeouts
     try:
-        # Initialize WebDriver
-        service = Service()
-        driver = webdriver.Chrome(service=service, options=chrome_options)
         yield driver
+        attach_browser_metrics(request.node, driver)
+        if item_failed(request.node):
+            driver.artifacts.capture_failure()
+            request.node.user_properties.append(("artifacts", artifact_recorder.flush(driver.artifacts)))
     finally:
-        driver.quit()
+        created_users.harvest(driver)
+        driver.artifacts = None
+        driver_pool.release(driver)
+
+def item_failed(item):
+    """True if the setup or call phase of the test failed (see pytest_runtest_makereport)."""
+    return any(
+        getattr(item, f"rep_{when}", None) is not None and getattr(item, f"rep_{when}").failed
+        for when in ("setup", "call")
+    )
+
+def attach_browser_metrics(item, driver):
+    """Record the current page's performance metrics as a test property."""
+    from selenium.common.exceptions import WebDriverException
+    from selenium_tests.perf.browser_metrics import collect_browser_metrics
+    
+    try:
+        if not driver.current_url.startswith("http"):
+            return
+        metrics = collect_browser_metrics(driver)
+    except WebDriverException:
+        return
+    item.browser_metrics = metrics
+    item.user_properties.append(("browser_metrics", json.dumps(metrics.values, sort_keys=True)))
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Mark the tests that will start a browser. In API mode only contract
+    tests can run; the others need the browser and are skipped.
+    """
+    api_mode = config.getoption("page_mode") == "api"
+    skip_ui = pytest.mark.skip(reason="needs the browser; --page-mode=api only runs contract tests")
+    for item in items:
+        if "driver" in item.fixturenames or ("page" in item.fixturenames and not api_mode):
+            item.add_marker(pytest.mark.browser)
+        if api_mode and "driver" in item.fixturenames and not item.get_closest_marker("contract"):
+            item.add_marker(skip_ui)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase's report on the item and show browser metrics in the pytest-html report."""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    metrics = getattr(item, "browser_metrics", None)
+    pytest_html = item.config.pluginmanager.getplugin("html")
+    if report.when == "teardown" and metrics and pytest_html:
+        report.extras = getattr(report, "extras", []) + [
+            pytest_html.extras.json(metrics.values, name="Browser metrics")
+        ]
 
 @pytest.fixture(scope="session")
 def base_url():
@@ -37,24 +248,111 @@ def base_url():
     return os.getenv("FRONTEND_URL", "http://localhost:5173")
 
 @pytest.fixture(scope="session")
-def api_url():
+def standin_backend():
+    """
+    Fixture running the in-memory stand-in for the Express/Mongo backend.
+    Listens on STANDIN_PORT (default 3000, the client's default API port)
+    and adds STANDIN_LATENCY_MS to every response.
+    """
+    backend = StandinBackend(
+        port=int(os.getenv("STANDIN_PORT", "3000")),
+        latency_ms=float(os.getenv("STANDIN_LATENCY_MS", "0")),
+    )
+    with backend:
+        yield backend
+
+@pytest.fixture(scope="session")
+def api_url(request):
     """Get the base URL for the backend API."""
+    if request.config.getoption("--standin-backend"):
+        return request.getfixturevalue("standin_backend").url
     return os.getenv("BACKEND_URL", "http://localhost:3000/api")
 
+@pytest.fixture(scope="session")
+def users_api(api_url):
+    """Keep-alive client for the users REST API, shared by the whole session."""
+    api = UsersApi(api_url)
+    try:
+        yield api
+    finally:
+        api.close()
+
+@pytest.fixture(scope="session")
+def api_ready(api_url):
+    """
+    Fixture waiting until GET /api/users answers correctly, i.e. the server
+    is up and connected to MongoDB. Polls with exponential backoff and
+    jitter for up to READY_TIMEOUT seconds (default 120).
+    """
+    wait_until_ready([users_api_probe(api_url)], timeout=float(os.getenv("READY_TIMEOUT", "120")))
+
+@pytest.fixture(scope="session")
+def app_ready(base_url, api_url, api_ready):
+    """Fixture additionally waiting until the frontend serves its page."""
+    wait_until_ready([frontend_probe(base_url)], timeout=float(os.getenv("READY_TIMEOUT", "120")))
+
+@pytest.fixture
+def page(request, users_api, api_ready):
+    """
+    Fixture providing the user management page for contract tests.
+    With --page-mode=ui (the default) this is UserManagementPage on a pooled
+    browser; with --page-mode=api it is UserManagementApi, which runs the
+    same test bodies against the REST API without launching Chrome.
+    """
+    if request.config.getoption("page_mode") == "api":
+        from selenium_tests.pages.user_management_api import UserManagementApi
+        return UserManagementApi(users_api)
+    from selenium_tests.pages.user_management_page import UserManagementPage
+    return UserManagementPage(request.getfixturevalue("driver"))
+
+@pytest.fixture(autouse=True)
+def created_users(users_api):
+    """
+    Fixture recording the _id of every user created during the test, whether
+    through the shared API session or by the app in the browser, and
+    deleting them all concurrently at teardown so the database stays small
+    and tests stay isolated.
+    """
+    with CreatedUsers(users_api) as tracker:
+        yield tracker
+    tracker.delete_all()
+
+@pytest.fixture
+def seed_users(users_api, api_ready):
+    """
+    Fixture returning a function that creates users directly through
+    POST /api/addUser, concurrently over the pooled session, and returns
+    their _ids. Much faster than adding precondition users through the form.
+    The users are deleted again when the test finishes.
+    """
+    def seed(users, concurrency=None):
+        return users_api.create_users(users, concurrency=concurrency)
+    return seed
+
+@pytest.fixture
+def unique_email(request):
+    """
+    Fixture returning a function that makes an email unique to this worker
+    and test, so parallel workers and repeated tests never collide on the
+    unique email index.
+    """
+    tag = hashlib.sha1(request.node.nodeid.encode()).hexdigest()[:6]
+    return lambda email: namespaced_email(email, tag)
+
 @pytest.fixture
-def test_data():
+def test_data(unique_email):
     """
     Fixture to provide test data for user operations.
     """
     return {
         "valid_user": {
             "name": "John Doe",
-            "email": "john.doe@test.com",
+            "email": unique_email("john.doe@test.com"),
             "age": "30"
         },
         "updated_user": {
             "name": "John Updated",
-            "email": "john.updated@test.com",
+            "email": unique_email("john.updated@test.com"),
             "age": "31"
         },
         "invalid_user": {
@@ -64,7 +362,7 @@ def test_data():
         },
         "duplicate_email": {
             "name": "Jane Doe",
-            "email": "john.doe@test.com",  # Same email as valid_user
+            "email": unique_email("john.doe@test.com"),  # Same email as valid_user
             "age": "25"
         }
     } 
\ No newline at end of file
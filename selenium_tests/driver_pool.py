@@ -0,0 +1,175 @@
+"""
+Pool of warm, reusable Chrome sessions.
+
+Launching Chrome costs seconds, so browsers are started once (in the
+background) and handed out per test. Between tests a browser is reset by
+clearing cookies and storage and navigating to about:blank, which is much
+cheaper than a relaunch but leaves no state behind for the next test.
+A browser is retired and replaced after a configurable number of uses, or
+as soon as it stops responding.
+"""
+
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from .pages.base_page import UI_TRACKER_JS
+
+CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def build_chrome_options():
+    """Chrome options used for every browser in the suite."""
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--headless")  # Run in headless mode for Docker
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    # Leave alerts open when a script runs so waits don't dismiss them
+    chrome_options.unhandled_prompt_behavior = "ignore"
+    # Log DevTools Network events so tests can see the requests an action makes
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return chrome_options
+
+
+def launch_driver():
+    """Start a new headless Chrome session with the UI tracker preloaded."""
+    service = Service()
+    driver = webdriver.Chrome(service=service, options=build_chrome_options())
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": UI_TRACKER_JS})
+    # Start DevTools performance counters so Performance.getMetrics has data
+    driver.execute_cdp_cmd("Performance.enable", {})
+    return driver
+
+
+class DriverPool:
+    """
+    Hands out pre-launched WebDriver sessions and resets them on return.
+
+    `size` browsers are launched in parallel as soon as the pool is created.
+    A browser is replaced in the background once it has served `max_uses`
+    tests or fails its reset, so a crash only ever costs one relaunch.
+    """
+
+    def __init__(self, size=1, max_uses=25, launcher=launch_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self._launcher = launcher
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+        for _ in range(size):
+            self._spawn()
+
+    def acquire(self, timeout=120):
+        """Take a clean browser from the pool, waiting for a launch if none is idle."""
+        try:
+            item = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(f"No browser became available within {timeout}s")
+        if isinstance(item, Exception):
+            # Keep the pool at full size so the next test can try again
+            self._spawn()
+            raise item
+        with self._lock:
+            self._uses[item] += 1
+        return item
+
+    def release(self, driver):
+        """Return a browser to the pool, recycling it if it is worn out or broken."""
+        with self._lock:
+            worn_out = self._uses[driver] >= self.max_uses
+        if self._closed or worn_out or not self._reset(driver):
+            self._retire(driver)
+            if not self._closed:
+                self._spawn()
+            return
+        self._idle.put(driver)
+
+    def close(self, timeout=30):
+        """Quit every idle browser and wait for pending launches and quits to finish."""
+        self._closed = True
+        for thread in list(self._threads):
+            thread.join(timeout)
+        while True:
+            try:
+                item = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, Exception):
+                self._quit(item)
+
+    def _spawn(self):
+        """Launch a browser on a background thread and add it to the pool."""
+        self._start_thread(self._launch_into_pool)
+
+    def _start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+
+    def _launch_into_pool(self):
+        try:
+            driver = self._launcher()
+        except Exception as error:
+            self._idle.put(error)
+            return
+        if self._closed:
+            self._quit(driver)
+            return
+        with self._lock:
+            self._uses[driver] = 0
+        self._idle.put(driver)
+
+    def _reset(self, driver):
+        """Wipe cookies, storage and the current page. Returns False if the browser is unusable."""
+        try:
+            try:
+                driver.switch_to.alert.dismiss()
+            except NoAlertPresentException:
+                pass
+            driver.execute_script(CLEAR_STORAGE_JS)
+            try:
+                # Clears cookies for every domain, not just the current one
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except (AttributeError, WebDriverException):
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+            try:
+                # Restart the DevTools counters so each test's metrics cover only that test
+                driver.execute_cdp_cmd("Performance.disable", {})
+                driver.execute_cdp_cmd("Performance.enable", {})
+            except (AttributeError, WebDriverException):
+                pass
+            try:
+                driver.get_log("performance")  # Don't let the next test's capture start with this one's log
+            except WebDriverException:
+                pass
+            return True
+        except WebDriverException:
+            return False
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        self._start_thread(self._quit, driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
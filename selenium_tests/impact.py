@@ -0,0 +1,257 @@
+"""
+Change-aware test selection.
+
+While tests run, records what each one depends on:
+
+- the Python files it executed (tests, fixtures, page objects, helpers),
+  plus the page-object methods it called
+- the server routes it exercised (through UsersApi, or implicitly through
+  the browser) and therefore the server files behind them
+- the client sources, for tests that drive the browser
+
+Each dependency is stored with the content hash it had at the time, together
+with the test's last outcome, in a JSON cache. With --impacted, only tests
+whose dependencies changed since their last run, tests that failed last
+time, and tests that have never run are executed.
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(PACKAGE_DIR)
+DEFAULT_CACHE = os.path.join(PACKAGE_DIR, ".test_impact.json")
+
+CLIENT_FILES = (
+    "client/src/App.jsx",
+    "client/src/main.jsx",
+    "client/src/index.css",
+    "client/index.html",
+    "client/package.json",
+    "client/vite.config.js",
+)
+SERVER_FILES = (
+    "server/index.js",
+    "server/routes/api.js",
+    "server/config/db.js",
+    "server/package.json",
+)
+# Route -> files that implement it, beyond the shared SERVER_FILES
+ROUTE_FILES = {
+    "GET /users": ("server/controllers/userController.js", "server/models/user.js"),
+    "POST /addUser": ("server/controllers/userController.js", "server/models/user.js"),
+    "PUT /users/:id": ("server/controllers/userController.js", "server/models/user.js"),
+    "DELETE /users/:id": ("server/controllers/userController.js", "server/models/user.js"),
+}
+# UsersApi methods -> the route each one calls. The batch methods are listed
+# too, because their per-user calls run on pool threads that older Pythons
+# don't profile.
+API_METHOD_ROUTES = {
+    "UsersApi.list_users": "GET /users",
+    "UsersApi.create_user": "POST /addUser",
+    "UsersApi.create_users": "POST /addUser",
+    "UsersApi.update_user": "PUT /users/:id",
+    "UsersApi.delete_user": "DELETE /users/:id",
+    "UsersApi.delete_users": "DELETE /users/:id",
+}
+# Every test depends on the fixtures, the plugin itself and the pinned packages
+ALWAYS_FILES = (
+    "selenium_tests/conftest.py",
+    "selenium_tests/impact.py",
+    "selenium_tests/requirements.txt",
+)
+# Session-scoped fixture -> modules whose code runs in its setup or teardown.
+# That code runs once, inside whichever test first needs the fixture, so it
+# can't be recorded per test; every test using the fixture depends on it.
+SESSION_FIXTURE_FILES = {
+    "app_ready": ("selenium_tests/readiness.py",),
+    "api_ready": ("selenium_tests/readiness.py",),
+    "api_url": ("selenium_tests/standin_backend.py",),  # Started with --standin-backend
+    "users_api": ("selenium_tests/api_client.py",),
+    "driver_pool": ("selenium_tests/driver_pool.py",),
+    "artifact_recorder": ("selenium_tests/artifacts.py",),
+    "wait_timeouts": ("selenium_tests/wait_timeouts.py",),
+}
+# The React client calls every route, so browser tests depend on all of them
+BROWSER_ROUTES = tuple(ROUTE_FILES)
+
+
+# Python 3.12+: sys.monitoring reports each function once per test and is
+# then disabled for it, so code that runs often (WebDriver I/O) costs nothing
+MONITORING = getattr(sys, "monitoring", None)
+
+_hashes = {}
+
+
+def file_hash(path):
+    """Content hash of a repo-relative path, or None if it doesn't exist. Memoized per process."""
+    if path not in _hashes:
+        try:
+            with open(os.path.join(REPO_ROOT, path), "rb") as f:
+                _hashes[path] = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            _hashes[path] = None
+    return _hashes[path]
+
+
+def _repo_path(filename):
+    return os.path.relpath(filename, REPO_ROOT).replace(os.sep, "/")
+
+
+def load_cache(path=DEFAULT_CACHE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"tests": {}}
+
+
+def is_affected(entry):
+    """True if a cached test must run again: it didn't pass or a dependency changed."""
+    if entry.get("outcome") != "passed":
+        return True
+    return any(file_hash(path) != digest for path, digest in entry["deps"].items())
+
+
+class ImpactRecorder:
+    """Pytest plugin that records per-test dependencies and optionally deselects unaffected tests."""
+
+    def __init__(self, cache_path=DEFAULT_CACHE, select=False):
+        self.cache_path = cache_path
+        self.select = select
+        # Loaded once at configure time so every xdist worker selects the same tests
+        self.cache = load_cache(cache_path)
+        self.results = {}
+        self._seen_code = set()
+        self._monitoring = False
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            self._seen_code.add(frame.f_code)
+
+    def _on_py_start(self, code, offset):
+        self._seen_code.add(code)
+        return MONITORING.DISABLE
+
+    def _start_recording(self):
+        self._seen_code = set()
+        if MONITORING is not None:
+            try:
+                MONITORING.use_tool_id(MONITORING.PROFILER_ID, "test-impact")
+            except ValueError:  # Another profiler holds the id; use the profile hook
+                pass
+            else:
+                MONITORING.register_callback(MONITORING.PROFILER_ID, MONITORING.events.PY_START, self._on_py_start)
+                MONITORING.set_events(MONITORING.PROFILER_ID, MONITORING.events.PY_START)
+                MONITORING.restart_events()  # Report functions the previous test already saw
+                self._monitoring = True
+                return
+        # Only the test's own thread: a profile hook in every server and pool
+        # thread made I/O-heavy tests several times slower
+        sys.setprofile(self._profile)
+
+    def _stop_recording(self):
+        if self._monitoring:
+            MONITORING.set_events(MONITORING.PROFILER_ID, 0)
+            MONITORING.register_callback(MONITORING.PROFILER_ID, MONITORING.events.PY_START, None)
+            MONITORING.free_tool_id(MONITORING.PROFILER_ID)
+            self._monitoring = False
+        else:
+            sys.setprofile(None)
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        if not self.select:
+            return
+        cached = self.cache["tests"]
+        selected, deselected = [], []
+        for item in items:
+            entry = cached.get(item.nodeid)
+            if entry is None or is_affected(entry):
+                selected.append(item)
+            else:
+                deselected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._start_recording()
+        try:
+            yield
+        finally:
+            self._stop_recording()
+        self._result(item.nodeid).update(self._dependencies(item))
+
+    def pytest_runtest_logreport(self, report):
+        result = self._result(report.nodeid)
+        result["duration"] += report.duration
+        if report.failed:
+            result["outcome"] = "failed"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+
+    def _result(self, nodeid):
+        return self.results.setdefault(nodeid, {"outcome": "passed", "duration": 0.0})
+
+    def _dependencies(self, item):
+        test_file = _repo_path(str(item.fspath))
+        files, methods, routes = {test_file, *ALWAYS_FILES}, set(), set()
+        for code in self._seen_code:
+            if code.co_filename.startswith("<"):
+                continue  # <frozen ...>, <string>: not files, and abspath would place them in the cwd
+            filename = os.path.abspath(code.co_filename)
+            if not filename.startswith(PACKAGE_DIR + os.sep) or filename == __file__:
+                continue
+            files.add(_repo_path(filename))
+            qualname = getattr(code, "co_qualname", code.co_name)
+            if os.path.join(PACKAGE_DIR, "pages") in filename:
+                methods.add(qualname)
+            if qualname in API_METHOD_ROUTES:
+                routes.add(API_METHOD_ROUTES[qualname])
+        for fixture in item.fixturenames:
+            files.update(SESSION_FIXTURE_FILES.get(fixture, ()))
+        # "page" may resolve to the browser page object at run time
+        if "driver" in item.fixturenames or "page" in item.fixturenames:
+            routes.update(BROWSER_ROUTES)
+            files.update(CLIENT_FILES)
+        if routes:
+            files.update(SERVER_FILES)
+            for route in routes:
+                files.update(ROUTE_FILES[route])
+        return {
+            "file": test_file,
+            "deps": {path: file_hash(path) for path in sorted(files)},
+            "methods": sorted(methods),
+            "routes": sorted(routes),
+        }
+
+    def pytest_sessionfinish(self, session):
+        if self.results:
+            self._write()
+
+    def _write(self):
+        """Merge this session's results into the cache; safe with several xdist workers."""
+        with open(self.cache_path + ".lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            cache = load_cache(self.cache_path)
+            cache["tests"].update({k: v for k, v in self.results.items() if "deps" in v})
+            # Forget tests whose file is gone
+            cache["tests"] = {
+                nodeid: entry for nodeid, entry in cache["tests"].items()
+                if file_hash(entry["file"]) is not None
+            }
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
@@ -1,9 +1,129 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, UnexpectedAlertPresentException
+from ..perf.browser_metrics import collect_browser_metrics
+from ..perf.network_capture import API_RESOURCE_TYPES, capture_browser_network, within_budget
+from ..wait_timeouts import WaitTimeouts
+import os
 import time
 
+# Counts in-flight XHR/fetch calls (axios uses XHR) and records the time of the
+# last network completion or DOM mutation, so waits can tell when the UI settles.
+# It also times how long the table takes to render after each users fetch.
+# Safe to run more than once per document; the driver pool also registers it
+# to run on every new document so requests made during page load are counted.
+UI_TRACKER_JS = """
+(function () {
+  if (window.__uiTracker) { return; }
+  var tracker = { pending: 0, inflight: [], lastActivity: Date.now() };
+  window.__uiTracker = tracker;
+
+  function begin(method, url) {
+    var entry = (method || 'GET').toUpperCase() + ' ' + url;
+    tracker.pending += 1;
+    tracker.inflight.push(entry);
+    tracker.lastActivity = Date.now();
+    var finished = false;
+    return function () {
+      if (finished) { return; }
+      finished = true;
+      tracker.pending -= 1;
+      tracker.inflight.splice(tracker.inflight.indexOf(entry), 1);
+      tracker.lastActivity = Date.now();
+      if (entry.indexOf('GET ') === 0 && /\\/users([?#]|$)/.test(url)) {
+        tracker.usersFetchedAt = performance.now();
+      }
+    };
+  }
+
+  // Remember the _id of every user the app creates, so tests can clean up after
+  // themselves. sessionStorage survives reloads within the tab.
+  function recordCreatedUser(method, url, status, body) {
+    if (String(method).toUpperCase() !== 'POST' || !/\\/addUser([?#]|$)/.test(url)) { return; }
+    if (status < 200 || status >= 300) { return; }
+    var id = JSON.parse(body)._id;
+    if (!id) { return; }
+    var ids = JSON.parse(sessionStorage.getItem('__createdUserIds') || '[]');
+    ids.push(id);
+    sessionStorage.setItem('__createdUserIds', JSON.stringify(ids));
+  }
+
+  var open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__uiRequest = [method, String(url)];
+    return open.apply(this, arguments);
+  };
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    var xhr = this;
+    var request = this.__uiRequest || ['GET', ''];
+    this.addEventListener('loadend', begin(request[0], request[1]));
+    this.addEventListener('load', function () {
+      try { recordCreatedUser(request[0], request[1], xhr.status, xhr.responseText); } catch (e) {}
+    });
+    return send.apply(this, arguments);
+  };
+
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function (input, init) {
+      var url = input && input.url ? input.url : String(input);
+      var done = begin((init && init.method) || (input && input.method), url);
+      var method = (init && init.method) || (input && input.method) || 'GET';
+      return fetch.apply(this, arguments).then(
+        function (response) {
+          done();
+          response.clone().text().then(function (body) {
+            try { recordCreatedUser(method, url, response.status, body); } catch (e) {}
+          }, function () {});
+          return response;
+        },
+        function (error) { done(); throw error; }
+      );
+    };
+  }
+
+  // The first DOM change after a users list response is that list being rendered
+  tracker.tableRenders = [];
+  new MutationObserver(function () {
+    tracker.lastActivity = Date.now();
+    if (tracker.usersFetchedAt != null) {
+      tracker.tableRenders.push({ fetchedAt: tracker.usersFetchedAt, renderedAt: performance.now() });
+      tracker.usersFetchedAt = null;
+    }
+  })
+    .observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+
+  tracker.longTasks = [];
+  try {
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(function (entry) {
+        tracker.longTasks.push({ startTime: entry.startTime, duration: entry.duration });
+      });
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) {}
+})();
+"""
+
+UI_STATE_JS = """
+var tracker = window.__uiTracker;
+if (!tracker) { return null; }
+return {
+  pending: tracker.pending,
+  inflight: tracker.inflight.slice(),
+  idleFor: Date.now() - tracker.lastActivity,
+  readyState: document.readyState
+};
+"""
+
+# Returns and forgets the ids recorded by the UI tracker's recordCreatedUser()
+TAKE_CREATED_USERS_JS = """
+var ids = JSON.parse(sessionStorage.getItem('__createdUserIds') || '[]');
+sessionStorage.removeItem('__createdUserIds');
+return ids;
+"""
+
 class BasePage:
     """
     Base page object class containing common methods for all page objects.
@@ -11,32 +131,49 @@ class BasePage:
     
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        # Timeouts learned from earlier runs; fixed defaults without a history
+        self.timeouts = getattr(driver, "wait_timeouts", None) or WaitTimeouts()
+        self.wait = WebDriverWait(driver, self.timeouts.timeout("find_element"))
+    
+    def wait_until(self, operation, condition, timeout=None):
+        """
+        WebDriverWait.until with the timeout learned for `operation`, which
+        also records how long the wait took for future runs. Expiry of a
+        learned timeout is recorded too, so the next run waits longer;
+        an explicit `timeout` that expires teaches nothing.
+        """
+        learned = timeout is None
+        if learned:
+            timeout = self.timeouts.timeout(operation)
+        started = time.monotonic()
+        try:
+            # Short (negative) waits poll faster than WebDriverWait's default 0.5s
+            result = WebDriverWait(self.driver, timeout, poll_frequency=min(0.5, timeout / 5)).until(condition)
+        except TimeoutException:
+            if learned:
+                self.timeouts.record(operation, time.monotonic() - started)
+            raise
+        self.timeouts.record(operation, time.monotonic() - started)
+        return result
     
-    def find_element(self, by, value):
+    def find_element(self, by, value, timeout=None):
         """Find a single element with explicit wait"""
         try:
-            return self.wait.until(
-                EC.presence_of_element_located((by, value))
-            )
+            return self.wait_until("find_element", EC.presence_of_element_located((by, value)), timeout)
         except TimeoutException:
             raise NoSuchElementException(f"Element not found with {by}={value}")
     
     def find_elements(self, by, value):
         """Find multiple elements with explicit wait"""
         try:
-            return self.wait.until(
-                EC.presence_of_all_elements_located((by, value))
-            )
+            return self.wait_until("find_elements", EC.presence_of_all_elements_located((by, value)))
         except TimeoutException:
             return []
     
     def click_element(self, by, value):
         """Click an element with explicit wait"""
         try:
-            element = self.wait.until(
-                EC.element_to_be_clickable((by, value))
-            )
+            element = self.wait_until("clickable", EC.element_to_be_clickable((by, value)))
             element.click()
             return True
         except TimeoutException:
@@ -45,76 +182,146 @@ class BasePage:
     def send_keys_to_element(self, by, value, text):
         """Send keys to an element with explicit wait"""
         try:
-            element = self.wait.until(
-                EC.presence_of_element_located((by, value))
-            )
+            element = self.find_element(by, value)
             element.clear()
             element.send_keys(text)
             return True
-        except TimeoutException:
+        except NoSuchElementException:
             return False
     
-    def is_element_present(self, by, value):
+    def is_element_present(self, by, value, timeout=None):
         """Check if an element is present"""
         try:
-            self.find_element(by, value)
+            self.find_element(by, value, timeout)
             return True
         except NoSuchElementException:
             return False
     
-    def wait_for_element_visible(self, by, value, timeout=10):
+    def is_element_absent(self, by, value):
+        """
+        Check that an element is not present. Only waits about as long as
+        elements usually take to appear, not the full find timeout.
+        """
+        return not self.is_element_present(by, value, self.timeouts.negative_timeout("find_element"))
+    
+    def wait_for_element_visible(self, by, value, timeout=None):
         """Wait for an element to be visible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((by, value))
-            )
+            self.wait_until("element_visible", EC.visibility_of_element_located((by, value)), timeout)
             return True
         except TimeoutException:
             return False
     
-    def wait_for_element_invisible(self, by, value, timeout=10):
+    def wait_for_element_invisible(self, by, value, timeout=None):
         """Wait for an element to be invisible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.invisibility_of_element_located((by, value))
-            )
+            self.wait_until("element_invisible", EC.invisibility_of_element_located((by, value)), timeout)
             return True
         except TimeoutException:
             return False
     
+    def install_ui_tracker(self):
+        """Start tracking network activity and DOM mutations on the current page."""
+        self.driver.execute_script(UI_TRACKER_JS)
+    
+    def wait_for_ui_idle(self, timeout=None, quiet_ms=75):
+        """
+        Wait until the app has no XHR/fetch calls in flight and the DOM has
+        not changed for `quiet_ms`. An open alert counts as ready, since the
+        page can't progress until it is handled. Raises TimeoutException
+        describing what was still busy.
+        """
+        learned = timeout is None
+        if learned:
+            timeout = self.timeouts.timeout("ui_idle")
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            try:
+                state = self.driver.execute_script(UI_STATE_JS)
+            except UnexpectedAlertPresentException:
+                return True
+            if state is None:
+                self.install_ui_tracker()
+            elif (state["readyState"] == "complete" and state["pending"] == 0
+                    and state["idleFor"] >= quiet_ms):
+                self.timeouts.record("ui_idle", time.monotonic() - started)
+                return True
+            if time.monotonic() >= deadline:
+                if learned:
+                    self.timeouts.record("ui_idle", time.monotonic() - started)
+                raise TimeoutException(self._describe_busy_ui(state, timeout))
+            time.sleep(0.05)
+    
+    def _describe_busy_ui(self, state, timeout):
+        """Explain why wait_for_ui_idle gave up."""
+        if state is None:
+            return f"UI did not settle within {timeout}s: tracker could not be installed on {self.driver.current_url}"
+        reasons = []
+        if state["readyState"] != "complete":
+            reasons.append(f"document.readyState is '{state['readyState']}'")
+        if state["pending"]:
+            reasons.append(f"{state['pending']} request(s) still in flight: {', '.join(state['inflight'])}")
+        if not reasons:
+            reasons.append(f"DOM still changing (last mutation {state['idleFor']}ms ago)")
+        return f"UI did not settle within {timeout}s: " + "; ".join(reasons)
+    
     def wait_for_page_load(self):
         """Wait for page to load completely"""
         try:
-            self.wait.until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
+            self.wait_until("page_load", lambda driver: driver.execute_script("return document.readyState") == "complete")
             return True
         except TimeoutException:
             return False
     
+    def get_performance_metrics(self):
+        """
+        Collect Navigation/Resource Timing, paint, long task and DevTools
+        metrics for the current page as a BrowserMetrics object.
+        """
+        return collect_browser_metrics(self.driver)
+    
+    def capture_network(self, resource_types=API_RESOURCE_TYPES):
+        """
+        Context manager recording the requests the page makes inside the
+        with-block (only XHR/fetch by default) as a NetworkCapture.
+        """
+        return capture_browser_network(self.driver, resource_types)
+    
+    def network_budget(self, max_requests=None, max_kb=None):
+        """Context manager that fails if the with-block makes more API requests or downloads more than allowed."""
+        return within_budget(self.capture_network(), max_requests, max_kb)
+    
     def get_element_text(self, by, value):
         """Get text of an element with explicit wait"""
         try:
-            element = self.wait.until(
-                EC.presence_of_element_located((by, value))
-            )
-            return element.text
-        except TimeoutException:
+            return self.find_element(by, value).text
+        except NoSuchElementException:
             return None
     
     def get_element_attribute(self, by, value, attribute):
         """Get attribute of an element with explicit wait"""
         try:
-            element = self.wait.until(
-                EC.presence_of_element_located((by, value))
-            )
-            return element.get_attribute(attribute)
-        except TimeoutException:
+            return self.find_element(by, value).get_attribute(attribute)
+        except NoSuchElementException:
             return None
     
     def take_screenshot(self, filename):
         """Take screenshot and save to file."""
-        self.driver.save_screenshot(f"screenshots/{filename}.png")
+        os.makedirs("screenshots", exist_ok=True)
+        path = f"screenshots/{filename}.png"
+        self.driver.save_screenshot(path)
+        return path
+    
+    def capture_step(self, label):
+        """
+        Keep a screenshot and DOM snapshot of the current step in the test's
+        in-memory artifact buffer (with --artifact-steps). They are only
+        written out if the test fails.
+        """
+        artifacts = getattr(self.driver, "artifacts", None)
+        if artifacts is not None:
+            artifacts.capture(label)
     
     def get_alert_text(self):
         """Get text from alert dialog."""
@@ -130,14 +337,11 @@ class BasePage:
         """Scroll to element."""
         element = self.find_element(by, value)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(0.5)
     
-    def wait_for_element_to_disappear(self, by, value, timeout=10):
+    def wait_for_element_to_disappear(self, by, value, timeout=None):
         """Wait for element to disappear."""
         try:
-            WebDriverWait(self.driver, timeout).until_not(
-                EC.presence_of_element_located((by, value))
-            )
+            self.wait_until("element_disappear", lambda driver: not driver.find_elements(by, value), timeout)
             return True
         except TimeoutException:
             return False 
\ No newline at end of file
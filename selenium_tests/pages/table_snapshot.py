@@ -0,0 +1,81 @@
+from collections import namedtuple
+
+# One row of the users table: position in the table plus the four data cells
+UserRow = namedtuple("UserRow", ["index", "id", "name", "email", "age"])
+
+class TableSnapshot:
+    """Contents of the users table captured at one point in time."""
+    
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_email = {}
+        for row in rows:
+            self.by_email.setdefault(row.email, row)
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def __iter__(self):
+        return iter(self.rows)
+    
+    def find(self, email):
+        """Return the first row with the given email, or None."""
+        return self.by_email.get(email)
+    
+    def diff(self, later):
+        """Return the TableDiff from this snapshot to a later one."""
+        return TableDiff.between(self.rows, later.rows)
+
+
+class TableDiff:
+    """
+    Rows added, removed and modified between two states of the users table,
+    matched by the user id in the first column. Added rows are given as they
+    are now, removed rows as they were, and modified rows as (before, after)
+    pairs. A row that only moved to another position is not a change.
+    """
+    
+    def __init__(self, added=(), removed=(), modified=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.modified = list(modified)
+    
+    @classmethod
+    def between(cls, before, after):
+        """Compare two sequences of UserRows."""
+        previous = {row.id: row for row in before}
+        added, modified = [], []
+        for row in after:
+            old = previous.pop(row.id, None)
+            if old is None:
+                added.append(row)
+            elif old[2:] != row[2:]:
+                modified.append((old, row))
+        return cls(added, previous.values(), modified)
+    
+    def restricted_to(self, ids=(), emails=()):
+        """
+        Return the part of the diff that concerns the given user ids or
+        emails. Other workers share the table, so a test should only judge
+        the rows it owns.
+        """
+        ids, emails = set(ids), set(emails)
+        
+        def owned(row):
+            return row.id in ids or row.email in emails
+        
+        return TableDiff(
+            [row for row in self.added if owned(row)],
+            [row for row in self.removed if owned(row)],
+            [(before, after) for before, after in self.modified if owned(before) or owned(after)],
+        )
+    
+    def __bool__(self):
+        return bool(self.added or self.removed or self.modified)
+    
+    def __repr__(self):
+        lines = [f"TableDiff(+{len(self.added)} -{len(self.removed)} ~{len(self.modified)})"]
+        lines += [f"    + {row}" for row in self.added]
+        lines += [f"    - {row}" for row in self.removed]
+        lines += [f"    ~ {before} -> {after}" for before, after in self.modified]
+        return "\n".join(lines)
@@ -0,0 +1,198 @@
+import requests
+from contextlib import contextmanager
+from ..perf.network_capture import capture_session_network, within_budget
+from .table_snapshot import TableDiff, TableSnapshot, UserRow
+
+EMPTY_FORM = {"name": "", "email": "", "age": ""}
+
+class UserManagementApi:
+    """
+    Browser-free counterpart of UserManagementPage for contract mode.
+    
+    Exposes the same methods, but talks to the REST API directly through
+    a UsersApi client. The client-side behaviour of App.jsx is reproduced:
+    table order (newest first), the duplicate-email and empty-field alerts,
+    and the edit flow. Tests written against the page object therefore run
+    unchanged, without a browser.
+    """
+    
+    def __init__(self, api):
+        self.api = api
+        self.users = []  # Table contents, in display order
+        self.form = dict(EMPTY_FORM)
+        self.editing_id = None
+        self.alert = None
+        self.table_baseline = None
+    
+    def _fetch_users(self):
+        """Reload the table like fetchUsers() does."""
+        users = self.api.list_users()
+        users.reverse()
+        self.users = users
+    
+    def navigate(self, url=None):
+        """Load the page state: an empty form and a freshly fetched table."""
+        self.form = dict(EMPTY_FORM)
+        self.editing_id = None
+        self.alert = None
+        self.table_baseline = None  # Like the browser, a page load drops the captured table
+        self._fetch_users()
+    
+    def wait_for_ui_idle(self, timeout=None, quiet_ms=75):
+        """Every call completes synchronously, so there is nothing to wait for."""
+    
+    def capture_network(self):
+        """Context manager recording the API requests made inside the with-block."""
+        return capture_session_network(self.api.session)
+    
+    def network_budget(self, max_requests=None, max_kb=None):
+        """Context manager that fails if the with-block makes more API requests or downloads more than allowed."""
+        return within_budget(self.capture_network(), max_requests, max_kb)
+    
+    def add_user(self, name, email, age):
+        """Add a new user with the given details."""
+        self.fill_user_form(name, email, age)
+        self.submit_form()
+    
+    def fill_user_form(self, name, email, age):
+        """Fill the user form with the given details."""
+        self.form = {"name": name, "email": email, "age": age}
+    
+    def submit_form(self):
+        """Submit the form the way handleAddUser() does."""
+        form = self.form
+        if self.editing_id is None:
+            if any(user["email"] == form["email"] for user in self.users):
+                self.alert = "Email already exists. Please use a different email."
+            elif form["name"] and form["email"] and form["age"]:
+                try:
+                    created = self.api.create_user(form["name"], form["email"], form["age"])
+                except requests.RequestException:
+                    return  # The client only logs failed requests
+                self.users.insert(0, created)
+                self.form = dict(EMPTY_FORM)
+            else:
+                self.alert = "Please fill in all fields"
+        else:
+            try:
+                self.api.update_user(self.editing_id, form["name"], form["email"], form["age"])
+            except requests.RequestException:
+                return
+            self._fetch_users()
+            self.form = dict(EMPTY_FORM)
+            self.editing_id = None
+    
+    def get_alert_text(self):
+        """Return and dismiss the pending alert, or None if there is none."""
+        text, self.alert = self.alert, None
+        return text
+    
+    def snapshot(self):
+        """Return the table as the browser would render it."""
+        return TableSnapshot([
+            UserRow(i, user["_id"], user.get("name", ""), user["email"], f"{user.get('age', '')} Year's")
+            for i, user in enumerate(self.users)
+        ])
+    
+    def capture_table(self):
+        """Remember the current table as the baseline for diff_table(). Returns the row count."""
+        self.table_baseline = self.snapshot()
+        return len(self.table_baseline)
+    
+    def diff_table(self):
+        """Return a TableDiff of the table against the last capture_table()."""
+        if self.table_baseline is None:
+            raise RuntimeError("No table baseline; call capture_table() first")
+        return self.table_baseline.diff(self.snapshot())
+    
+    @contextmanager
+    def track_changes(self):
+        """Context manager yielding a TableDiff of the changes the with-block made to the table."""
+        self.capture_table()
+        changes = TableDiff()
+        yield changes
+        diff = self.diff_table()
+        changes.added, changes.removed, changes.modified = diff.added, diff.removed, diff.modified
+    
+    def iter_users(self, chunk_size=500):
+        """Yield the table's rows as UserRow tuples."""
+        return iter(self.snapshot())
+    
+    def find_row_by_email(self, email):
+        """Return the first UserRow with the given email, or None."""
+        return self.snapshot().find(email)
+    
+    def is_user_in_table(self, name, email):
+        """Check if a user with the given name and email exists in the table."""
+        row = self.snapshot().find(email)
+        return row is not None and row.name == name
+    
+    def get_users_count(self):
+        """Get the number of users in the table."""
+        return len(self.users)
+    
+    get_user_count = get_users_count
+    
+    def find_user_by_email(self, email):
+        """Find a user's row index by email."""
+        row = self.snapshot().find(email)
+        return row.index if row else -1
+    
+    def user_exists(self, email):
+        """Check if a user exists"""
+        return self.find_user_by_email(email) >= 0
+    
+    def get_user_data_from_table(self, row_index=0):
+        """Get user data from the specified row."""
+        rows = self.snapshot().rows
+        if 0 <= row_index < len(rows):
+            row = rows[row_index]
+            return {"id": row.id, "name": row.name, "email": row.email, "age": row.age}
+        return None
+    
+    def get_all_users_data(self):
+        """Get the data of every user in the table, in table order."""
+        return [
+            {"id": row.id, "name": row.name, "email": row.email, "age": row.age}
+            for row in self.snapshot()
+        ]
+    
+    def edit_user(self, row_index):
+        """Load the user at the specified row into the form, like handleUpdateUser()."""
+        if 0 <= row_index < len(self.users):
+            user = self.users[row_index]
+            self.form = {"name": user["name"], "email": user["email"], "age": user["age"]}
+            self.editing_id = user["_id"]
+    
+    def delete_user(self, row_index):
+        """Delete the user at the specified row and reload the table."""
+        if 0 <= row_index < len(self.users):
+            try:
+                self.api.delete_user(self.users[row_index]["_id"])
+            except requests.RequestException:
+                return
+            self._fetch_users()
+    
+    def clear_user_form(self):
+        """Clear all form fields."""
+        self.form = dict(EMPTY_FORM)
+    
+    def get_form_field_values(self):
+        """Get the current values of all form fields, as the inputs would show them."""
+        return {field: str(value) for field, value in self.form.items()}
+    
+    def is_form_cleared(self):
+        """Check if the form is cleared"""
+        return not any(self.form.values())
+    
+    def refresh_page(self):
+        """Reload the page: client state is lost and the table is fetched again."""
+        self.navigate()
+    
+    def wait_for_user_to_appear(self, email, timeout=None):
+        """Check the table for the user; it only changes through this object's calls."""
+        return self.find_user_by_email(email) >= 0
+    
+    def wait_for_user_to_disappear(self, email, timeout=None):
+        """Check the user is absent from the table."""
+        return self.find_user_by_email(email) == -1
@@ -1,10 +1,99 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from .base_page import BasePage
+from .table_snapshot import TableDiff, TableSnapshot, UserRow
+from contextlib import contextmanager
 import time
 
+# Rows and cells travel as one packed string per chunk instead of nested
+# arrays, which keeps WebDriver's JSON encoding and decoding cheap.
+ROW_SEPARATOR = "\x1e"
+CELL_SEPARATOR = "\x1f"
+
+# Packs the first four cells of rows [start, start + count), or of every row from start with a null count
+TABLE_CHUNK_JS = """
+var body = document.querySelector('tbody');
+var rows = body ? body.rows : [];
+var start = arguments[0];
+var end = arguments[1] == null ? rows.length : Math.min(rows.length, start + arguments[1]);
+var packed = [];
+for (var i = start; i < end; i++) {
+  var cells = rows[i].cells, values = [];
+  for (var j = 0; j < 4; j++) {
+    values.push(cells[j] ? cells[j].textContent.trim().replace(/[\\x1e\\x1f]/g, ' ') : '');
+  }
+  packed.push(values.join('\\x1f'));
+}
+return {total: rows.length, rows: packed.join('\\x1e')};
+"""
+
+# Scans the table in the browser and returns only the first row with the email
+FIND_ROW_JS = """
+var body = document.querySelector('tbody');
+var rows = body ? body.rows : [];
+for (var i = 0; i < rows.length; i++) {
+  var cells = rows[i].cells;
+  if (cells[2] && cells[2].textContent.trim() === arguments[0]) {
+    var values = [];
+    for (var j = 0; j < 4; j++) {
+      values.push(cells[j] ? cells[j].textContent.trim().replace(/[\\x1e\\x1f]/g, ' ') : '');
+    }
+    return {index: i, row: values.join('\\x1f')};
+  }
+}
+return null;
+"""
+
+ROW_COUNT_JS = "var body = document.querySelector('tbody'); return body ? body.rows.length : 0;"
+
+# Keeps the packed rows in the page, keyed by user id, as the baseline for DIFF_TABLE_JS
+CAPTURE_TABLE_JS = """
+var body = document.querySelector('tbody');
+var rows = body ? body.rows : [];
+var baseline = new Map();
+for (var i = 0; i < rows.length; i++) {
+  var cells = rows[i].cells, values = [];
+  for (var j = 0; j < 4; j++) {
+    values.push(cells[j] ? cells[j].textContent.trim().replace(/[\\x1e\\x1f]/g, ' ') : '');
+  }
+  baseline.set(values[0], {index: i, row: values.join('\\x1f')});
+}
+window.__tableBaseline = baseline;
+return rows.length;
+"""
+
+# Compares the table with the baseline by id and returns only the rows that
+# changed, each packed as "index\x1fcells". Null if the page was reloaded.
+DIFF_TABLE_JS = """
+var baseline = window.__tableBaseline;
+if (!baseline) { return null; }
+var body = document.querySelector('tbody');
+var rows = body ? body.rows : [];
+var added = [], modified = [], removed = [], seen = new Set();
+for (var i = 0; i < rows.length; i++) {
+  var cells = rows[i].cells, values = [];
+  for (var j = 0; j < 4; j++) {
+    values.push(cells[j] ? cells[j].textContent.trim().replace(/[\\x1e\\x1f]/g, ' ') : '');
+  }
+  var row = values.join('\\x1f'), before = baseline.get(values[0]);
+  if (!before) {
+    added.push(i + '\\x1f' + row);
+  } else {
+    seen.add(values[0]);
+    if (before.row !== row) {
+      modified.push(before.index + '\\x1f' + before.row + '\\x1e' + i + '\\x1f' + row);
+    }
+  }
+}
+if (seen.size < baseline.size) {
+  baseline.forEach(function (before, id) {
+    if (!seen.has(id)) { removed.push(before.index + '\\x1f' + before.row); }
+  });
+}
+return {added: added, removed: removed, modified: modified};
+"""
+
 class UserManagementPage(BasePage):
     """Page Object Model for User Management page"""
     
@@ -15,7 +104,7 @@ class UserManagementPage(BasePage):
     NAME_INPUT = (By.NAME, "name")
     EMAIL_INPUT = (By.NAME, "email")
     AGE_INPUT = (By.NAME, "age")
-    SUBMIT_BUTTON = (By.CSS_SELECTOR, "button[type='submit']")
+    SUBMIT_BUTTON = (By.CSS_SELECTOR, "form button")  # App.jsx renders a bare <button>, no type attribute
     USER_TABLE = (By.CLASS_NAME, "table")
     USER_ROWS = (By.CSS_SELECTOR, "tbody tr")
     EDIT_BUTTON = (By.CLASS_NAME, "edit_btn")
@@ -26,6 +115,12 @@ class UserManagementPage(BasePage):
     def __init__(self, driver):
         super().__init__(driver)
     
+    def navigate(self, url=None):
+        """Open the page and wait until the initial user fetch has rendered."""
+        self.driver.get(url or self.URL)
+        self.wait_for_ui_idle()
+        self.capture_step("navigate")
+    
     def add_user(self, name, email, age):
         """Add a new user with the given details."""
         self.fill_user_form(name, email, age)
@@ -47,68 +142,137 @@ class UserManagementPage(BasePage):
         submit_button = self.find_element(*self.SUBMIT_BUTTON)
         if submit_button:
             submit_button.click()
-            time.sleep(1)  # Wait for form submission
+            self.wait_for_ui_idle()  # Wait for the request and re-render to finish
+            self.capture_step("submit_form")
     
     def get_success_message(self):
         """Get the success message text."""
-        try:
-            return self.find_element(*self.SUCCESS_MESSAGE).text
-        except NoSuchElementException:
+        if self.is_element_absent(*self.SUCCESS_MESSAGE):
             return None
+        return self.find_element(*self.SUCCESS_MESSAGE).text
     
     def get_error_message(self):
         """Get the error message text."""
-        try:
-            return self.find_element(*self.ERROR_MESSAGE).text
-        except NoSuchElementException:
+        if self.is_element_absent(*self.ERROR_MESSAGE):
+            return None
+        return self.find_element(*self.ERROR_MESSAGE).text
+    
+    def iter_users(self, chunk_size=500):
+        """
+        Yield the table's rows as UserRow tuples, fetched from the browser
+        `chunk_size` rows per round trip and decoded one row at a time, so
+        callers that stop early never pull the rest of the table. Rows
+        inserted or removed while iterating may be skipped or repeated.
+        """
+        start = 0
+        while True:
+            total, rows = self._read_rows(start, chunk_size)
+            yield from rows
+            start += chunk_size
+            if start >= total:
+                return
+    
+    def _read_rows(self, start, count):
+        """
+        Fetch rows [start, start + count), or all rows from `start` if count
+        is None, in one round trip. Returns (table size, lazy row iterator).
+        """
+        chunk = self.driver.execute_script(TABLE_CHUNK_JS, start, count)
+        packed_rows = chunk["rows"].split(ROW_SEPARATOR) if chunk["rows"] else []
+        rows = (
+            UserRow(start + offset, *packed.split(CELL_SEPARATOR))
+            for offset, packed in enumerate(packed_rows)
+        )
+        return chunk["total"], rows
+    
+    def snapshot(self):
+        """Read the whole users table in one round trip, so it is one consistent state."""
+        _, rows = self._read_rows(0, None)
+        return TableSnapshot(list(rows))
+    
+    def capture_table(self):
+        """
+        Remember the current table in the page as the baseline for
+        diff_table(). Only the row count is transferred. Returns the row count.
+        """
+        return self.driver.execute_script(CAPTURE_TABLE_JS)
+    
+    def diff_table(self):
+        """
+        Return a TableDiff of the table against the last capture_table().
+        The comparison runs in the page and only changed rows are transferred.
+        """
+        changes = self.driver.execute_script(DIFF_TABLE_JS)
+        if changes is None:
+            raise RuntimeError("No table baseline in the page; call capture_table() after the last page load")
+        return TableDiff(
+            [self._unpack_row(packed) for packed in changes["added"]],
+            [self._unpack_row(packed) for packed in changes["removed"]],
+            [tuple(self._unpack_row(half) for half in packed.split(ROW_SEPARATOR)) for packed in changes["modified"]],
+        )
+    
+    @staticmethod
+    def _unpack_row(packed):
+        index, *cells = packed.split(CELL_SEPARATOR)
+        return UserRow(int(index), *cells)
+    
+    @contextmanager
+    def track_changes(self):
+        """
+        Context manager yielding a TableDiff that is filled in with the
+        changes the with-block made to the table:
+        
+            with page.track_changes() as changes:
+                page.delete_user(row)
+            assert [row.email for row in changes.removed] == [email]
+        """
+        self.capture_table()
+        changes = TableDiff()
+        yield changes
+        diff = self.diff_table()
+        changes.added, changes.removed, changes.modified = diff.added, diff.removed, diff.modified
+    
+    def find_row_by_email(self, email):
+        """Return the first UserRow with the given email, searched in the browser, or None."""
+        found = self.driver.execute_script(FIND_ROW_JS, email)
+        if found is None:
             return None
+        return UserRow(found["index"], *found["row"].split(CELL_SEPARATOR))
     
     def is_user_in_table(self, name, email):
-        """Check if a user with the given email exists in the table."""
-        try:
-            rows = self.find_elements(*self.USER_ROWS)
-            for row in rows:
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) >= 3 and cells[1].text == name and cells[2].text == email:
-                    return True
-            return False
-        except NoSuchElementException:
-            return False
+        """Check if a user with the given name and email exists in the table."""
+        row = self.find_row_by_email(email)
+        return row is not None and row.name == name
     
     def get_users_count(self):
         """Get the number of users in the table."""
-        try:
-            rows = self.find_elements(*self.USER_ROWS)
-            return len(rows)
-        except NoSuchElementException:
-            return 0
+        return self.driver.execute_script(ROW_COUNT_JS)
     
     def find_user_by_email(self, email):
         """Find a user's row index by email."""
-        try:
-            rows = self.find_elements(*self.USER_ROWS)
-            for i, row in enumerate(rows):
-                cells = row.find_elements(By.TAG_NAME, "td")
-                if len(cells) >= 3 and cells[2].text == email:
-                    return i
-            return -1
-        except NoSuchElementException:
-            return -1
+        row = self.find_row_by_email(email)
+        return row.index if row else -1
     
-    def get_user_data_from_table(self, row_index):
+    def get_user_data_from_table(self, row_index=0):
         """Get user data from the specified row."""
-        try:
-            rows = self.find_elements(*self.USER_ROWS)
-            if 0 <= row_index < len(rows):
-                cells = rows[row_index].find_elements(By.TAG_NAME, "td")
-                return {
-                    "name": cells[1].text,
-                    "email": cells[2].text,
-                    "age": cells[3].text
-                }
-            return None
-        except NoSuchElementException:
+        if row_index < 0:
             return None
+        _, rows = self._read_rows(row_index, 1)
+        row = next(rows, None)
+        return self._row_data(row) if row else None
+    
+    def get_all_users_data(self):
+        """Get the data of every user in the table, in table order."""
+        return [self._row_data(row) for row in self.iter_users()]
+    
+    @staticmethod
+    def _row_data(row):
+        return {
+            "id": row.id,
+            "name": row.name,
+            "email": row.email,
+            "age": row.age
+        }
     
     def edit_user(self, row_index):
         """Click the edit button for the user at the specified row."""
@@ -117,7 +281,8 @@ class UserManagementPage(BasePage):
             if 0 <= row_index < len(rows):
                 edit_button = rows[row_index].find_element(By.CLASS_NAME, "edit_btn")
                 edit_button.click()
-                time.sleep(1)  # Wait for form to be populated
+                self.wait_for_ui_idle()  # Wait for form to be populated
+                self.capture_step(f"edit_user_{row_index}")
         except NoSuchElementException:
             pass
     
@@ -128,7 +293,8 @@ class UserManagementPage(BasePage):
             if 0 <= row_index < len(rows):
                 delete_button = rows[row_index].find_element(By.CLASS_NAME, "delete_btn")
                 delete_button.click()
-                time.sleep(1)  # Wait for deletion
+                self.wait_for_ui_idle()  # Wait for deletion and the table refetch
+                self.capture_step(f"delete_user_{row_index}")
         except NoSuchElementException:
             pass
     
@@ -149,24 +315,21 @@ class UserManagementPage(BasePage):
     def refresh_page(self):
         """Refresh the current page."""
         self.driver.refresh()
-        time.sleep(2)  # Wait for page to reload
+        self.wait_for_ui_idle()  # Wait for page to reload and fetch users
+        self.capture_step("refresh_page")
     
-    def wait_for_user_to_appear(self, email, timeout=10):
+    def wait_for_user_to_appear(self, email, timeout=None):
         """Wait for a user with the given email to appear in the table."""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: self.find_user_by_email(email) >= 0
-            )
+            self.wait_until("user_appear", lambda d: self.find_user_by_email(email) >= 0, timeout)
             return True
         except TimeoutException:
             return False
     
-    def wait_for_user_to_disappear(self, email, timeout=10):
+    def wait_for_user_to_disappear(self, email, timeout=None):
         """Wait for a user with the given email to disappear from the table."""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: self.find_user_by_email(email) == -1
-            )
+            self.wait_until("user_disappear", lambda d: self.find_user_by_email(email) == -1, timeout)
             return True
         except TimeoutException:
             return False
@@ -187,26 +350,6 @@ class UserManagementPage(BasePage):
         """Get the text of the submit button."""
         return self.get_element_text(*self.SUBMIT_BUTTON)
     
-    def get_users_count(self):
-        """Get the number of users in the table."""
-        rows = self.find_elements(*self.USER_ROWS)
-        return len(rows)
-    
-    def get_user_data_from_table(self, row_index=0):
-        """Get user data from a specific row in the table."""
-        rows = self.find_elements(*self.USER_ROWS)
-        if row_index < len(rows):
-            row = rows[row_index]
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if len(cells) >= 4:
-                return {
-                    "id": cells[0].text,
-                    "name": cells[1].text,
-                    "email": cells[2].text,
-                    "age": cells[3].text.replace(" Year's", "")
-                }
-        return None
-    
     def get_validation_errors(self):
         """Get validation error messages"""
         try:
@@ -224,9 +367,7 @@ class UserManagementPage(BasePage):
     
     def get_user_count(self):
         """Get the total number of users"""
-        table = self.driver.find_element(*self.USER_TABLE)
-        rows = table.find_elements(By.TAG_NAME, "tr")
-        return len(rows) - 1  # Subtract header row
+        return self.get_users_count()
     
     def user_exists(self, email):
         """Check if a user exists"""
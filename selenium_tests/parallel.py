@@ -0,0 +1,40 @@
+"""
+Helpers for running the suite in parallel with pytest-xdist.
+
+Each xdist worker is a separate process with its own browser, so the only
+thing workers can still collide on is the shared database. Test data is
+therefore namespaced per worker (and per run) so that two workers never
+try to create users with the same email.
+"""
+
+import os
+import uuid
+
+# xdist exports the same run id to every worker; fall back to a random one
+# for plain (non-distributed) runs so repeated runs don't collide either.
+RUN_ID = os.getenv("PYTEST_XDIST_TESTRUNUID", uuid.uuid4().hex)[:6]
+
+
+def worker_id():
+    """Return the xdist worker id (e.g. "gw0"), or "main" when not distributed."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def worker_count():
+    """Return the number of xdist workers taking part in the run."""
+    return int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+
+
+def namespace():
+    """Return a token that is unique to this worker in this run."""
+    return f"{worker_id()}-{RUN_ID}"
+
+
+def namespaced_email(email, tag=None):
+    """
+    Make an email unique to this worker by adding a plus-suffix to the local
+    part. An optional `tag` narrows it further, e.g. to a single test.
+    """
+    local, _, domain = email.partition("@")
+    suffix = f"{namespace()}-{tag}" if tag else namespace()
+    return f"{local}+{suffix}@{domain}"
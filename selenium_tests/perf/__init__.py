@@ -0,0 +1,3 @@
+"""
+Performance tooling for the CRUD application: load generation and benchmarks
+"""
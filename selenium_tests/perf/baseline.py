@@ -0,0 +1,46 @@
+"""
+JSON baselines for benchmark results.
+
+A benchmark reports a flat dict of metric name -> value where larger is
+worse (latency, bytes, slope...). The first run stores it as the baseline;
+later runs are compared against it and any metric that grew by more than
+the allowed threshold is reported as a regression.
+"""
+
+import json
+import os
+
+
+def load_baseline(path):
+    """Return the stored metrics, or None if there is no baseline yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["metrics"]
+
+
+def save_baseline(path, metrics, context=None):
+    """Store metrics (plus optional context such as sizes or host) as the new baseline."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"context": context or {}, "metrics": metrics}, f, indent=2, sort_keys=True)
+
+
+def find_regressions(metrics, baseline, threshold=0.2, min_delta=0.0):
+    """
+    Compare metrics against a baseline and return human-readable regressions.
+
+    A metric regresses when it exceeds the baseline by more than `threshold`
+    (a fraction) and by more than `min_delta` in absolute terms, which keeps
+    tiny values from failing on noise. Metrics missing from either side are
+    ignored.
+    """
+    regressions = []
+    for name in sorted(metrics):
+        if name not in baseline:
+            continue
+        current, previous = metrics[name], baseline[name]
+        if current > previous * (1 + threshold) and current - previous > min_delta:
+            change = (current / previous - 1) * 100 if previous else float("inf")
+            regressions.append(f"{name}: {previous:.3f} -> {current:.3f} (+{change:.0f}%)")
+    return regressions
@@ -0,0 +1,308 @@
+"""
+Client render-time scaling benchmark.
+
+Grows the users collection through a series of sizes (100, 1k, 10k, 50k by
+default) and at each size drives the real React app in Chrome:
+
+- initial render: navigation start until the table holds every row and the
+  next frame has started, marked by a MutationObserver injected before the
+  app's own scripts run
+- add, edit, delete: from the click on the submit/delete button until the
+  table reflects the change (a new row, the new name after the refetch, the
+  row gone after the refetch) and the next frame has started
+- DOM nodes and JS heap after the initial render
+
+Every interval is a `performance.measure` between two `performance.mark`s
+set in the page, so WebDriver round trips are not part of the numbers. The
+add/edit/delete cycle works on one user of its own, so the table is back at
+N rows afterwards. Each size yields one point of the curve; a least-squares
+slope (ms per 1000 rows) is fitted per metric and the slopes are compared
+with a stored baseline, so the run fails when rendering scales worse, not
+when a machine is merely slower at every size.
+
+The frontend must talk to the API given with --api-url.
+
+Usage:
+    python -m selenium_tests.perf.bench_render_scaling --sizes 100,1000,10000
+    python -m selenium_tests.perf.bench_render_scaling --update-baseline
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import uuid
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..api_client import UsersApi
+from ..driver_pool import launch_driver
+from ..pages.user_management_page import UserManagementPage
+from .baseline import find_regressions, load_baseline, save_baseline
+from .datagen import Population
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "render_scaling.json")
+TIMED_METRICS = ("initial_render_ms", "add_ms", "edit_ms", "delete_ms")
+METRICS = TIMED_METRICS + ("dom_nodes", "js_heap_kb")
+
+# Registered before any page script; marks the first frame after the table
+# holds the row count given in the URL fragment (#bench-rows=N).
+RENDER_PROBE_JS = """
+(function () {
+  var match = /bench-rows=(\\d+)/.exec(location.hash);
+  if (!match) { return; }
+  var expected = parseInt(match[1], 10);
+  var observer = new MutationObserver(function () {
+    var body = document.querySelector('tbody');
+    if (!body || body.rows.length < expected) { return; }
+    observer.disconnect();
+    requestAnimationFrame(function () {
+      performance.mark('table-rendered');
+      performance.measure('initial-render', undefined, 'table-rendered');
+    });
+  });
+  observer.observe(document, {childList: true, subtree: true});
+})();
+"""
+
+RENDER_MEASURE_JS = """
+var entry = performance.getEntriesByName('initial-render', 'measure')[0];
+return entry ? entry.duration : null;
+"""
+
+# arguments: measure name, element to click, expectation, async callback.
+# Marks `<name>-start`, clicks, and marks `<name>-end` on the first frame
+# after the table matches the expectation: `rows` rows (if not null) and, if
+# `id` is set, that user's cell `column` equals `text`, or the user is absent.
+ACTION_MEASURE_JS = """
+var name = arguments[0], target = arguments[1], expect = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false;
+function satisfied() {
+  var body = document.querySelector('tbody');
+  var rows = body ? body.rows : [];
+  if (expect.rows !== null && rows.length !== expect.rows) { return false; }
+  if (!expect.id) { return true; }
+  for (var i = 0; i < rows.length; i++) {
+    var cells = rows[i].cells;
+    if (cells[0] && cells[0].textContent.trim() === expect.id) {
+      return !expect.absent && cells[expect.column].textContent.trim() === expect.text;
+    }
+  }
+  return !!expect.absent;
+}
+var observer = new MutationObserver(function () {
+  if (finished || !satisfied()) { return; }
+  finished = true;
+  observer.disconnect();
+  requestAnimationFrame(function () {
+    performance.mark(name + '-end');
+    done({duration: performance.measure(name, name + '-start', name + '-end').duration});
+  });
+});
+performance.clearMarks(name + '-start');
+performance.clearMarks(name + '-end');
+performance.clearMeasures(name);
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+performance.mark(name + '-start');
+target.click();
+setTimeout(function () {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  done({error: name + ' did not update the table within ' + expect.timeoutMs + ' ms'});
+}, expect.timeoutMs);
+"""
+
+PAGE_WEIGHT_JS = """
+return {
+  nodes: document.getElementsByTagName('*').length,
+  heap: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+
+class RenderBenchmarkError(RuntimeError):
+    """Raised when the app does not reach the expected state during a measurement."""
+
+
+def fit_slope(xs, ys):
+    """Least-squares slope of ys over xs."""
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def scaling_metrics(curve):
+    """
+    Flatten {size: {metric: value}} into baseline metrics: every point, plus
+    `slope.<metric>_per_1k`, the fitted growth per 1000 rows.
+    """
+    metrics = {}
+    sizes = sorted(curve)
+    for size in sizes:
+        for name, value in curve[size].items():
+            if value is not None:
+                metrics[f"{size}.{name}"] = value
+    if len(sizes) > 1:
+        for name in METRICS:
+            points = [(size, curve[size][name]) for size in sizes if curve[size].get(name) is not None]
+            if len(points) > 1:
+                xs, ys = zip(*points)
+                metrics[f"slope.{name}_per_1k"] = fit_slope(xs, ys) * 1000
+    return metrics
+
+
+class RenderBenchmark:
+    """Measures the app's render times in one browser while the collection grows."""
+
+    def __init__(self, driver, api, frontend_url, sizes=DEFAULT_SIZES, repeats=3, seed=0,
+                 timeout=120):
+        self.driver = driver
+        self.page = UserManagementPage(driver)
+        self.api = api
+        self.frontend_url = frontend_url
+        self.sizes = sorted(sizes)
+        self.repeats = repeats
+        self.timeout = timeout
+        self.run_id = uuid.uuid4().hex[:8]
+        self.population = Population(api, seed=seed, tag=f"render{self.run_id}")
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RENDER_PROBE_JS})
+        driver.set_script_timeout(timeout)
+
+    def run(self):
+        """Return the scaling curve as {size: {metric: value}}."""
+        curve = {}
+        for size in self.sizes:
+            if self.population.grow_to(size) > size:
+                print(f"skipping {size}: collection already holds more users", file=sys.stderr)
+                continue
+            curve[size] = point = self.measure_size(size)
+            print(f"{size:>7} render {point['initial_render_ms']:>9.1f} ms  add {point['add_ms']:>8.1f} ms  "
+                  f"edit {point['edit_ms']:>8.1f} ms  delete {point['delete_ms']:>8.1f} ms  "
+                  f"{point['dom_nodes']:>8} nodes")
+        return curve
+
+    def measure_size(self, size):
+        """Median of `repeats` page loads and add/edit/delete cycles with `size` users in the table."""
+        samples = {name: [] for name in TIMED_METRICS}
+        weight = None
+        for attempt in range(self.repeats):
+            samples["initial_render_ms"].append(self.measure_initial_render(size))
+            if weight is None:
+                weight = self.driver.execute_script(PAGE_WEIGHT_JS)
+            add_ms, edit_ms, delete_ms = self.measure_cycle(size, attempt)
+            samples["add_ms"].append(add_ms)
+            samples["edit_ms"].append(edit_ms)
+            samples["delete_ms"].append(delete_ms)
+        point = {name: statistics.median(values) for name, values in samples.items()}
+        point["dom_nodes"] = weight["nodes"]
+        point["js_heap_kb"] = weight["heap"] / 1024 if weight["heap"] is not None else None
+        return point
+
+    def measure_initial_render(self, size):
+        # A new fragment alone would not reload the page; about:blank forces a full load
+        self.driver.get("about:blank")
+        self.driver.get(f"{self.frontend_url}#bench-rows={size}")
+        duration = WebDriverWait(self.driver, self.timeout, poll_frequency=0.05).until(
+            lambda d: d.execute_script(RENDER_MEASURE_JS),
+            f"table never reached {size} rows",
+        )
+        self.page.wait_for_ui_idle()
+        return duration
+
+    def measure_cycle(self, size, attempt):
+        """Add a user, rename it and delete it again. Returns the three durations in ms."""
+        email = f"render.{self.run_id}.{size}.{attempt}@bench.test"
+        self.page.fill_user_form("Render Bench", email, "30")
+        add_ms = self._measure("bench-add", self._button(UserManagementPage.SUBMIT_BUTTON),
+                               rows=size + 1)
+        self.page.wait_for_ui_idle()
+        user_id = self.page.get_user_data_from_table(0)["id"]
+        self.population.created_ids.append(user_id)
+
+        self._button((By.CSS_SELECTOR, "tbody tr:first-child .edit_btn")).click()
+        self.page.wait_for_ui_idle()
+        name_input = self.page.find_element(*UserManagementPage.NAME_INPUT)
+        name_input.clear()
+        name_input.send_keys("Render Bench Edited")
+        edit_ms = self._measure("bench-edit", self._button(UserManagementPage.SUBMIT_BUTTON),
+                                rows=size + 1, id=user_id, column=1, text="Render Bench Edited")
+        self.page.wait_for_ui_idle()
+
+        delete_ms = self._measure("bench-delete", self._button((By.CSS_SELECTOR, "tbody tr:first-child .delete_btn")),
+                                  rows=size, id=user_id, absent=True)
+        self.page.wait_for_ui_idle()
+        self.population.created_ids.remove(user_id)
+        return add_ms, edit_ms, delete_ms
+
+    def _button(self, locator):
+        # Not the page's row helpers: those fetch an element for every row
+        return self.driver.find_element(*locator)
+
+    def _measure(self, name, target, rows=None, id=None, column=0, text=None, absent=False):
+        expectation = {"rows": rows, "id": id, "column": column, "text": text, "absent": absent,
+                       "timeoutMs": self.timeout * 1000}
+        result = self.driver.execute_async_script(ACTION_MEASURE_JS, name, target, expectation)
+        if "error" in result:
+            raise RenderBenchmarkError(result["error"])
+        return result["duration"]
+
+    def cleanup(self):
+        """Delete every user the benchmark created."""
+        self.population.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the app's render times as the users table grows.")
+    parser.add_argument("--frontend-url", default=os.getenv("FRONTEND_URL", "http://localhost:5173"))
+    parser.add_argument("--api-url", default=os.getenv("BACKEND_URL", "http://localhost:3000/api"))
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated table sizes")
+    parser.add_argument("--repeats", type=int, default=3, help="Measurements per size (median is kept)")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for one render")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative growth of a slope before it counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the seeded users afterwards")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated user population")
+    args = parser.parse_args(argv)
+
+    import chromedriver_binary  # noqa: F401  Adds chromedriver to PATH
+
+    api = UsersApi(args.api_url, pool_size=32, timeout=300)
+    driver = launch_driver()
+    benchmark = RenderBenchmark(driver, api, args.frontend_url, sizes=[int(s) for s in args.sizes.split(",")],
+                                repeats=args.repeats, seed=args.seed, timeout=args.timeout)
+    try:
+        metrics = scaling_metrics(benchmark.run())
+    finally:
+        driver.quit()
+        if not args.keep:
+            benchmark.cleanup()
+        api.close()
+
+    for name, value in sorted(metrics.items()):
+        if name.startswith("slope."):
+            print(f"{name:<32} {value:>10.3f}")
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline or baseline is None:
+        save_baseline(args.baseline, metrics, {"sizes": benchmark.sizes, "repeats": args.repeats})
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    # Only the slopes gate the run; the points are kept for plotting the curve
+    slopes = {name: value for name, value in metrics.items() if name.startswith("slope.")}
+    regressions = find_regressions(slopes, baseline, threshold=args.threshold, min_delta=0.5)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
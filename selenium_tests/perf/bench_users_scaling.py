@@ -0,0 +1,128 @@
+"""
+Dataset-scaling benchmark for GET /api/users.
+
+Grows the users collection through a series of sizes (1k, 10k, 100k, 1M by
+default) and at each size measures a full fetch (what the React client does
+on load and after every edit/delete) and a fetch with ?limit=:
+
+- latency: time until the whole response body has been received
+- payload: response body size in bytes
+- parse: time to decode the JSON body, a stand-in for the client's parse
+
+Each measurement is the median of several requests. The metrics are compared
+against a stored JSON baseline and the run exits non-zero when any of them
+regressed beyond the threshold, so the size at which the unpaginated endpoint
+becomes unusable is measured rather than guessed.
+
+Usage:
+    python -m selenium_tests.perf.bench_users_scaling --sizes 1000,10000
+    python -m selenium_tests.perf.bench_users_scaling --update-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from ..api_client import UsersApi
+from .baseline import find_regressions, load_baseline, save_baseline
+from .datagen import Population
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "users_scaling.json")
+SEED_CHUNK = 5_000
+
+
+def measure_fetch(api, limit=None, repeats=5):
+    """Return median latency (ms), payload (bytes) and JSON parse time (ms) for GET /users."""
+    params = {"limit": limit} if limit else None
+    latencies, parses, payload = [], [], 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = api.session.get(f"{api.api_url}/users", params=params, timeout=api.timeout)
+        body = response.content
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        started = time.perf_counter()
+        json.loads(body)
+        parses.append((time.perf_counter() - started) * 1000)
+        payload = len(body)
+    return {
+        "latency_ms": statistics.median(latencies),
+        "payload_bytes": payload,
+        "parse_ms": statistics.median(parses),
+    }
+
+
+class ScalingBenchmark:
+    """Seeds the collection up to each size in turn and measures fetches there."""
+
+    def __init__(self, api, sizes=DEFAULT_SIZES, limit=100, repeats=5, seed=0):
+        self.api = api
+        self.sizes = sorted(sizes)
+        self.limit = limit
+        self.repeats = repeats
+        self.run_id = uuid.uuid4().hex[:8]
+        self.population = Population(api, seed=seed, tag=f"bench{self.run_id}", batch_size=SEED_CHUNK)
+
+    def run(self):
+        """Return a flat metrics dict such as {"10000.full.latency_ms": 41.2, ...}."""
+        metrics = {}
+        for size in self.sizes:
+            if self.population.grow_to(size) > size:
+                print(f"skipping {size}: collection already holds more users", file=sys.stderr)
+                continue
+            for variant, limit in (("full", None), (f"limit{self.limit}", self.limit)):
+                result = measure_fetch(self.api, limit=limit, repeats=self.repeats)
+                for name, value in result.items():
+                    metrics[f"{size}.{variant}.{name}"] = value
+                print(f"{size:>9} {variant:<10} {result['latency_ms']:>10.1f} ms "
+                      f"{result['payload_bytes']:>12} B {result['parse_ms']:>9.1f} ms parse")
+        return metrics
+
+    def cleanup(self):
+        """Delete every user the benchmark created."""
+        self.population.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure GET /api/users as the collection grows.")
+    parser.add_argument("--api-url", default=os.getenv("BACKEND_URL", "http://localhost:3000/api"))
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated collection sizes")
+    parser.add_argument("--limit", type=int, default=100, help="Value used for the ?limit= fetches")
+    parser.add_argument("--repeats", type=int, default=5, help="Requests per measurement (median is kept)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative growth of a metric before it counts as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the seeded users afterwards")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated user population")
+    args = parser.parse_args(argv)
+
+    api = UsersApi(args.api_url, pool_size=32, timeout=300)
+    benchmark = ScalingBenchmark(api, sizes=[int(s) for s in args.sizes.split(",")],
+                                 limit=args.limit, repeats=args.repeats, seed=args.seed)
+    try:
+        metrics = benchmark.run()
+    finally:
+        if not args.keep:
+            benchmark.cleanup()
+        api.close()
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline or baseline is None:
+        save_baseline(args.baseline, metrics, {"sizes": benchmark.sizes, "limit": args.limit})
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    regressions = find_regressions(metrics, baseline, threshold=args.threshold, min_delta=1.0)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+"""
+Browser-side performance metrics for the current page.
+
+Collects Navigation Timing, Resource Timing for the /api/users fetch, first
+contentful paint, long tasks and table render times (recorded by the UI
+tracker from page start) and Chrome DevTools Performance.getMetrics, and exposes them as a flat dict
+of numbers that tests can put budgets on.
+"""
+
+from selenium.common.exceptions import WebDriverException
+
+COLLECT_METRICS_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var paint = performance.getEntriesByName('first-contentful-paint')[0];
+var api = performance.getEntriesByType('resource')
+  .filter(function (e) { return e.name.indexOf('/api/users') !== -1; })
+  .map(function (e) {
+    return { name: e.name, startTime: e.startTime, duration: e.duration,
+             transferSize: e.transferSize, decodedBodySize: e.decodedBodySize };
+  });
+var tracker = window.__uiTracker;
+return {
+  navigation: nav ? nav.toJSON() : null,
+  fcp: paint ? paint.startTime : null,
+  apiUsers: api,
+  longTasks: tracker && tracker.longTasks ? tracker.longTasks : [],
+  tableRenders: tracker && tracker.tableRenders ? tracker.tableRenders : []
+};
+"""
+
+# Chrome's Performance domain reports durations in seconds. Its counters add up
+# from Performance.enable, which the driver pool re-issues for every test.
+CDP_METRICS = {
+    "ScriptDuration": ("script_duration_ms", 1000),
+    "TaskDuration": ("task_duration_ms", 1000),
+    "LayoutDuration": ("layout_duration_ms", 1000),
+    "LayoutCount": ("layout_count", 1),
+    "Nodes": ("dom_nodes", 1),
+    "JSHeapUsedSize": ("js_heap_used_bytes", 1),
+}
+
+
+class BrowserMetrics:
+    """Performance metrics of one page load, flattened into `values`."""
+
+    def __init__(self, raw, cdp=None):
+        self.raw = raw
+        self.cdp = cdp or {}
+        self.values = self._flatten()
+
+    def _flatten(self):
+        values = {}
+        nav = self.raw.get("navigation")
+        if nav:
+            values["ttfb_ms"] = nav["responseStart"] - nav["requestStart"]
+            values["dom_content_loaded_ms"] = nav["domContentLoadedEventEnd"]
+            values["load_event_ms"] = nav["loadEventEnd"]
+        if self.raw.get("fcp") is not None:
+            values["first_contentful_paint_ms"] = self.raw["fcp"]
+        api_calls = self.raw.get("apiUsers") or []
+        if api_calls:
+            # The first call is the initial table load; later ones are refetches
+            values["api_users_ms"] = api_calls[0]["duration"]
+            values["api_users_end_ms"] = api_calls[0]["startTime"] + api_calls[0]["duration"]
+            values["api_users_calls"] = len(api_calls)
+        table_renders = self.raw.get("tableRenders") or []
+        if table_renders:
+            # Users response received until the table's DOM was updated, for the initial load
+            values["table_render_ms"] = table_renders[0]["renderedAt"] - table_renders[0]["fetchedAt"]
+        long_tasks = self.raw.get("longTasks") or []
+        values["long_task_count"] = len(long_tasks)
+        values["long_task_total_ms"] = sum(task["duration"] for task in long_tasks)
+        for name, (key, scale) in CDP_METRICS.items():
+            if name in self.cdp:
+                values[key] = self.cdp[name] * scale
+        return values
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def budget_violations(self, budget):
+        """Return a message for every metric in `budget` that exceeds its limit or is missing."""
+        violations = []
+        for key, limit in budget.items():
+            value = self.values.get(key)
+            if value is None:
+                violations.append(f"{key}: not measured")
+            elif value > limit:
+                violations.append(f"{key}: {value:.1f} > {limit}")
+        return violations
+
+    def assert_budget(self, **budget):
+        """Fail with every exceeded budget at once, e.g. assert_budget(load_event_ms=3000)."""
+        violations = self.budget_violations(budget)
+        assert not violations, "Performance budget exceeded: " + "; ".join(violations)
+
+
+def collect_browser_metrics(driver):
+    """Collect metrics for the page currently loaded in `driver`."""
+    raw = driver.execute_script(COLLECT_METRICS_JS)
+    try:
+        response = driver.execute_cdp_cmd("Performance.getMetrics", {})
+        cdp = {metric["name"]: metric["value"] for metric in response["metrics"]}
+    except (AttributeError, WebDriverException):
+        cdp = {}
+    return BrowserMetrics(raw, cdp)
@@ -0,0 +1,208 @@
+"""
+Synthetic user populations for scale testing.
+
+Generates records matching the User schema (name, email, age) with NumPy,
+a whole batch per vectorized operation instead of a Python loop per record.
+Names follow a Zipf-like popularity distribution, ages a clipped normal
+distribution, and emails are unique because each embeds the record's
+sequence number. Output is streamed batch by batch, as NDJSON or straight
+to the API or the stand-in backend, so memory use depends on the batch size
+rather than the population size. The same (seed, start, batch_size) always
+produces the same records.
+
+Usage:
+    python -m selenium_tests.perf.datagen --count 1000000 --seed 42 --out users.ndjson
+    python -m selenium_tests.perf.datagen --count 100000 --api-url http://localhost:3000/api
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from ..api_client import UsersApi
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Ahmed", "Fatima", "Ali", "Aisha",
+    "Hassan", "Amna", "Omar", "Zainab", "Wei", "Mei", "Raj", "Priya",
+])
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Taylor", "Thomas",
+    "Khan", "Khattak", "Ahmed", "Malik", "Hussain", "Shah", "Chen", "Wang",
+    "Patel", "Singh", "Kim", "Nguyen", "Müller", "Schmidt", "Rossi", "O'Connor",
+])
+DOMAINS = np.array(["gmail.com", "yahoo.com", "outlook.com", "hotmail.com", "test.com"])
+DOMAIN_WEIGHTS = np.array([0.45, 0.2, 0.15, 0.1, 0.1])
+
+
+def zipf_weights(n, exponent=1.1):
+    """Probability of each of `n` ranked items under a Zipf-like distribution."""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+FIRST_WEIGHTS = zipf_weights(len(FIRST_NAMES))
+LAST_WEIGHTS = zipf_weights(len(LAST_NAMES))
+
+
+class UserBatch:
+    """A batch of generated users stored column-wise as NumPy arrays."""
+
+    def __init__(self, names, emails, ages):
+        self.names = names
+        self.emails = emails
+        self.ages = ages
+
+    def __len__(self):
+        return len(self.ages)
+
+    def records(self):
+        """Return the batch as a list of dicts for the API or the stand-in store."""
+        return [
+            {"name": name, "email": email, "age": age}
+            for name, email, age in zip(self.names.tolist(), self.emails.tolist(), self.ages.tolist())
+        ]
+
+    def to_ndjson(self):
+        """Serialize the batch as NDJSON bytes without a per-record Python loop."""
+        names = np.char.replace(self.names, '"', '\\"')
+        lines = np.char.add(np.char.add('{"name":"', names), '","email":"')
+        lines = np.char.add(np.char.add(lines, self.emails), '","age":')
+        lines = np.char.add(np.char.add(lines, self.ages.astype(str)), "}\n")
+        return "".join(lines.tolist()).encode()
+
+
+def generate_batches(count, seed=0, batch_size=10_000, start=0, tag=""):
+    """
+    Yield UserBatch objects until `count` users have been generated.
+
+    `start` offsets the sequence numbers embedded in the emails so several
+    calls can extend one population without collisions, and `tag` (for
+    example a run id) keeps separate populations apart.
+    """
+    rng = np.random.default_rng([seed, start])
+    for offset in range(0, count, batch_size):
+        n = min(batch_size, count - offset)
+        first = rng.choice(FIRST_NAMES, size=n, p=FIRST_WEIGHTS)
+        last = rng.choice(LAST_NAMES, size=n, p=LAST_WEIGHTS)
+        domains = rng.choice(DOMAINS, size=n, p=DOMAIN_WEIGHTS)
+        ages = np.clip(np.rint(rng.normal(38, 13, size=n)), 18, 90).astype(np.int64)
+        sequence = np.arange(start + offset, start + offset + n).astype(str)
+
+        names = np.char.add(np.char.add(first, " "), last)
+        local = np.char.add(np.char.add(np.char.lower(first), "."), np.char.lower(last))
+        local = np.char.replace(np.char.replace(local, "'", ""), "ü", "u")
+        local = np.char.add(np.char.add(local, f".{tag}." if tag else "."), sequence)
+        emails = np.char.add(np.char.add(local, "@"), domains)
+        yield UserBatch(names, emails, ages)
+
+
+def write_ndjson(stream, batches):
+    """Write batches to a binary stream as NDJSON. Returns the number of records."""
+    written = 0
+    for batch in batches:
+        stream.write(batch.to_ndjson())
+        written += len(batch)
+    return written
+
+
+def upload(api, batches, concurrency=None):
+    """Create every user through the API, one batch at a time. Yields the ids of each batch."""
+    for batch in batches:
+        yield api.create_users(batch.records(), concurrency=concurrency)
+
+
+class Population:
+    """
+    Generated users created through the API in growing steps, remembered so
+    they can be deleted again. Users already in the collection count toward
+    the target size.
+
+    The collection is only counted as far as the target needs: `existing`
+    is a lower bound while `existing_capped` is set, and is recounted when
+    a larger target could still be reached.
+    """
+
+    def __init__(self, api, seed=0, tag="", batch_size=5_000):
+        self.api = api
+        self.seed = seed
+        self.tag = tag
+        self.batch_size = batch_size
+        self.existing = None
+        self.existing_capped = False
+        self.created_ids = []
+
+    def size(self):
+        return self.existing + len(self.created_ids)
+
+    def grow_to(self, size):
+        """
+        Create users until the collection holds `size` documents. Returns the
+        new size, or a number above `size` if the collection already held more.
+        """
+        if self.existing is None or self.existing_capped and self.existing <= size:
+            # No count endpoint; `limit` keeps this to at most size + 1 documents
+            counted = len(self.api.list_users(limit=size + 1))
+            self.existing = counted - len(self.created_ids)
+            self.existing_capped = counted > size
+        missing = size - self.size()
+        if missing > 0:
+            batches = generate_batches(missing, seed=self.seed, batch_size=self.batch_size,
+                                       start=len(self.created_ids), tag=self.tag)
+            try:
+                for ids in upload(self.api, batches):
+                    self.created_ids.extend(ids)
+            except Exception as error:
+                # Whatever a failed batch did create is still ours to delete
+                self.created_ids.extend(getattr(error, "created_ids", []))
+                raise
+        return self.size()
+
+    def cleanup(self):
+        """Delete every user this population created."""
+        self.api.delete_users(self.created_ids)
+        self.created_ids = []
+
+
+def load_into_store(store, batches):
+    """Insert batches directly into a stand-in UserStore. Returns the number of records."""
+    loaded = 0
+    for batch in batches:
+        store.bulk_create(batch.records())
+        loaded += len(batch)
+    return loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic users.")
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--tag", default="", help="Extra token embedded in every email")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out", help="NDJSON file to write ('-' for stdout)")
+    target.add_argument("--api-url", help="Create the users through this API instead")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    batches = generate_batches(args.count, args.seed, args.batch_size, tag=args.tag)
+    if args.api_url:
+        api = UsersApi(args.api_url, pool_size=args.concurrency)
+        try:
+            created = sum(len(ids) for ids in upload(api, batches))
+        finally:
+            api.close()
+        print(f"Created {created} users", file=sys.stderr)
+    elif args.out and args.out != "-":
+        with open(args.out, "wb") as f:
+            write_ndjson(f, batches)
+    else:
+        write_ndjson(sys.stdout.buffer, batches)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
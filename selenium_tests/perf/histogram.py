@@ -0,0 +1,81 @@
+"""
+Log-linear latency histogram in the style of HdrHistogram.
+
+Values are recorded as integer microseconds into buckets whose width grows
+with the magnitude of the value, so memory stays small while every recorded
+value keeps a bounded relative error (about 1% with the default precision).
+Percentiles are therefore exact to within that error regardless of how many
+samples are recorded, which a plain list of samples can't offer at high RPS.
+"""
+
+import math
+
+
+class Histogram:
+    """Records latencies in microseconds and reports percentiles."""
+
+    def __init__(self, precision_bits=7):
+        self.precision_bits = precision_bits
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value):
+        shift = max(value.bit_length() - self.precision_bits, 0)
+        return (shift << self.precision_bits) | (value >> shift)
+
+    def _highest_equivalent(self, index):
+        shift = index >> self.precision_bits
+        mantissa = index & ((1 << self.precision_bits) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us, count=1):
+        """Record a latency (in microseconds) `count` times."""
+        value = max(int(value_us), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def record_seconds(self, seconds):
+        """Record a latency measured in seconds."""
+        self.record(seconds * 1_000_000)
+
+    def merge(self, other):
+        """Add all samples from another histogram with the same precision."""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+
+    def value_at_percentile(self, percentile):
+        """Return the latency (microseconds) at or below which `percentile`% of samples fall."""
+        if not self.total:
+            return 0
+        target = max(math.ceil(self.total * percentile / 100), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0
+
+    def summary_ms(self, percentiles=(50, 95, 99)):
+        """Return count, mean, the given percentiles and max, in milliseconds."""
+        summary = {"count": self.total, "mean": self.mean() / 1000}
+        for percentile in percentiles:
+            summary[f"p{percentile:g}"] = self.value_at_percentile(percentile) / 1000
+        summary["max"] = self.max / 1000
+        return summary
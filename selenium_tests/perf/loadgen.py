@@ -0,0 +1,263 @@
+"""
+Asyncio load generator for the users API.
+
+Drives GET /users, POST /addUser, PUT /users/:id and DELETE /users/:id from a
+single event loop with a configurable request mix, concurrency and target
+rate, and reports throughput plus p50/p95/p99/max latency per operation.
+
+With a target rate the generator is open-loop: requests are scheduled on a
+fixed timetable and latency is measured from the scheduled start, so time a
+request spends waiting for a free worker counts against the server instead
+of silently lowering the offered load (coordinated omission).
+
+Usage:
+    python -m selenium_tests.perf.loadgen --api-url http://localhost:3000/api \\
+        --concurrency 32 --rps 200 --duration 30 --mix list=70,add=10,update=10,delete=10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+import aiohttp
+
+from .histogram import Histogram
+
+OPERATIONS = ("list", "add", "update", "delete")
+DEFAULT_MIX = {"list": 70, "add": 10, "update": 10, "delete": 10}
+
+
+def parse_mix(text):
+    """Parse "list=70,add=10,..." into a weights dict."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class OperationStats:
+    """Latency histogram and error count for one operation."""
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+
+
+class LoadReport:
+    """Results of a load run."""
+
+    def __init__(self, stats, elapsed, config):
+        self.stats = stats
+        self.elapsed = elapsed
+        self.config = config
+
+    def overall(self):
+        histogram = Histogram()
+        for stats in self.stats.values():
+            histogram.merge(stats.histogram)
+        return histogram
+
+    def as_dict(self):
+        result = {"config": self.config, "elapsed_s": self.elapsed, "operations": {}}
+        for name, stats in list(self.stats.items()) + [("total", None)]:
+            histogram = self.overall() if stats is None else stats.histogram
+            errors = sum(s.errors for s in self.stats.values()) if stats is None else stats.errors
+            summary = histogram.summary_ms()
+            summary["errors"] = errors
+            summary["throughput_rps"] = histogram.total / self.elapsed if self.elapsed else 0
+            result["operations"][name] = summary
+        return result
+
+    def format(self):
+        lines = [
+            f"{'operation':<10}{'count':>8}{'errors':>8}{'rps':>9}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        ]
+        for name, row in self.as_dict()["operations"].items():
+            lines.append(
+                f"{name:<10}{row['count']:>8}{row['errors']:>8}{row['throughput_rps']:>9.1f}"
+                f"{row['p50']:>10.2f}{row['p95']:>10.2f}{row['p99']:>10.2f}{row['max']:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """
+    Generates load against the users API.
+
+    `rps=None` runs closed-loop (every worker sends as fast as responses
+    come back). Users created by the run are deleted at the end unless
+    `cleanup=False`. Update and delete fall back to an add while the run has
+    not created any users yet.
+    """
+
+    def __init__(self, api_url, concurrency=16, rps=None, duration=30, mix=None,
+                 list_limit=None, cleanup=True, seed=None):
+        self.api_url = api_url.rstrip("/")
+        self.concurrency = concurrency
+        self.rps = rps
+        self.duration = duration
+        self.mix = mix or DEFAULT_MIX
+        self.list_limit = list_limit
+        self.cleanup = cleanup
+        self.random = random.Random(seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.created_ids = []
+        self.stats = {name: OperationStats() for name in OPERATIONS}
+        self._counter = 0
+
+    def run(self):
+        """Run the load test and return a LoadReport."""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            started = time.perf_counter()
+            deadline = started + self.duration
+            if self.rps:
+                queue = asyncio.Queue()
+                workers = [asyncio.create_task(self._open_loop_worker(session, queue))
+                           for _ in range(self.concurrency)]
+                await self._schedule(queue, started, deadline)
+                for _ in workers:
+                    queue.put_nowait(None)
+                await asyncio.gather(*workers)
+            else:
+                await asyncio.gather(*(self._closed_loop_worker(session, deadline)
+                                       for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - started
+            if self.cleanup:
+                await self._delete_created(session)
+        config = {"concurrency": self.concurrency, "rps": self.rps,
+                  "duration_s": self.duration, "mix": self.mix}
+        return LoadReport(self.stats, elapsed, config)
+
+    async def _schedule(self, queue, started, deadline):
+        """Enqueue one intended start time every 1/rps seconds until the deadline."""
+        interval = 1.0 / self.rps
+        intended = started
+        while intended < deadline:
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            queue.put_nowait(intended)
+            intended += interval
+
+    async def _open_loop_worker(self, session, queue):
+        while True:
+            intended = await queue.get()
+            if intended is None:
+                return
+            await self._execute(session, self._pick_operation(), intended)
+
+    async def _closed_loop_worker(self, session, deadline):
+        while time.perf_counter() < deadline:
+            await self._execute(session, self._pick_operation(), time.perf_counter())
+
+    def _pick_operation(self):
+        names = list(self.mix)
+        operation = self.random.choices(names, weights=[self.mix[n] for n in names])[0]
+        if operation in ("update", "delete") and not self.created_ids:
+            return "add"
+        return operation
+
+    def _new_user(self):
+        self._counter += 1
+        return {
+            "name": f"Load User {self._counter}",
+            "email": f"load+{self.run_id}-{self._counter}@load.test",
+            "age": self.random.randint(18, 80),
+        }
+
+    def _request_for(self, operation):
+        """
+        Return (method, url, request kwargs, user id). Update and delete
+        check their user out of `created_ids` while the request is in flight,
+        so no two requests ever target the same user at once.
+        """
+        if operation == "list":
+            params = {"limit": self.list_limit} if self.list_limit else None
+            return "GET", f"{self.api_url}/users", {"params": params}, None
+        if operation == "add":
+            return "POST", f"{self.api_url}/addUser", {"json": self._new_user()}, None
+        index = self.random.randrange(len(self.created_ids))
+        user_id = self.created_ids.pop(index)
+        if operation == "update":
+            return "PUT", f"{self.api_url}/users/{user_id}", {"json": self._new_user()}, user_id
+        return "DELETE", f"{self.api_url}/users/{user_id}", {}, user_id
+
+    async def _execute(self, session, operation, intended):
+        stats = self.stats[operation]
+        method, url, kwargs, user_id = self._request_for(operation)
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                ok = response.status < 400
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            body, ok = None, False
+        stats.histogram.record_seconds(time.perf_counter() - intended)
+        if operation == "add" and ok:
+            try:
+                self.created_ids.append(json.loads(body)["_id"])
+            except (ValueError, KeyError, TypeError):
+                # A 2xx that isn't the saved user, e.g. an HTML page from a proxy or Vite
+                ok = False
+        if not ok:
+            stats.errors += 1
+        if operation == "update" or (operation == "delete" and not ok):
+            # The user still exists: available again, and deleted at cleanup
+            self.created_ids.append(user_id)
+
+    async def _delete_created(self, session):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def delete(user_id):
+            async with semaphore:
+                try:
+                    async with session.delete(f"{self.api_url}/users/{user_id}") as response:
+                        await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+
+        ids, self.created_ids = self.created_ids, []
+        await asyncio.gather(*(delete(user_id) for user_id in ids))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate load against the users API.")
+    parser.add_argument("--api-url", default=os.getenv("BACKEND_URL", "http://localhost:3000/api"))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=None, help="Target request rate (default: as fast as possible)")
+    parser.add_argument("--duration", type=float, default=30, help="Run time in seconds")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Operation weights, e.g. list=70,add=10,update=10,delete=10")
+    parser.add_argument("--list-limit", type=int, default=None, help="Pass ?limit= on GET /users")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the users created by the run")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    generator = LoadGenerator(
+        args.api_url, concurrency=args.concurrency, rps=args.rps, duration=args.duration,
+        mix=args.mix, list_limit=args.list_limit, cleanup=not args.keep, seed=args.seed,
+    )
+    report = generator.run()
+    print(report.format())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.as_dict(), f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
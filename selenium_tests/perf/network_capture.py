@@ -0,0 +1,141 @@
+"""
+Capture of the network requests a UI action triggers.
+
+In the browser the requests come from Chrome's performance log, which
+ChromeDriver fills with DevTools Network events when the session is started
+with `goog:loggingPrefs` (see driver_pool.build_chrome_options). Only the
+app's own XHR/fetch calls are kept by default: CORS preflights, scripts and
+images are left out. In contract mode the same capture is built from a
+requests response hook on the UsersApi session.
+
+Page objects expose this as `network_budget()`, so a test can state how
+many requests an action may make and how much it may download:
+
+    with page.network_budget(max_requests=2):
+        page.delete_user(row)   # DELETE plus the GET /users refetch
+"""
+
+import json
+from contextlib import contextmanager
+
+API_RESOURCE_TYPES = ("XHR", "Fetch")
+
+
+class NetworkRequest:
+    """One request: method, URL, status, bytes received and duration."""
+
+    __slots__ = ("method", "url", "status", "bytes", "duration_ms", "failed")
+
+    def __init__(self, method, url, status=None, bytes=0, duration_ms=None, failed=False):
+        self.method = method
+        self.url = url
+        self.status = status
+        self.bytes = bytes
+        self.duration_ms = duration_ms
+        self.failed = failed
+
+    def __repr__(self):
+        status = "failed" if self.failed else self.status or "pending"
+        duration = f"{self.duration_ms:.0f} ms" if self.duration_ms is not None else "unfinished"
+        return f"{self.method} {self.url} {status} {self.bytes / 1024:.1f} KB {duration}"
+
+
+class NetworkCapture:
+    """Requests made while a with-block ran; filled in when the block exits."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __iter__(self):
+        return iter(self.requests)
+
+    def __len__(self):
+        return len(self.requests)
+
+    @property
+    def total_bytes(self):
+        return sum(request.bytes for request in self.requests)
+
+    def budget_violations(self, max_requests=None, max_kb=None):
+        """Return a message for every limit the captured requests exceed."""
+        violations = []
+        if max_requests is not None and len(self.requests) > max_requests:
+            violations.append(f"{len(self.requests)} requests > {max_requests}")
+        if max_kb is not None and self.total_bytes / 1024 > max_kb:
+            violations.append(f"{self.total_bytes / 1024:.1f} KB > {max_kb} KB")
+        return violations
+
+    def assert_budget(self, max_requests=None, max_kb=None):
+        """Fail with every exceeded limit and the list of requests made."""
+        violations = self.budget_violations(max_requests, max_kb)
+        assert not violations, (
+            "Network budget exceeded: " + "; ".join(violations)
+            + "".join(f"\n    {request!r}" for request in self.requests)
+        )
+
+
+def requests_from_performance_log(entries, resource_types=API_RESOURCE_TYPES):
+    """
+    Turn ChromeDriver performance log entries into NetworkRequests, in the
+    order they were sent. Requests still unfinished at the end are included.
+    `resource_types=None` keeps every type.
+    """
+    requests, by_id, started = [], {}, {}
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method, params = message["method"], message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            if resource_types and params.get("type") not in resource_types:
+                continue
+            request = NetworkRequest(params["request"]["method"], params["request"]["url"])
+            by_id[params["requestId"]] = request
+            started[params["requestId"]] = params["timestamp"]
+            requests.append(request)
+            continue
+        request = by_id.get(params.get("requestId"))
+        if request is None:
+            continue
+        if method == "Network.responseReceived":
+            request.status = params["response"]["status"]
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            request.failed = method == "Network.loadingFailed"
+            request.bytes = params.get("encodedDataLength", 0)
+            request.duration_ms = (params["timestamp"] - started[params["requestId"]]) * 1000
+            del by_id[params["requestId"]]
+    return requests
+
+
+@contextmanager
+def capture_browser_network(driver, resource_types=API_RESOURCE_TYPES):
+    """Record the requests the page makes inside the with-block."""
+    capture = NetworkCapture()
+    driver.get_log("performance")  # Drop everything logged before the block
+    yield capture
+    capture.requests.extend(requests_from_performance_log(driver.get_log("performance"), resource_types))
+
+
+@contextmanager
+def capture_session_network(session):
+    """Record the requests made through a requests.Session inside the with-block."""
+    capture = NetworkCapture()
+
+    def record(response, *args, **kwargs):
+        capture.requests.append(NetworkRequest(
+            response.request.method, response.url, response.status_code,
+            len(response.content), response.elapsed.total_seconds() * 1000,
+        ))
+        return response
+
+    session.hooks["response"].append(record)
+    try:
+        yield capture
+    finally:
+        session.hooks["response"].remove(record)
+
+
+@contextmanager
+def within_budget(capture_context, max_requests=None, max_kb=None):
+    """Run the with-block under a capture and fail if it exceeded the budget."""
+    with capture_context as capture:
+        yield capture
+    capture.assert_budget(max_requests=max_requests, max_kb=max_kb)
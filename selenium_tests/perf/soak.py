@@ -0,0 +1,315 @@
+"""
+Concurrent UI soak: many simultaneous operators on the real app.
+
+Runs K Chrome sessions in parallel threads. Each session loops randomized
+add, edit and delete flows through UserManagementPage for a set duration.
+Emails are drawn from a small shared pool, so sessions race each other on
+the unique email index just like several operators would. The sweep is
+repeated for every K in --sessions and reports, per K:
+
+- operations per second, and latency percentiles per operation
+- error rate: operations the app failed (HTTP status >= 400 from the API,
+  as seen through the browser's network log), which includes the 500 and
+  404 responses behind the stale-view incidents below
+- harness error rate: operations the test harness itself could not carry
+  out (a WebDriver error such as a missing element), counted apart so a
+  broken selector is not mistaken for an application error rate
+- stale-view incidents:
+    duplicate_rejected  the client's duplicate check (a users.some() over
+                        its possibly stale list) passed, but the server
+                        rejected the email with a 500
+    stale_target        an edit or delete hit a user another session had
+                        already deleted (404), so the table showed a ghost
+    ghost_checks        periodic checks that found rows in a session's
+                        table which no longer exist on the server
+
+Usage:
+    python -m selenium_tests.perf.soak --sessions 1,2,4,8 --duration 60
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+from selenium.common.exceptions import WebDriverException
+
+from ..api_client import UsersApi
+from ..driver_pool import launch_driver
+from ..pages.user_management_page import UserManagementPage
+from .histogram import Histogram
+
+OPERATIONS = ("add", "edit", "delete")
+DEFAULT_MIX = {"add": 50, "edit": 30, "delete": 20}
+INCIDENTS = ("duplicate_rejected", "stale_target", "ghost_checks")
+
+
+class SoakError(RuntimeError):
+    """Raised when a sweep step cannot run with the requested number of sessions."""
+
+
+def parse_mix(text):
+    """Parse "add=50,edit=30,delete=20" into a weights dict."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class SoakStats:
+    """Counters and latency histograms of one session; merged across sessions afterwards."""
+
+    def __init__(self):
+        self.histograms = {name: Histogram() for name in OPERATIONS}
+        self.errors = dict.fromkeys(OPERATIONS, 0)
+        self.harness_errors = dict.fromkeys(OPERATIONS, 0)
+        self.blocked = 0
+        self.incidents = dict.fromkeys(INCIDENTS, 0)
+        self.checks = 0
+
+    def merge(self, other):
+        for name in OPERATIONS:
+            self.histograms[name].merge(other.histograms[name])
+            self.errors[name] += other.errors[name]
+            self.harness_errors[name] += other.harness_errors[name]
+        for name in INCIDENTS:
+            self.incidents[name] += other.incidents[name]
+        self.blocked += other.blocked
+        self.checks += other.checks
+
+    def summary(self, elapsed):
+        """Flat dict of the headline numbers for one sweep step."""
+        total = Histogram()
+        for histogram in self.histograms.values():
+            total.merge(histogram)
+        errors = sum(self.errors.values())
+        harness_errors = sum(self.harness_errors.values())
+        result = {
+            "operations": total.total,
+            "ops_per_s": total.total / elapsed if elapsed else 0,
+            "error_rate": errors / total.total if total.total else 0,
+            "harness_error_rate": harness_errors / total.total if total.total else 0,
+            "blocked_duplicates": self.blocked,
+            "checks": self.checks,
+            **self.incidents,
+        }
+        for name, histogram in list(self.histograms.items()) + [("all", total)]:
+            for key, value in histogram.summary_ms().items():
+                if key != "mean":
+                    result[f"{name}.{key}"] = value
+        return result
+
+
+class OperatorSession:
+    """One simulated operator: a browser running random flows until the deadline."""
+
+    def __init__(self, driver, api, frontend_url, emails, mix, seed, check_every=5):
+        self.page = UserManagementPage(driver)
+        self.api = api
+        self.frontend_url = frontend_url
+        self.emails = emails
+        self.mix = mix
+        self.random = random.Random(seed)
+        self.check_every = check_every
+        self.stats = SoakStats()
+        self.error = None
+
+    def run(self, deadline):
+        try:
+            self.page.navigate(self.frontend_url)
+            done = 0
+            while time.monotonic() < deadline:
+                rows = self.page.get_users_count()
+                operation = self.random.choices(list(self.mix), weights=list(self.mix.values()))[0]
+                if not rows:
+                    operation = "add"
+                self._perform(operation, rows)
+                done += 1
+                if self.check_every and done % self.check_every == 0:
+                    self._check_for_ghosts()
+        except Exception as error:  # Keep the other sessions going; reported at the end
+            self.error = error
+
+    def _perform(self, operation, rows):
+        started = time.monotonic()
+        failed = False
+        try:
+            with self.page.capture_network() as requests:
+                if operation == "add":
+                    self._add()
+                elif operation == "edit":
+                    self._edit(self.random.randrange(rows))
+                else:
+                    self.page.delete_user(self.random.randrange(rows))
+        except WebDriverException:
+            failed = True
+            requests = ()
+            self.page.get_alert_text()  # An alert would block the next operation
+            self.page.refresh_page()
+        self.stats.histograms[operation].record_seconds(time.monotonic() - started)
+        statuses = [request.status for request in requests if request.status]
+        if failed:
+            self.stats.harness_errors[operation] += 1
+        if any(status >= 400 for status in statuses):
+            self.stats.errors[operation] += 1
+        if operation == "add" and 500 in statuses:
+            self.stats.incidents["duplicate_rejected"] += 1
+        if operation != "add" and 404 in statuses:
+            self.stats.incidents["stale_target"] += 1
+
+    def _add(self):
+        email = self.random.choice(self.emails)
+        self.page.add_user(f"Operator {self.random.randrange(1000)}", email, str(self.random.randint(18, 90)))
+        if self.page.get_alert_text() is not None:
+            self.stats.blocked += 1  # The client caught the duplicate itself
+
+    def _edit(self, row):
+        self.page.edit_user(row)
+        form = self.page.get_form_field_values()
+        # Keep the email, so edits don't collide with the duplicate check
+        self.page.fill_user_form(f"Edited {self.random.randrange(1000)}", form["email"], form["age"] or "30")
+        self.page.submit_form()
+
+    def _check_for_ghosts(self):
+        shown = {row.id for row in self.page.iter_users()}
+        existing = {user["_id"] for user in self.api.list_users()}
+        self.stats.checks += 1
+        if shown - existing:
+            self.stats.incidents["ghost_checks"] += 1
+
+
+class SoakTest:
+    """Runs the sweep over session counts and cleans up the users it created."""
+
+    def __init__(self, api, frontend_url, duration=60, mix=None, email_pool=50, seed=0, check_every=5):
+        self.api = api
+        self.frontend_url = frontend_url
+        self.duration = duration
+        self.mix = mix or DEFAULT_MIX
+        self.seed = seed
+        self.check_every = check_every
+        self.run_id = uuid.uuid4().hex[:8]
+        self.emails = [f"soak.{self.run_id}.{number}@soak.test" for number in range(email_pool)]
+
+    def run_step(self, sessions):
+        """Run `sessions` operators at once for the duration. Returns the summary dict."""
+        drivers, launch_errors = [], []
+
+        def launch():
+            try:
+                drivers.append(launch_driver())
+            except Exception as error:
+                launch_errors.append(error)
+
+        launchers = [threading.Thread(target=launch) for _ in range(sessions)]
+        for thread in launchers:
+            thread.start()
+        for thread in launchers:
+            thread.join()
+        try:
+            if launch_errors:
+                # A step with fewer browsers than asked would be reported under the wrong K
+                raise SoakError(f"{len(launch_errors)} of {sessions} browsers failed to start: {launch_errors[0]!r}")
+            operators = [
+                OperatorSession(driver, self.api, self.frontend_url, self.emails, self.mix,
+                                seed=self.seed * 1_000_003 + sessions * 1_009 + number,
+                                check_every=self.check_every)
+                for number, driver in enumerate(drivers)
+            ]
+            deadline = time.monotonic() + self.duration
+            started = time.monotonic()
+            threads = [threading.Thread(target=operator.run, args=(deadline,)) for operator in operators]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            for driver in drivers:
+                driver.quit()
+        stats = SoakStats()
+        for operator in operators:
+            stats.merge(operator.stats)
+        summary = stats.summary(elapsed)
+        summary["sessions"] = sessions
+        summary["crashed_sessions"] = [repr(operator.error) for operator in operators if operator.error]
+        return summary
+
+    def cleanup(self):
+        """Delete every user with one of this run's emails."""
+        ids = [user["_id"] for user in self.api.list_users() if user.get("email", "").startswith(f"soak.{self.run_id}.")]
+        return self.api.delete_users(ids)
+
+
+def format_sweep(summaries):
+    lines = [
+        f"{'K':>3}{'ops':>7}{'ops/s':>8}{'err %':>7}{'harn %':>8}{'blocked':>9}{'dup 500':>9}{'stale':>7}"
+        f"{'ghosts':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    ]
+    for row in summaries:
+        lines.append(
+            f"{row['sessions']:>3}{row['operations']:>7}{row['ops_per_s']:>8.2f}{row['error_rate'] * 100:>7.1f}"
+            f"{row['harness_error_rate'] * 100:>8.1f}"
+            f"{row['blocked_duplicates']:>9}{row['duplicate_rejected']:>9}{row['stale_target']:>7}"
+            f"{row['ghost_checks']:>4}/{row['checks']:<3}{row['all.p50']:>9.0f}{row['all.p95']:>9.0f}{row['all.p99']:>9.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the app with many concurrent browser sessions.")
+    parser.add_argument("--frontend-url", default=os.getenv("FRONTEND_URL", "http://localhost:5173"))
+    parser.add_argument("--api-url", default=os.getenv("BACKEND_URL", "http://localhost:3000/api"))
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated session counts to sweep")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per session count")
+    parser.add_argument("--mix", default="add=50,edit=30,delete=20", help="Operation weights")
+    parser.add_argument("--email-pool", type=int, default=50,
+                        help="Distinct emails shared by all sessions; smaller means more collisions")
+    parser.add_argument("--check-every", type=int, default=5,
+                        help="Compare a session's table with the server every N operations (0 disables)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the per-K summaries to this file")
+    parser.add_argument("--max-error-rate", type=float,
+                        help="Exit with status 1 if any step's app error rate exceeds this fraction")
+    parser.add_argument("--max-harness-error-rate", type=float, default=0.05,
+                        help="Exit with status 2 if any step's harness error rate exceeds this fraction, "
+                             "since its numbers then say little about the app")
+    args = parser.parse_args(argv)
+
+    import chromedriver_binary  # noqa: F401  Adds chromedriver to PATH
+
+    api = UsersApi(args.api_url)
+    soak = SoakTest(api, args.frontend_url, duration=args.duration, mix=parse_mix(args.mix),
+                    email_pool=args.email_pool, seed=args.seed, check_every=args.check_every)
+    summaries = []
+    try:
+        for sessions in (int(k) for k in args.sessions.split(",")):
+            print(f"Soaking with {sessions} sessions for {args.duration:.0f}s...")
+            summaries.append(soak.run_step(sessions))
+            for crash in summaries[-1]["crashed_sessions"]:
+                print(f"    session crashed: {crash}")
+    finally:
+        soak.cleanup()
+        api.close()
+
+    print(format_sweep(summaries))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+    if any(row["harness_error_rate"] > args.max_harness_error_rate for row in summaries):
+        print("Too many operations failed in the harness (WebDriver errors); check the page object's locators")
+        return 2
+    if args.max_error_rate is not None and any(row["error_rate"] > args.max_error_rate for row in summaries):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
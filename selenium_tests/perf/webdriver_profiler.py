@@ -0,0 +1,213 @@
+"""
+WebDriver command profiler.
+
+Wraps a driver's command executor so every WebDriver command (findElement,
+clickElement, executeScript, CDP calls, ...) is timed and attributed to:
+
+- the test that issued it
+- the locator it used; element commands inherit the locator of the
+  findElement call that returned the element
+- the innermost page-object method on the call stack, plus the whole
+  chain of page-object and test frames above it
+
+At the end of the session it writes a per-test and per-method breakdown
+(count, total, p95) and a collapsed-stack file (one "frame;frame;command
+value" line per distinct stack, value in microseconds) that flamegraph.pl,
+speedscope or inferno can render.
+
+Enabled with `pytest --profile-webdriver` or PROFILE_WEBDRIVER=1.
+"""
+
+import os
+import sys
+import time
+from collections import defaultdict
+
+import pytest
+
+from ..parallel import worker_id
+from .histogram import Histogram
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PACKAGE_DIR, "pages") + os.sep
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+FIND_COMMANDS = {
+    "findElement", "findElements", "findChildElement", "findChildElements",
+}
+# Commands issued outside any test: pool resets, session setup
+NO_TEST = "<driver pool>"
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    if hasattr(code, "co_qualname"):
+        return code.co_qualname
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        for cls in type(owner).__mro__:
+            func = cls.__dict__.get(code.co_name)
+            if getattr(func, "__code__", None) is code:
+                return f"{cls.__name__}.{code.co_name}"
+    return code.co_name
+
+
+def _call_stack():
+    """Names of the suite's own frames (tests, fixtures, page objects), outermost first."""
+    frames = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PACKAGE_DIR) and filename != __file__:
+            frames.append((_frame_name(frame), filename.startswith(PAGES_DIR)))
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+class CommandRecord:
+    """One timed WebDriver command."""
+
+    __slots__ = ("test", "command", "locator", "duration_us", "method", "stack")
+
+    def __init__(self, test, command, locator, duration_us, method, stack):
+        self.test = test
+        self.command = command
+        self.locator = locator
+        self.duration_us = duration_us
+        self.method = method
+        self.stack = stack
+
+
+class CommandStats:
+    """Count, total and latency distribution of a group of commands."""
+
+    def __init__(self):
+        self.histogram = Histogram()
+        self.count = 0
+        self.total_us = 0
+
+    def record(self, duration_us):
+        self.histogram.record(duration_us)
+        self.count += 1
+        self.total_us += duration_us
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total_us / 1000,
+            "p95_ms": self.histogram.value_at_percentile(95) / 1000,
+        }
+
+
+class WebDriverProfiler:
+    """Pytest plugin that times every command sent through the attached drivers."""
+
+    def __init__(self, output_prefix="webdriver_profile"):
+        self.output_prefix = output_prefix
+        self.records = []
+        self.current_test = NO_TEST
+        self._locators = {}
+
+    def attach(self, driver):
+        """Wrap the driver's command executor. Safe to call again on a pooled driver."""
+        executor = driver.command_executor
+        if getattr(executor, "_profiler", None) is self:
+            return
+        original = executor.execute
+
+        def execute(command, params):
+            stack = _call_stack()
+            started = time.perf_counter()
+            try:
+                response = original(command, params)
+            finally:
+                duration_us = (time.perf_counter() - started) * 1e6
+                self._record(command, params, duration_us, stack)
+            if command in FIND_COMMANDS:
+                self._remember_elements(command, params, response)
+            return response
+
+        executor.execute = execute
+        executor._profiler = self
+
+    def _locator(self, command, params):
+        if command in FIND_COMMANDS:
+            locator = f"{params.get('using')}={params.get('value')}"
+            parent = self._locators.get(params.get("id"))
+            return f"{parent} >> {locator}" if parent else locator
+        return self._locators.get(params.get("id"), "")
+
+    def _remember_elements(self, command, params, response):
+        value = (response or {}).get("value")
+        elements = value if isinstance(value, list) else [value]
+        locator = self._locator(command, params)
+        for element in elements:
+            if isinstance(element, dict) and ELEMENT_KEY in element:
+                self._locators[element[ELEMENT_KEY]] = locator
+
+    def _record(self, command, params, duration_us, stack):
+        method = next((name for name, is_page in reversed(stack) if is_page), None)
+        if method is None and stack:
+            method = stack[-1][0]
+        self.records.append(CommandRecord(
+            self.current_test, command, self._locator(command, params or {}),
+            duration_us, method or "<unknown>", tuple(name for name, _ in stack),
+        ))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.current_test = item.nodeid
+        self._locators = {}
+        try:
+            yield
+        finally:
+            self.current_test = NO_TEST
+
+    def breakdown(self, key):
+        """Group commands by `key` ("test", "method" or "command"). Returns {name: stats dict}."""
+        groups = defaultdict(CommandStats)
+        for record in self.records:
+            groups[getattr(record, key)].record(record.duration_us)
+        return {name: stats.as_dict() for name, stats in groups.items()}
+
+    def collapsed_stacks(self):
+        """Return flamegraph input lines: "test;frame;...;command locator <microseconds>"."""
+        folded = defaultdict(float)
+        for record in self.records:
+            leaf = f"{record.command} {record.locator}".strip()
+            frames = (record.test.split("::")[-1],) + record.stack + (leaf,)
+            folded[";".join(f.replace(";", ",") for f in frames)] += record.duration_us
+        return [f"{stack} {round(value)}" for stack, value in sorted(folded.items())]
+
+    def format(self, limit=None):
+        lines = []
+        for key, title in (("test", "Per test"), ("method", "Per page-object method"), ("command", "Per command")):
+            rows = sorted(self.breakdown(key).items(), key=lambda row: row[1]["total_ms"], reverse=True)
+            lines.append(f"{title}:")
+            lines.append(f"  {'count':>7} {'total ms':>10} {'p95 ms':>8}  name")
+            for name, stats in rows[:limit]:
+                lines.append(f"  {stats['count']:>7} {stats['total_ms']:>10.1f} {stats['p95_ms']:>8.1f}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _output_path(self, suffix):
+        worker = worker_id()
+        name = self.output_prefix if worker == "main" else f"{self.output_prefix}.{worker}"
+        return f"{name}{suffix}"
+
+    def pytest_sessionfinish(self, session):
+        if not self.records:
+            return
+        with open(self._output_path(".txt"), "w") as f:
+            f.write(self.format())
+        with open(self._output_path(".folded"), "w") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.records:
+            return
+        terminalreporter.write_sep("-", "WebDriver command profile")
+        terminalreporter.write_line(self.format(limit=10))
+        terminalreporter.write_line(
+            f"Full report: {self._output_path('.txt')}, flamegraph input: {self._output_path('.folded')}"
+        )
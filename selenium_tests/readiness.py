@@ -0,0 +1,136 @@
+"""
+Readiness probes for the application under test.
+
+Polls the frontend and `GET /api/users?limit=1` with exponential backoff and
+jitter until both answer correctly, so tests start the moment the stack is
+up instead of after a fixed sleep. The API probe only passes once the server
+can actually query MongoDB (server/config/db.js), not merely accept
+connections. If the deadline passes, NotReadyError carries a dump of every
+probe's recent attempts.
+
+Usage (e.g. after `docker-compose up -d`):
+    python -m selenium_tests.readiness --timeout 180
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import requests
+
+
+class NotReadyError(RuntimeError):
+    """Raised when the application is not ready before the deadline."""
+
+
+class Probe:
+    """One endpoint to poll, with a record of its recent attempts."""
+
+    def __init__(self, name, url, check):
+        self.name = name
+        self.url = url
+        self.check = check
+        self.attempts = 0
+        self.ready = False
+        self.history = deque(maxlen=5)
+
+    def poll(self, session, timeout):
+        """Make one attempt. Returns True once the endpoint answers correctly."""
+        self.attempts += 1
+        started = time.monotonic()
+        try:
+            with session.get(self.url, timeout=timeout, stream=True) as response:
+                head = next(response.iter_content(1024), b"")
+                self.ready, detail = self.check(response, head)
+        except requests.RequestException as error:
+            self.ready, detail = False, f"{type(error).__name__}: {error}"
+        self.history.append(f"{time.monotonic() - started:6.2f}s  {detail}")
+        return self.ready
+
+    def describe(self):
+        state = "ready" if self.ready else "NOT READY"
+        lines = [f"{self.name} {self.url}: {state} after {self.attempts} attempts"]
+        lines.extend(f"    {entry}" for entry in self.history)
+        return "\n".join(lines)
+
+
+def _check_frontend(response, head):
+    if response.status_code != 200:
+        return False, f"HTTP {response.status_code}"
+    if b"<html" not in head.lower() and b"<!doctype" not in head.lower():
+        return False, f"HTTP 200 but not an HTML page: {head[:80]!r}"
+    return True, "HTTP 200 html"
+
+
+def _check_users_api(response, head):
+    if response.status_code != 200:
+        return False, f"HTTP {response.status_code} {head[:120]!r}"
+    if not head.lstrip().startswith(b"["):
+        return False, f"HTTP 200 but not a JSON array: {head[:80]!r}"
+    return True, "HTTP 200 json"
+
+
+def frontend_probe(base_url):
+    return Probe("frontend", base_url, _check_frontend)
+
+
+def users_api_probe(api_url):
+    return Probe("api", f"{api_url.rstrip('/')}/users?limit=1", _check_users_api)
+
+
+def backoff_delays(initial=0.1, maximum=5.0, factor=2.0):
+    """Yield delays that grow exponentially up to `maximum`, each with equal jitter."""
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(maximum, delay * factor)
+
+
+def wait_until_ready(probes, timeout=120, request_timeout=5, max_delay=5.0, session=None):
+    """
+    Poll every probe until all have answered correctly once.
+    Returns the seconds waited; raises NotReadyError after `timeout` seconds.
+    """
+    session = session or requests.Session()
+    started = time.monotonic()
+    deadline = started + timeout
+    delays = backoff_delays(maximum=max_delay)
+    while True:
+        for probe in probes:
+            remaining = deadline - time.monotonic()
+            if not probe.ready and remaining > 0:
+                probe.poll(session, min(request_timeout, remaining))
+        if all(probe.ready for probe in probes):
+            return time.monotonic() - started
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            report = "\n".join(probe.describe() for probe in probes)
+            raise NotReadyError(f"Application not ready after {timeout:g}s:\n{report}")
+        time.sleep(min(next(delays), remaining))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wait until the frontend and users API are ready.")
+    parser.add_argument("--frontend-url", default=os.getenv("FRONTEND_URL", "http://localhost:5173"))
+    parser.add_argument("--api-url", default=os.getenv("BACKEND_URL", "http://localhost:3000/api"))
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before giving up")
+    parser.add_argument("--skip-frontend", action="store_true", help="Only wait for the API")
+    args = parser.parse_args(argv)
+
+    probes = [users_api_probe(args.api_url)]
+    if not args.skip_frontend:
+        probes.insert(0, frontend_probe(args.frontend_url))
+    try:
+        waited = wait_until_ready(probes, timeout=args.timeout)
+    except NotReadyError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"Application ready after {waited:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
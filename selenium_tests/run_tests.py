@@ -1,85 +1,89 @@
 #!/usr/bin/env python3
 """
 Test runner script for Selenium tests.
-This script can be used to run tests with different configurations.
+
+By default only the tests affected by your changes are run: each run records
+which test, page-object, helper, client and server files every test depends
+on (see impact.py), and the next run skips tests whose dependencies are
+unchanged and which passed last time. New and previously failing tests always
+run. Use "all" to run and re-record everything.
+
+Extra arguments are passed on to pytest, e.g. `python run_tests.py -n auto`.
 """
 
 import subprocess
 import sys
 import os
 
-def run_tests_with_pytest():
-    """Run tests using pytest with various options"""
-    
-    # Basic test run
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PYTEST = [sys.executable, "-m", "pytest"]
+
+def run_pytest(args):
+    """Run pytest from the tests directory and return its exit code"""
+    return subprocess.run(PYTEST + args, cwd=TEST_DIR).returncode
+
+def run_impacted_tests(extra_args):
+    """Run only the tests affected by changes since their last run"""
+    print("Running tests affected by changes...")
+    exit_code = run_pytest([".", "--impacted", "-v", "--tb=short", "--strict-markers", "--disable-warnings"] + extra_args)
+    # Exit code 5 means every test was deselected: nothing changed
+    if exit_code == 5:
+        print("No tests affected by changes since the last run.")
+        return 0
+    return exit_code
+
+def show_impacted_tests(extra_args):
+    """List the tests an incremental run would execute, without running them"""
+    return run_pytest([".", "--impacted", "--collect-only", "-q"] + extra_args)
+
+def run_all_tests(extra_args):
+    """Run every test and refresh the recorded dependencies"""
     print("Running Selenium tests...")
-    result = subprocess.run([
-        "pytest", 
-        "test_users.py",
-        "-v",  # Verbose output
-        "--tb=short",  # Short traceback format
-        "--strict-markers",
-        "--disable-warnings"
-    ], cwd=os.path.dirname(os.path.abspath(__file__)))
-    
-    return result.returncode
+    return run_pytest([".", "--record-impact", "-v", "--tb=short", "--strict-markers", "--disable-warnings"] + extra_args)
 
-def run_tests_with_html_report():
+def run_tests_with_html_report(extra_args):
     """Run tests and generate HTML report"""
     print("Running tests with HTML report...")
-    result = subprocess.run([
-        "pytest",
-        "test_users.py",
-        "--html=test_report.html",
-        "--self-contained-html",
-        "-v"
-    ], cwd=os.path.dirname(os.path.abspath(__file__)))
-    
-    return result.returncode
+    return run_pytest([".", "--record-impact", "--html=test_report.html", "--self-contained-html", "-v"] + extra_args)
 
-def run_tests_with_coverage():
+def run_tests_with_coverage(extra_args):
     """Run tests with coverage report"""
     print("Running tests with coverage...")
-    result = subprocess.run([
-        "pytest",
-        "test_users.py",
-        "--cov=.",
-        "--cov-report=html",
-        "--cov-report=term",
-        "-v"
-    ], cwd=os.path.dirname(os.path.abspath(__file__)))
-    
-    return result.returncode
+    return run_pytest([".", "--record-impact", "--cov=.", "--cov-report=html", "--cov-report=term", "-v"] + extra_args)
 
-def run_specific_test(test_name):
+def run_specific_test(test_name, extra_args):
     """Run a specific test by name"""
     print(f"Running specific test: {test_name}")
-    result = subprocess.run([
-        "pytest",
-        f"test_users.py::{test_name}",
-        "-v"
-    ], cwd=os.path.dirname(os.path.abspath(__file__)))
-    
-    return result.returncode
+    return run_pytest([f"test_user_management.py::{test_name}", "--record-impact", "-v"] + extra_args)
+
+def print_usage():
+    print("Usage:")
+    print("  python run_tests.py              # Run tests affected by changes")
+    print("  python run_tests.py plan         # List the tests that would run")
+    print("  python run_tests.py all          # Run all tests")
+    print("  python run_tests.py html         # Run all tests with HTML report")
+    print("  python run_tests.py coverage     # Run all tests with coverage")
+    print("  python run_tests.py specific TestUserManagement::test_01_page_load_and_elements_present")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-        
-        if command == "html":
-            exit_code = run_tests_with_html_report()
-        elif command == "coverage":
-            exit_code = run_tests_with_coverage()
-        elif command == "specific" and len(sys.argv) > 2:
-            exit_code = run_specific_test(sys.argv[2])
-        else:
-            print("Usage:")
-            print("  python run_tests.py              # Run all tests")
-            print("  python run_tests.py html         # Run with HTML report")
-            print("  python run_tests.py coverage     # Run with coverage")
-            print("  python run_tests.py specific TestUserManagement::test_01_page_load_and_elements_present")
-            exit_code = 1
+    args = sys.argv[1:]
+    command = args[0] if args and not args[0].startswith("-") else None
+    extra_args = args[1:] if command else args
+
+    if command is None:
+        exit_code = run_impacted_tests(extra_args)
+    elif command == "plan":
+        exit_code = show_impacted_tests(extra_args)
+    elif command == "all":
+        exit_code = run_all_tests(extra_args)
+    elif command == "html":
+        exit_code = run_tests_with_html_report(extra_args)
+    elif command == "coverage":
+        exit_code = run_tests_with_coverage(extra_args)
+    elif command == "specific" and extra_args:
+        exit_code = run_specific_test(extra_args[0], extra_args[1:])
     else:
-        exit_code = run_tests_with_pytest()
-    
-    sys.exit(exit_code) 
\ No newline at end of file
+        print_usage()
+        exit_code = 1
+
+    sys.exit(exit_code)
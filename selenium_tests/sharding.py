@@ -0,0 +1,299 @@
+"""
+Duration-aware sharding of the suite across CI agents.
+
+Per-test durations are taken from the JUnit XML of earlier runs and kept in a
+small JSON history (the last few durations of every test). From it the
+planner splits the collected tests into N shards by longest-processing-time
+bin packing: tests are taken longest first and each goes to the shard with
+the least work so far. The shards end up within one test's duration of each
+other, so the wall time of a sharded run tracks the slowest shard. Tests
+without history count as the median known duration.
+
+Every agent runs the same collection with the same history and therefore
+computes the same plan; `--shard i/N` keeps only the i-th shard (1-based).
+Afterwards the per-shard JUnit reports are merged into one, together with an
+HTML summary linking each shard's pytest-html report.
+
+Usage (from the selenium_tests directory, where the shards run, so the
+test ids match):
+    pytest --shard 2/4 --junitxml=test-reports/shard-2/junit.xml
+    python -m sharding plan --shards 4 -- test_user_management.py
+    python -m sharding merge test-reports/shard-*/junit.xml
+    python -m sharding record test-reports/junit.xml
+"""
+
+import argparse
+import heapq
+import html
+import json
+import os
+import re
+import statistics
+import xml.etree.ElementTree as ET
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DURATIONS = os.path.join(PACKAGE_DIR, ".test_durations.json")
+HISTORY_LENGTH = 5
+# Assumed duration of any test when there is no history at all
+DEFAULT_DURATION = 1.0
+
+
+def junit_key(nodeid):
+    """The "classname::name" a test gets in pytest's JUnit XML."""
+    names = nodeid.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    return f"{'.'.join(names[:-1])}::{names[-1]}"
+
+
+def load_durations(path=DEFAULT_DURATIONS):
+    """Return {junit key: [recent durations in seconds]}."""
+    try:
+        with open(path) as f:
+            return json.load(f).get("tests", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def read_junit(path):
+    """Yield (junit key, seconds, outcome) for every testcase in a JUnit XML file."""
+    for case in ET.parse(path).getroot().iter("testcase"):
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = child.tag
+        yield f"{case.get('classname')}::{case.get('name')}", float(case.get("time") or 0), outcome
+
+
+def record_durations(junit_paths, path=DEFAULT_DURATIONS):
+    """Add the durations of passed and failed tests in JUnit files to the history. Returns the count."""
+    history = load_durations(path)
+    recorded = 0
+    for junit_path in junit_paths:
+        for key, seconds, outcome in read_junit(junit_path):
+            if outcome == "skipped":
+                continue  # A skip says nothing about how long the test takes
+            history[key] = (history.get(key, []) + [round(seconds, 3)])[-HISTORY_LENGTH:]
+            recorded += 1
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"tests": history}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+    return recorded
+
+
+def estimate_durations(nodeids, history):
+    """Expected seconds per nodeid: the median of its history, else the median over all tests."""
+    known = {key: statistics.median(values) for key, values in history.items() if values}
+    fallback = statistics.median(known.values()) if known else DEFAULT_DURATION
+    return {nodeid: known.get(junit_key(nodeid), fallback) for nodeid in nodeids}
+
+
+class Shard:
+    """The tests assigned to one agent and their expected total duration."""
+
+    def __init__(self, index):
+        self.index = index
+        self.nodeids = []
+        self.expected = 0.0
+
+    def __repr__(self):
+        return f"Shard({self.index}, {len(self.nodeids)} tests, {self.expected:.1f}s)"
+
+
+def plan_shards(nodeids, durations, count):
+    """
+    Split nodeids into `count` shards with LPT bin packing. `durations` maps
+    nodeid to expected seconds. Deterministic for the same input; each
+    shard keeps the tests in their original order.
+    """
+    shards = [Shard(index) for index in range(1, count + 1)]
+    position = {nodeid: number for number, nodeid in enumerate(nodeids)}
+    heap = [(0.0, shard.index - 1) for shard in shards]
+    for nodeid in sorted(nodeids, key=lambda nodeid: (-durations[nodeid], position[nodeid])):
+        load, number = heapq.heappop(heap)
+        shard = shards[number]
+        shard.nodeids.append(nodeid)
+        shard.expected = load + durations[nodeid]
+        heapq.heappush(heap, (shard.expected, number))
+    for shard in shards:
+        shard.nodeids.sort(key=position.get)
+    return shards
+
+
+def parse_shard(value):
+    """Parse "i/N" into (i, N), 1 <= i <= N."""
+    match = re.fullmatch(r"(\d+)/(\d+)", value or "")
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"expected --shard i/N with 1 <= i <= N, got {value!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+class ShardSelector:
+    """Pytest plugin that deselects every test outside this agent's shard."""
+
+    def __init__(self, index, count, durations_path=DEFAULT_DURATIONS):
+        self.index = index
+        self.count = count
+        self.history = load_durations(durations_path)
+        self.shard = None
+        # Tests selected before sharding; with xdist the controller learns it from the workers
+        self.collected = 0
+
+    # After other selection (-m, --impacted) so every agent shards the same remainder
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        nodeids = [item.nodeid for item in items]
+        self.collected = len(nodeids)
+        shards = plan_shards(nodeids, estimate_durations(nodeids, self.history), self.count)
+        self.shard = shards[self.index - 1]
+        keep = set(self.shard.nodeids)
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in keep]
+
+    def pytest_report_collectionfinish(self, config):
+        if self.shard is not None:
+            return (f"shard {self.index}/{self.count}: {len(self.shard.nodeids)} tests, "
+                    f"~{self.shard.expected:.0f}s expected")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.collected = max(self.collected, getattr(node, "workeroutput", {}).get("shard_collected", 0))
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        workeroutput = getattr(session.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["shard_collected"] = self.collected
+        # More shards than tests leaves some shards empty; that is not a failure
+        elif exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED and self.collected:
+            session.exitstatus = pytest.ExitCode.OK
+
+
+def merge_junit(paths):
+    """Combine JUnit files into one <testsuites> tree; each suite is labelled with its shard."""
+    merged = ET.Element("testsuites")
+    totals = dict.fromkeys(("tests", "failures", "errors", "skipped"), 0)
+    slowest = 0.0
+    for number, path in enumerate(paths, 1):
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+        for suite in suites:
+            suite.set("name", f"{suite.get('name', 'pytest')} [shard {number}]")
+            suite.set("file", path)
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            slowest = max(slowest, float(suite.get("time", 0)))
+            merged.append(suite)
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    # A sharded run takes as long as its slowest shard
+    merged.set("time", f"{slowest:.3f}")
+    return ET.ElementTree(merged)
+
+
+def render_html(tree, html_dir="."):
+    """
+    A single-page summary of a merged JUnit tree, linking the pytest-html
+    report.html next to each shard's JUnit file. Links are relative to `html_dir`.
+    """
+    root = tree.getroot()
+    shard_rows, test_rows = [], []
+    for suite in root.iter("testsuite"):
+        report = os.path.join(os.path.dirname(suite.get("file", "")), "report.html")
+        link = f'<a href="{html.escape(os.path.relpath(report, html_dir))}">report</a>' if os.path.exists(report) else ""
+        shard_rows.append(
+            f"<tr><td>{html.escape(suite.get('name'))}</td><td>{suite.get('tests')}</td>"
+            f"<td>{suite.get('failures')}</td><td>{suite.get('errors')}</td>"
+            f"<td>{float(suite.get('time', 0)):.1f}s</td><td>{link}</td></tr>"
+        )
+        for case in suite.iter("testcase"):
+            outcome, message = "passed", ""
+            for child in case:
+                if child.tag in ("failure", "error", "skipped"):
+                    outcome, message = child.tag, child.get("message", "")
+            test_rows.append(
+                f'<tr class="{outcome}"><td>{html.escape(case.get("classname"))}::{html.escape(case.get("name"))}</td>'
+                f"<td>{outcome}</td><td>{float(case.get('time') or 0):.2f}s</td>"
+                f"<td>{html.escape(suite.get('name'))}</td><td>{html.escape(message)}</td></tr>"
+            )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Merged test report</title>
+<style>
+body {{ font-family: sans-serif; }} table {{ border-collapse: collapse; margin-bottom: 2em; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+.failure, .error {{ background: #fdd; }} .skipped {{ background: #eee; }}
+</style></head><body>
+<h1>Merged test report</h1>
+<p>{root.get('tests')} tests, {root.get('failures')} failures, {root.get('errors')} errors,
+{root.get('skipped')} skipped. Wall time (slowest shard): {float(root.get('time')):.1f}s</p>
+<table><tr><th>Shard</th><th>Tests</th><th>Failures</th><th>Errors</th><th>Time</th><th>pytest-html</th></tr>
+{"".join(shard_rows)}
+</table>
+<table><tr><th>Test</th><th>Outcome</th><th>Time</th><th>Shard</th><th>Message</th></tr>
+{"".join(test_rows)}
+</table>
+</body></html>
+"""
+
+
+def _collect(pytest_args):
+    """Collect the suite without running it and return the nodeids."""
+    class Collector:
+        def __init__(self):
+            self.nodeids = []
+
+        def pytest_collection_finish(self, session):
+            self.nodeids = [item.nodeid for item in session.items]
+
+    collector = Collector()
+    code = pytest.main(["--collect-only", "-qq", *pytest_args], plugins=[collector])
+    if code not in (0, 5):
+        raise SystemExit(code)
+    return collector.nodeids
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan shards and merge sharded test reports.")
+    parser.add_argument("--durations", default=DEFAULT_DURATIONS, help="Duration history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    plan = commands.add_parser("plan", help="Show how the suite would be split")
+    plan.add_argument("--shards", type=int, required=True)
+    plan.add_argument("pytest_args", nargs="*", help="Arguments that select the tests, as given to pytest")
+    merge = commands.add_parser("merge", help="Merge per-shard JUnit reports")
+    merge.add_argument("junit", nargs="+")
+    merge.add_argument("--junit-out", default="test-reports/junit.xml")
+    merge.add_argument("--html-out", default="test-reports/merged-report.html")
+    record = commands.add_parser("record", help="Add the durations from JUnit reports to the history")
+    record.add_argument("junit", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        nodeids = _collect(args.pytest_args)
+        shards = plan_shards(nodeids, estimate_durations(nodeids, load_durations(args.durations)), args.shards)
+        for shard in shards:
+            print(f"shard {shard.index}/{args.shards}: {len(shard.nodeids)} tests, ~{shard.expected:.1f}s")
+            for nodeid in shard.nodeids:
+                print(f"    {nodeid}")
+        total = sum(shard.expected for shard in shards)
+        print(f"expected wall time ~{max(shard.expected for shard in shards):.1f}s of {total:.1f}s total")
+    elif args.command == "merge":
+        tree = merge_junit(args.junit)
+        for path in (args.junit_out, args.html_out):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tree.write(args.junit_out, encoding="utf-8", xml_declaration=True)
+        with open(args.html_out, "w") as f:
+            f.write(render_html(tree, os.path.dirname(args.html_out) or "."))
+        root = tree.getroot()
+        print(f"Merged {len(args.junit)} reports: {root.get('tests')} tests, "
+              f"{root.get('failures')} failures, {root.get('errors')} errors -> {args.junit_out}, {args.html_out}")
+    else:
+        count = record_durations(args.junit, args.durations)
+        print(f"Recorded {count} durations in {args.durations}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""
+In-process stand-in for the Express/MongoDB backend.
+
+Implements the four routes of server/routes/api.js with the same status
+codes and JSON shapes as server/controllers/userController.js, backed by an
+in-memory store with a unique email index. It starts in milliseconds, needs
+no network, and can inject latency to imitate a remote database, so the UI
+suite can run hermetically.
+
+Run standalone (the client's default API URL is http://localhost:3000/api):
+    python -m selenium_tests.standin_backend --port 3000 --latency-ms 20
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+OBJECT_ID = re.compile(r"^[0-9a-fA-F]{24}$")
+USER_PATH = re.compile(r"^/api/users/([^/]+)$")
+
+
+class StoreError(Exception):
+    """Raised where Mongoose would reject an operation (cast, validation or duplicate key)."""
+
+
+class UserStore:
+    """Thread-safe in-memory users collection with a unique email index."""
+
+    def __init__(self):
+        self._users = OrderedDict()
+        self._by_email = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._process = os.urandom(5).hex()
+
+    def _object_id(self):
+        self._counter = (self._counter + 1) % 0xFFFFFF
+        return f"{int(time.time()):08x}{self._process}{self._counter:06x}"
+
+    @staticmethod
+    def _cast(fields):
+        """Apply the User schema casts: name to string, age to number."""
+        doc = {}
+        if fields.get("name") is not None:
+            doc["name"] = str(fields["name"])
+        if fields.get("email") is not None:
+            doc["email"] = str(fields["email"])
+        if "age" in fields and fields["age"] is not None:
+            age = fields["age"]
+            if age == "":
+                doc["age"] = None
+            else:
+                try:
+                    number = float(age)
+                except (TypeError, ValueError):
+                    raise StoreError(f"Cast to Number failed for value {age!r}")
+                doc["age"] = int(number) if number.is_integer() else number
+        return doc
+
+    def create(self, fields):
+        doc = self._cast(fields)
+        if "email" not in doc:
+            raise StoreError("Path `email` is required.")
+        with self._lock:
+            if doc["email"] in self._by_email:
+                raise StoreError(f"E11000 duplicate key error: email {doc['email']!r}")
+            user = {"_id": self._object_id(), **doc, "__v": 0}
+            self._users[user["_id"]] = user
+            self._by_email[user["email"]] = user["_id"]
+            return dict(user)
+
+    def bulk_create(self, records):
+        """Insert many records; returns the created documents. Duplicates raise."""
+        return [self.create(record) for record in records]
+
+    def list(self, limit=None):
+        with self._lock:
+            users = list(self._users.values())
+        if limit:
+            users = users[:abs(limit)]
+        return [dict(user) for user in users]
+
+    def update(self, user_id, fields):
+        """Apply the update and return the document as it was before (findByIdAndUpdate's default)."""
+        self._check_id(user_id)
+        changes = self._cast(fields)
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                return None
+            email = changes.get("email", user["email"])
+            if email != user["email"] and email in self._by_email:
+                raise StoreError(f"E11000 duplicate key error: email {email!r}")
+            before = dict(user)
+            del self._by_email[user["email"]]
+            user.update(changes)
+            self._by_email[user["email"]] = user_id
+            return before
+
+    def delete(self, user_id):
+        self._check_id(user_id)
+        with self._lock:
+            user = self._users.pop(user_id, None)
+            if user is not None:
+                del self._by_email[user["email"]]
+            return user
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._by_email.clear()
+
+    def __len__(self):
+        return len(self._users)
+
+    @staticmethod
+    def _check_id(user_id):
+        if not OBJECT_ID.match(user_id):
+            raise StoreError(f"Cast to ObjectId failed for value {user_id!r}")
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests the same way server/index.js and routes/api.js do."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload=None, content_type="application/json; charset=utf-8"):
+        latency = self.server.latency_ms
+        if latency:
+            time.sleep(latency / 1000)
+        body = b""
+        if payload is not None:
+            body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if payload is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if "application/json" not in (self.headers.get("Content-Type") or ""):
+            return {}
+        body = json.loads(raw) if raw else {}
+        if isinstance(body, list):
+            # express.json() accepts arrays; destructuring one gives no fields
+            return {}
+        if not isinstance(body, dict):
+            # ...but rejects bare strings, numbers and null with 400 (strict mode)
+            raise ValueError(f"JSON body must be an object, not {type(body).__name__}")
+        return body
+
+    def _not_found(self):
+        path = urlparse(self.path).path
+        self._send(404, f"Cannot {self.command} {path}".encode(), "text/html; charset=utf-8")
+
+    def do_OPTIONS(self):
+        # Same preflight answer as the cors() middleware
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET,HEAD,PUT,PATCH,POST,DELETE")
+        requested = self.headers.get("Access-Control-Request-Headers")
+        if requested:
+            self.send_header("Access-Control-Allow-Headers", requested)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/users":
+            return self._not_found()
+        limit = parse_qs(url.query).get("limit", [None])[0]
+        try:
+            users = self.server.store.list(int(limit) if limit else None)
+        except ValueError:
+            return self._send(500, {"error": "Internal Server Error"})
+        self._send(200, users)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/api/addUser":
+            return self._not_found()
+        try:
+            body = self._read_json()
+        except ValueError:
+            return self._send(400, {"error": "Bad Request"})
+        try:
+            self._send(200, self.server.store.create(body))
+        except StoreError:
+            self._send(500, {"error": "Internal Server Error"})
+
+    def do_PUT(self):
+        match = USER_PATH.match(urlparse(self.path).path)
+        if not match:
+            return self._not_found()
+        try:
+            body = self._read_json()
+        except ValueError:
+            return self._send(400, {"error": "Bad Request"})
+        try:
+            before = self.server.store.update(match.group(1), body)
+        except StoreError:
+            return self._send(500, {"message": "Internal server error"})
+        if before is None:
+            return self._send(404, {"message": "User not found"})
+        self._send(200, {"message": "User updated successfully", "updatedUser": before})
+
+    def do_DELETE(self):
+        match = USER_PATH.match(urlparse(self.path).path)
+        if not match:
+            return self._not_found()
+        try:
+            deleted = self.server.store.delete(match.group(1))
+        except StoreError:
+            return self._send(500, {"message": "Internal server error"})
+        if deleted is None:
+            return self._send(404, {"message": "User not found"})
+        self._send(200, {"message": "User deleted successfully", "deletedUser": deleted})
+
+
+class StandinBackend:
+    """
+    Threaded HTTP server exposing a UserStore on /api.
+
+    `port=0` picks a free port. `latency_ms` is added to every response.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0, store=None):
+        self.store = store or UserStore()
+        self.server = ThreadingHTTPServer((host, port), StandinRequestHandler)
+        self.server.daemon_threads = True
+        self.server.store = self.store
+        self.server.latency_ms = latency_ms
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    @property
+    def url(self):
+        return f"http://{self.server.server_address[0]}:{self.port}/api"
+
+    @property
+    def latency_ms(self):
+        return self.server.latency_ms
+
+    @latency_ms.setter
+    def latency_ms(self, value):
+        self.server.latency_ms = value
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the users API from memory.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    args = parser.parse_args(argv)
+    backend = StandinBackend(args.host, args.port, args.latency_ms)
+    print(f"Stand-in backend listening on {backend.url}")
+    try:
+        backend.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
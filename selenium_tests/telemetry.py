@@ -0,0 +1,391 @@
+"""
+Persistent per-test telemetry.
+
+With --telemetry, every run is recorded in a local SQLite database: for each
+test its outcome, setup/call/teardown durations, the number of WebDriver
+commands it sent and the browser metrics of the last page it visited (see
+conftest.attach_browser_metrics). Under pytest-xdist the workers count the
+commands and the controller writes everything, so there is one writer.
+
+The report command compares each test's most recent runs with the runs
+before them. A one-sided Mann-Whitney U test flags a value as slower only when
+the shift is significant, not just noisy, and larger than a minimum change. It also
+checks the latest run against per-test budgets and can print the trend of
+one test.
+
+Usage:
+    pytest --telemetry
+    python -m selenium_tests.telemetry report --budgets selenium_tests/telemetry_budgets.json
+    python -m selenium_tests.telemetry trend test_05_edit_existing_user --value call_s
+    python -m selenium_tests.telemetry merge test-reports/shard-*/telemetry.sqlite
+"""
+
+import argparse
+import fnmatch
+import json
+import math
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import time
+
+import pytest
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.path.join(PACKAGE_DIR, ".telemetry.sqlite")
+# Runs that budgets are checked against; skipped runs measure nothing
+BUDGET_OUTCOMES = ("passed", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL,
+    finished REAL,
+    git_rev TEXT,
+    host TEXT,
+    args TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER REFERENCES runs(id),
+    nodeid TEXT,
+    outcome TEXT,
+    setup_s REAL,
+    call_s REAL,
+    teardown_s REAL,
+    webdriver_commands INTEGER,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER REFERENCES runs(id),
+    nodeid TEXT,
+    name TEXT,
+    value REAL,
+    PRIMARY KEY (run_id, nodeid, name)
+);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    db = sqlite3.connect(path, timeout=30)
+    db.executescript(SCHEMA)
+    return db
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=PACKAGE_DIR, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class TelemetryRecorder:
+    """Pytest plugin recording per-test durations, WebDriver command counts and browser metrics."""
+
+    def __init__(self, config, path=DEFAULT_DB):
+        self.path = path
+        # xdist workers only count; the controller (or a plain run) records
+        self.recording = not hasattr(config, "workerinput")
+        self.args = " ".join(config.invocation_params.args)
+        self.started = time.time()
+        self.results = {}
+        self.commands = 0
+
+    def attach(self, driver):
+        """Count the WebDriver commands sent through `driver`. Safe to call again on a pooled driver."""
+        executor = driver.command_executor
+        if getattr(executor, "_telemetry", None) is self:
+            return
+        original = executor.execute
+
+        def execute(command, params):
+            self.commands += 1
+            return original(command, params)
+
+        executor.execute = execute
+        executor._telemetry = self
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.commands = 0
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when == "teardown" and "driver" in item.fixturenames:
+            # Travels to the xdist controller with the report
+            outcome.get_result().user_properties.append(("webdriver_commands", self.commands))
+
+    def pytest_runtest_logreport(self, report):
+        if not self.recording:
+            return
+        result = self.results.setdefault(report.nodeid, {"outcome": "passed", "metrics": {}, "commands": None})
+        result[f"{report.when}_s"] = report.duration
+        if report.failed:
+            result["outcome"] = "failed"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+        if report.when == "teardown":
+            for name, value in report.user_properties:
+                if name == "webdriver_commands":
+                    result["commands"] = value
+                elif name == "browser_metrics":
+                    result["metrics"] = json.loads(value)
+
+    def pytest_sessionfinish(self, session):
+        if not self.recording or not self.results:
+            return
+        db = connect(self.path)
+        with db:
+            cursor = db.execute(
+                "INSERT INTO runs (started, finished, git_rev, host, args) VALUES (?, ?, ?, ?, ?)",
+                (self.started, time.time(), _git_rev(), socket.gethostname(), self.args),
+            )
+            run_id = cursor.lastrowid
+            db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, nodeid, result["outcome"], result.get("setup_s"), result.get("call_s"),
+                  result.get("teardown_s"), result["commands"]) for nodeid, result in self.results.items()],
+            )
+            db.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?)",
+                [(run_id, nodeid, name, value) for nodeid, result in self.results.items()
+                 for name, value in result["metrics"].items() if isinstance(value, (int, float))],
+            )
+        db.close()
+
+
+def mann_whitney_greater(recent, baseline):
+    """
+    One-sided p-value for `recent` tending to be larger than `baseline`:
+    Mann-Whitney U with the normal approximation, tie and continuity corrections.
+    """
+    n1, n2 = len(recent), len(baseline)
+    values = sorted([(value, 0) for value in recent] + [(value, 1) for value in baseline])
+    n = n1 + n2
+    rank_sum, ties, i = 0.0, 0.0, 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def load_series(db, test_pattern="*", outcomes=("passed",)):
+    """
+    Return {nodeid: {value name: [(run_id, value), ...]}} in run order, over
+    durations, WebDriver command counts and browser metrics, for runs with
+    one of `outcomes`. Trends only use passed runs by default, since failed
+    and skipped runs have timings that are not comparable.
+    """
+    series = {}
+    placeholders = ", ".join("?" for _ in outcomes)
+    rows = db.execute(
+        "SELECT run_id, nodeid, setup_s, call_s, teardown_s, webdriver_commands FROM results "
+        f"WHERE outcome IN ({placeholders}) ORDER BY run_id", tuple(outcomes)
+    )
+    for run_id, nodeid, setup_s, call_s, teardown_s, commands in rows:
+        if not fnmatch.fnmatch(nodeid, test_pattern):
+            continue
+        values = {"setup_s": setup_s, "call_s": call_s, "teardown_s": teardown_s,
+                  "total_s": (setup_s or 0) + (call_s or 0) + (teardown_s or 0),
+                  "webdriver_commands": commands}
+        test = series.setdefault(nodeid, {})
+        for name, value in values.items():
+            if value is not None:
+                test.setdefault(name, []).append((run_id, value))
+    rows = db.execute(
+        "SELECT m.run_id, m.nodeid, m.name, m.value FROM metrics m JOIN results r "
+        f"ON r.run_id = m.run_id AND r.nodeid = m.nodeid WHERE r.outcome IN ({placeholders}) ORDER BY m.run_id",
+        tuple(outcomes),
+    )
+    for run_id, nodeid, name, value in rows:
+        if nodeid in series:
+            series[nodeid].setdefault(name, []).append((run_id, value))
+    return series
+
+
+def find_slowdowns(series, recent=5, baseline=20, alpha=0.05, min_change=0.1):
+    """
+    Compare the last `recent` runs of every value with the `baseline` runs
+    before them. Returns (nodeid, name, baseline median, recent median, p)
+    for shifts that are significant at `alpha` and larger than `min_change`.
+    """
+    slowdowns = []
+    for nodeid, values in sorted(series.items()):
+        for name, points in sorted(values.items()):
+            samples = [value for _, value in points]
+            if len(samples) < recent + 3:
+                continue
+            current, before = samples[-recent:], samples[-recent - baseline:-recent]
+            current_median, before_median = statistics.median(current), statistics.median(before)
+            if current_median <= before_median * (1 + min_change):
+                continue
+            p = mann_whitney_greater(current, before)
+            if p < alpha:
+                slowdowns.append((nodeid, name, before_median, current_median, p))
+    return slowdowns
+
+
+def load_budgets(path):
+    """Budgets file: {"<nodeid glob>": {"call_s": 5, "webdriver_commands": 150, ...}}."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def budget_violations(series, budgets):
+    """
+    Check every test's latest run in `series` against all budgets whose
+    pattern matches it. The report passes failed runs too: a test that ran
+    over budget and then timed out is exactly what budgets should catch.
+    """
+    violations = []
+    for nodeid, values in sorted(series.items()):
+        for pattern, limits in budgets.items():
+            if not fnmatch.fnmatch(nodeid, pattern):
+                continue
+            for name, limit in limits.items():
+                if name in values and values[name][-1][1] > limit:
+                    violations.append(f"{nodeid} {name}: {values[name][-1][1]:.2f} > {limit} ({pattern})")
+    return violations
+
+
+def merge_databases(db, paths):
+    """
+    Append the runs recorded in other telemetry databases, e.g. one per CI
+    shard, to `db` under new run ids. Returns the number of runs added.
+    """
+    added = 0
+    with db:
+        for path in paths:
+            source = sqlite3.connect(path)
+            try:
+                for run_id, *run in source.execute(
+                        "SELECT id, started, finished, git_rev, host, args FROM runs ORDER BY id").fetchall():
+                    new_id = db.execute(
+                        "INSERT INTO runs (started, finished, git_rev, host, args) VALUES (?, ?, ?, ?, ?)", run
+                    ).lastrowid
+                    db.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", [
+                        (new_id, *row) for row in source.execute(
+                            "SELECT nodeid, outcome, setup_s, call_s, teardown_s, webdriver_commands "
+                            "FROM results WHERE run_id = ?", (run_id,))
+                    ])
+                    db.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?)", [
+                        (new_id, *row) for row in source.execute(
+                            "SELECT nodeid, name, value FROM metrics WHERE run_id = ?", (run_id,))
+                    ])
+                    added += 1
+            finally:
+                source.close()
+    return added
+
+
+def _sparkline(samples):
+    bars = "▁▂▃▄▅▆▇█"
+    low, high = min(samples), max(samples)
+    span = (high - low) or 1
+    return "".join(bars[int((value - low) / span * (len(bars) - 1))] for value in samples)
+
+
+def report(db, test_pattern="*", recent=5, baseline=20, alpha=0.05, min_change=0.1, budgets=None):
+    """Print trends, slowdowns and budget violations. Returns the exit status."""
+    series = load_series(db, test_pattern)
+    runs = db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    print(f"{runs} runs recorded; {len(series)} tests with passing runs")
+    print(f"\n{'runs':>5} {'median s':>9} {'last s':>8}  trend (total_s, last {recent + baseline})  test")
+    for nodeid, values in sorted(series.items()):
+        totals = [value for _, value in values.get("total_s", [])]
+        if totals:
+            print(f"{len(totals):>5} {statistics.median(totals):>9.2f} {totals[-1]:>8.2f}  "
+                  f"{_sparkline(totals[-(recent + baseline):]):<{recent + baseline}}  {nodeid}")
+
+    slowdowns = find_slowdowns(series, recent, baseline, alpha, min_change)
+    print(f"\nSignificant slowdowns (last {recent} runs vs. the {baseline} before, p < {alpha}):")
+    for nodeid, name, before, current, p in slowdowns:
+        change = f"+{(current / before - 1) * 100:.0f}%, " if before else ""
+        print(f"  SLOWER {nodeid} {name}: {before:.2f} -> {current:.2f} ({change}p={p:.3f})")
+    if not slowdowns:
+        print("  none")
+
+    violations = budget_violations(load_series(db, test_pattern, BUDGET_OUTCOMES), budgets) if budgets else []
+    if budgets:
+        print("\nBudget violations in the latest passed or failed run of each test:")
+        for violation in violations:
+            print(f"  OVER BUDGET {violation}")
+        if not violations:
+            print("  none")
+    return 1 if slowdowns or violations else 0
+
+
+def trend(db, test_pattern, value="total_s", last=30):
+    """Print one value of the matching tests run by run."""
+    series = load_series(db, test_pattern)
+    for nodeid, values in sorted(series.items()):
+        points = values.get(value, [])[-last:]
+        print(nodeid)
+        if not points:
+            print(f"  no {value} recorded")
+            continue
+        high = max(v for _, v in points) or 1
+        for run_id, v in points:
+            print(f"  run {run_id:>5} {v:>10.3f} {'#' * max(1, round(v / high * 40))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report on recorded test telemetry.")
+    parser.add_argument("--db", default=os.getenv("TELEMETRY_DB", DEFAULT_DB))
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("report", help="Trends, significant slowdowns and budget violations")
+    summary.add_argument("--test", default="*", help="Glob on test ids")
+    summary.add_argument("--recent", type=int, default=5, help="Runs compared against the baseline")
+    summary.add_argument("--baseline", type=int, default=20, help="Runs before those that form the baseline")
+    summary.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    summary.add_argument("--min-change", type=float, default=0.1,
+                         help="Ignore slowdowns of the median smaller than this fraction")
+    summary.add_argument("--budgets", help="JSON file of per-test budgets")
+    history = commands.add_parser("trend", help="One value of matching tests, run by run")
+    history.add_argument("test", help="Test id or glob; a bare name matches anywhere in the id")
+    history.add_argument("--value", default="total_s",
+                         help="setup_s, call_s, teardown_s, total_s, webdriver_commands or a browser metric")
+    history.add_argument("--last", type=int, default=30)
+    merge = commands.add_parser("merge", help="Append the runs of other telemetry databases to --db")
+    merge.add_argument("sources", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        db = connect(args.db)
+        try:
+            print(f"Merged {merge_databases(db, args.sources)} runs into {args.db}")
+        finally:
+            db.close()
+        return 0
+
+    if not os.path.exists(args.db):
+        print(f"No telemetry recorded yet ({args.db}); run pytest with --telemetry first")
+        return 1
+    db = connect(args.db)
+    try:
+        if args.command == "report":
+            budgets = load_budgets(args.budgets) if args.budgets else None
+            return report(db, args.test, args.recent, args.baseline, args.alpha, args.min_change, budgets)
+        pattern = args.test if any(c in args.test for c in "*?[") else f"*{args.test}*"
+        trend(db, pattern, args.value, args.last)
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+import base64
+import re
+import zipfile
+
+import pytest
+
+from selenium_tests.artifacts import ArtifactRecorder, ArtifactWriteError
+
+class RecordingDriver:
+    """Answers the captures: a screenshot over CDP and the page's DOM, counting the calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.page = "start"
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls += 1
+        return {"data": base64.b64encode(self.page.encode()).decode()}
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return f"<html>{self.page}</html>"
+
+def zip_contents(path):
+    """{name without the capture time: content} of a written zip."""
+    with zipfile.ZipFile(path) as archive:
+        return {re.sub(r"-\d{6}-", "-", name): archive.read(name).decode() for name in archive.namelist()}
+
+class TestArtifacts:
+    """Step captures and failure artifacts."""
+
+    def test_step_captures_stay_encoded_in_a_bounded_buffer(self, tmp_path):
+        """Only the last steps are kept, as the browser returned them; nothing is written while the test runs."""
+        driver = RecordingDriver()
+        recorder = ArtifactRecorder(str(tmp_path), capacity=2)
+        artifacts = recorder.start("test_x.py::test_y", driver)
+        for label in ("navigate", "submit", "delete"):
+            driver.page = label
+            artifacts.capture(label)
+
+        assert [capture.label for capture in artifacts.steps] == ["submit", "delete"]
+        assert artifacts.steps[-1].screenshot == ("jpg", base64.b64encode(b"delete").decode())
+        assert artifacts.steps[-1].dom == "<html>delete</html>"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failure_writes_steps_and_failure_capture(self, tmp_path):
+        driver = RecordingDriver()
+        recorder = ArtifactRecorder(str(tmp_path), capacity=2)
+        artifacts = recorder.start("test_x.py::test_y", driver)
+        for label in ("navigate", "submit", "delete"):
+            driver.page = label
+            artifacts.capture(label)
+        driver.page = "failed"
+        artifacts.capture_failure()
+
+        path = recorder.flush(artifacts)
+        recorder.close()
+
+        assert zip_contents(path) == {
+            "01-submit.jpg": "submit", "01-submit.html": "<html>submit</html>",
+            "02-delete.jpg": "delete", "02-delete.html": "<html>delete</html>",
+            "03-failure.jpg": "failed", "03-failure.html": "<html>failed</html>",
+        }
+
+    def test_step_captures_are_opt_in(self, tmp_path):
+        """Without step capacity, steps cost no browser calls and only the failure is captured."""
+        driver = RecordingDriver()
+        recorder = ArtifactRecorder(str(tmp_path))
+        artifacts = recorder.start("test_x.py::test_y", driver)
+        artifacts.capture("navigate")
+        assert driver.calls == 0
+        assert recorder.flush(artifacts) is None
+
+        artifacts.capture_failure()
+        path = recorder.flush(artifacts)
+        recorder.close()
+
+        assert sorted(zip_contents(path)) == ["01-failure.html", "01-failure.jpg"]
+
+    def test_write_errors_are_raised(self, tmp_path):
+        """A failed background write is reported at close() instead of being lost."""
+        blocked = tmp_path / "artifacts"
+        blocked.write_text("not a directory")
+        recorder = ArtifactRecorder(str(blocked))
+        artifacts = recorder.start("test_x.py::test_y", RecordingDriver())
+        artifacts.capture_failure()
+        recorder.flush(artifacts)
+
+        with pytest.raises(ArtifactWriteError, match="test_x.py_test_y.zip"):
+            recorder.close()
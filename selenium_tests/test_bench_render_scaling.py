@@ -0,0 +1,41 @@
+import pytest
+
+from selenium_tests.perf.bench_render_scaling import fit_slope, scaling_metrics
+
+class TestRenderScaling:
+    """The slope fit and the metrics that are compared with the baseline."""
+
+    def test_fit_slope_of_a_line(self):
+        assert fit_slope([100, 1000, 10000], [5 + 0.002 * x for x in (100, 1000, 10000)]) == pytest.approx(0.002)
+        assert fit_slope([1, 2, 3], [9, 6, 3]) == pytest.approx(-3)
+
+    def test_fit_slope_is_least_squares(self):
+        """Noisy points give the least-squares slope, not the slope between the end points."""
+        assert fit_slope([0, 1, 2, 3], [1, 3, 2, 5]) == pytest.approx(1.1)
+
+    def test_fit_slope_without_spread(self):
+        """A single size (or repeated sizes only) has no slope."""
+        assert fit_slope([1000], [42]) == 0.0
+        assert fit_slope([1000, 1000], [1, 3]) == 0.0
+
+    def test_scaling_metrics(self):
+        """Every point is kept, and each metric gets its growth per 1000 rows."""
+        curve = {
+            10000: {"initial_render_ms": 300.0, "add_ms": 40.0, "dom_nodes": 60010, "js_heap_kb": None},
+            1000: {"initial_render_ms": 30.0, "add_ms": 40.0, "dom_nodes": 6010, "js_heap_kb": None},
+        }
+
+        metrics = scaling_metrics(curve)
+
+        assert metrics["1000.initial_render_ms"] == 30.0
+        assert metrics["10000.dom_nodes"] == 60010
+        assert metrics["slope.initial_render_ms_per_1k"] == pytest.approx(30.0)
+        assert metrics["slope.add_ms_per_1k"] == pytest.approx(0.0)
+        assert metrics["slope.dom_nodes_per_1k"] == pytest.approx(6000.0)
+        # Metrics the browser didn't report (no performance.memory) are left out, not fitted
+        assert not any("js_heap_kb" in name for name in metrics)
+        assert "slope.edit_ms_per_1k" not in metrics
+
+    def test_scaling_metrics_of_one_size(self):
+        """With a single point there is nothing to fit; only the point is reported."""
+        assert scaling_metrics({100: {"add_ms": 12.0}}) == {"100.add_ms": 12.0}
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+import requests
+
+from selenium_tests.api_client import UsersApi
+from selenium_tests.perf.datagen import Population, generate_batches
+from selenium_tests.standin_backend import StandinBackend, UserStore
+
+@pytest.fixture
+def api():
+    """API client pointed at a fresh stand-in backend."""
+    with StandinBackend(port=0) as backend:
+        api = UsersApi(backend.url)
+        yield api
+        api.close()
+
+class CountingApi:
+    """Passes calls through to the real client, recording the limit of each list_users call."""
+
+    def __init__(self, api):
+        self.api = api
+        self.list_limits = []
+
+    def list_users(self, limit=None):
+        self.list_limits.append(limit)
+        return self.api.list_users(limit=limit)
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+def ndjson(batches):
+    return b"".join(batch.to_ndjson() for batch in batches)
+
+class TestGenerateBatches:
+    """Guarantees of the generated populations and their NDJSON form."""
+
+    def test_same_seed_start_and_batch_size_give_the_same_records(self):
+        first = ndjson(generate_batches(2_500, seed=7, batch_size=1_000, start=300, tag="run"))
+
+        assert ndjson(generate_batches(2_500, seed=7, batch_size=1_000, start=300, tag="run")) == first
+        assert ndjson(generate_batches(2_500, seed=8, batch_size=1_000, start=300, tag="run")) != first
+
+    def test_batches_have_the_requested_sizes(self):
+        assert [len(batch) for batch in generate_batches(2_500, batch_size=1_000)] == [1_000, 1_000, 500]
+        assert list(generate_batches(0)) == []
+
+    def test_emails_are_unique_across_batches_and_extensions(self):
+        """Batches of one call, and a later call continuing at `start`, never repeat an email."""
+        batches = list(generate_batches(3_000, seed=1, batch_size=700))
+        batches += generate_batches(1_000, seed=1, batch_size=700, start=3_000)
+        emails = [email for batch in batches for email in batch.emails.tolist()]
+
+        assert len(emails) == 4_000
+        assert len(set(emails)) == 4_000
+
+    def test_every_ndjson_line_is_a_record_the_store_accepts(self):
+        """Apostrophes and non-ASCII names survive serialization, and every line is a valid User."""
+        batches = list(generate_batches(5_000, seed=3, batch_size=2_000, tag="nd"))
+        lines = ndjson(batches).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        assert records == [record for batch in batches for record in batch.records()]
+        assert any("O'Connor" in record["name"] for record in records)
+        assert any("Müller" in record["name"] for record in records)
+        for record in records:
+            assert set(record) == {"name", "email", "age"}
+            assert isinstance(record["age"], int) and 18 <= record["age"] <= 90
+
+        store = UserStore()
+        assert len(store.bulk_create(records)) == 5_000
+        assert len(store.list()) == 5_000
+
+class TestPopulation:
+    """Growing and cleaning up generated users."""
+
+    def test_counts_the_collection_only_as_far_as_needed(self, api):
+        """Growth is tracked locally; the collection is only listed up to the target."""
+        api.create_users([{"name": "Old", "email": f"old{i}@test.com", "age": 30} for i in range(5)])
+        counting = CountingApi(api)
+        population = Population(counting, batch_size=4)
+
+        assert population.grow_to(3) == 4  # Already too big; counted no further than 4
+        assert population.grow_to(10) == 10
+        assert population.grow_to(12) == 12
+        assert counting.list_limits == [4, 11]
+        assert len(api.list_users()) == 12
+
+        population.cleanup()
+        assert len(api.list_users()) == 5
+
+    def test_partial_batch_failure_is_still_cleaned_up(self, api, monkeypatch):
+        """Users created by a batch that failed midway are deleted by cleanup()."""
+        create_user = api.create_user
+        calls = []
+
+        def flaky_create_user(name, email, age):
+            calls.append(email)
+            if len(calls) == 3:
+                raise requests.ConnectionError("connection reset")
+            return create_user(name, email, age)
+
+        monkeypatch.setattr(api, "create_user", flaky_create_user)
+        population = Population(api, batch_size=5)
+
+        with pytest.raises(requests.ConnectionError):
+            population.grow_to(5)
+        assert len(population.created_ids) == 4
+
+        population.cleanup()
+        assert api.list_users() == []
@@ -0,0 +1,109 @@
+import sys
+
+from selenium_tests import impact
+from selenium_tests.api_client import UsersApi
+from selenium_tests.impact import ImpactRecorder, file_hash, is_affected
+from selenium_tests.pages.user_management_api import UserManagementApi
+
+class FakeItem:
+    def __init__(self, nodeid, fixturenames=(), fspath=__file__):
+        self.nodeid = nodeid
+        self.fixturenames = list(fixturenames)
+        self.fspath = fspath
+
+class FakeConfig:
+    def __init__(self):
+        self.deselected = []
+        self.hook = self
+
+    def pytest_deselected(self, items):
+        self.deselected.extend(items)
+
+def entry(outcome="passed", **deps):
+    return {"outcome": outcome, "deps": deps, "file": "selenium_tests/test_impact.py"}
+
+class TestImpact:
+    """Selection of the tests affected by changes, and the dependencies recorded per test."""
+
+    def test_unchanged_passed_test_is_skipped(self, monkeypatch):
+        monkeypatch.setitem(impact._hashes, "a.py", "1")
+
+        assert not is_affected(entry(**{"a.py": "1"}))
+
+    def test_changed_deleted_or_failed_tests_run(self, monkeypatch):
+        monkeypatch.setitem(impact._hashes, "a.py", "2")
+        monkeypatch.setitem(impact._hashes, "gone.py", None)
+
+        assert is_affected(entry(**{"a.py": "1"}))
+        assert is_affected(entry(**{"gone.py": "1"}))
+        assert is_affected(entry("failed", **{"a.py": "2"}))
+        assert is_affected(entry("skipped", **{"a.py": "2"}))
+
+    def test_selection_keeps_new_and_affected_tests_in_order(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(impact._hashes, "same.py", "1")
+        monkeypatch.setitem(impact._hashes, "changed.py", "2")
+        recorder = ImpactRecorder(cache_path=str(tmp_path / "impact.json"), select=True)
+        recorder.cache = {"tests": {
+            "t::unchanged": entry(**{"same.py": "1"}),
+            "t::changed": entry(**{"same.py": "1", "changed.py": "1"}),
+            "t::failed": entry("failed", **{"same.py": "1"}),
+        }}
+        items = [FakeItem(nodeid) for nodeid in ("t::changed", "t::unchanged", "t::new", "t::failed")]
+        config = FakeConfig()
+
+        recorder.pytest_collection_modifyitems(None, config, items)
+
+        assert [item.nodeid for item in items] == ["t::changed", "t::new", "t::failed"]
+        assert [item.nodeid for item in config.deselected] == ["t::unchanged"]
+
+    def test_record_only_selects_everything(self, tmp_path):
+        recorder = ImpactRecorder(cache_path=str(tmp_path / "impact.json"))
+        items = [FakeItem("t::a")]
+
+        recorder.pytest_collection_modifyitems(None, FakeConfig(), items)
+
+        assert [item.nodeid for item in items] == ["t::a"]
+
+    def test_dependencies_from_called_code(self, tmp_path):
+        """Package code maps to files, page-object methods and the API routes behind them."""
+        recorder = ImpactRecorder(cache_path=str(tmp_path / "impact.json"))
+        recorder._seen_code = {
+            UsersApi.create_users.__code__,
+            UserManagementApi.add_user.__code__,
+            sys._getframe().f_code,  # This test itself
+            compile("pass", "<string>", "exec"),
+        }
+
+        deps = recorder._dependencies(FakeItem("t::a"))
+
+        assert deps["routes"] == ["POST /addUser"]
+        assert deps["methods"] == ["UserManagementApi.add_user"]
+        assert "selenium_tests/api_client.py" in deps["deps"]
+        assert "selenium_tests/pages/user_management_api.py" in deps["deps"]
+        assert "server/controllers/userController.js" in deps["deps"]
+        assert "client/src/App.jsx" not in deps["deps"]
+        assert not any(path.startswith("selenium_tests/<") for path in deps["deps"])
+        assert deps["deps"]["selenium_tests/api_client.py"] == file_hash("selenium_tests/api_client.py")
+
+    def test_browser_tests_depend_on_the_client_and_every_route(self, tmp_path):
+        recorder = ImpactRecorder(cache_path=str(tmp_path / "impact.json"))
+
+        deps = recorder._dependencies(FakeItem("t::a", fixturenames=["driver"]))
+
+        assert deps["routes"] == sorted(impact.ROUTE_FILES)
+        assert "client/src/App.jsx" in deps["deps"]
+
+    def test_session_fixture_modules_count_for_every_user(self, tmp_path):
+        """Code run once in a session fixture's setup is charged to every test that uses the fixture."""
+        recorder = ImpactRecorder(cache_path=str(tmp_path / "impact.json"))
+
+        deps = recorder._dependencies(FakeItem("t::a", fixturenames=["users_api", "api_url", "api_ready"]))
+        browser_deps = recorder._dependencies(FakeItem("t::b", fixturenames=["driver", "driver_pool", "app_ready"]))
+
+        assert {"selenium_tests/readiness.py", "selenium_tests/standin_backend.py",
+                "selenium_tests/api_client.py"} <= set(deps["deps"])
+        assert "selenium_tests/driver_pool.py" not in deps["deps"]
+        assert {"selenium_tests/driver_pool.py", "selenium_tests/readiness.py"} <= set(browser_deps["deps"])
+        for paths in impact.SESSION_FIXTURE_FILES.values():
+            for path in paths:
+                assert file_hash(path) is not None, f"{path} no longer exists"
@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from selenium_tests.api_client import UsersApi
+from selenium_tests.perf.loadgen import LoadGenerator
+from selenium_tests.standin_backend import StandinBackend
+
+class HtmlHandler(BaseHTTPRequestHandler):
+    """Answers every request with 200 and an HTML page, like a dev server catching unknown paths."""
+
+    def _html(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = b"<!doctype html><html><body>app</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _html
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def html_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HtmlHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api"
+    server.shutdown()
+    server.server_close()
+
+class TestLoadGenerator:
+    """Short closed-loop runs against local servers."""
+
+    def test_run_against_the_standin_cleans_up(self):
+        with StandinBackend(port=0) as backend:
+            generator = LoadGenerator(backend.url, concurrency=4, duration=0.5, seed=1,
+                                      mix={"list": 1, "add": 3, "update": 2, "delete": 2})
+
+            report = generator.run()
+
+            assert report.as_dict()["operations"]["total"]["errors"] == 0
+            assert generator.stats["add"].histogram.total > 0
+            assert UsersApi(backend.url).list_users() == []
+
+    def test_add_answered_without_a_user_is_an_error(self, html_server):
+        """A 2xx that isn't the saved document counts as a failed add instead of aborting the run."""
+        generator = LoadGenerator(html_server, concurrency=2, duration=0.3, seed=1, mix={"add": 1})
+
+        report = generator.run()
+
+        adds = generator.stats["add"]
+        assert adds.histogram.total > 0
+        assert adds.errors == adds.histogram.total
+        assert report.as_dict()["operations"]["add"]["errors"] == adds.errors
+        assert generator.created_ids == []
@@ -0,0 +1,74 @@
+import pytest
+
+from selenium_tests.sharding import (
+    ShardSelector, estimate_durations, junit_key, parse_shard, plan_shards,
+)
+
+class FakeSession:
+    def __init__(self, exitstatus):
+        self.config = object()
+        self.exitstatus = exitstatus
+
+class TestSharding:
+    """Shard planning and selection."""
+
+    def test_junit_key_matches_pytest_junit_names(self):
+        """Keys use the classname and name pytest writes into JUnit XML."""
+        assert junit_key("test_user_management.py::TestUserManagement::test_01") == \
+            "test_user_management.TestUserManagement::test_01"
+        assert junit_key("pages/test_x.py::test_y[a-b]") == "pages.test_x::test_y[a-b]"
+
+    def test_plan_balances_by_duration(self):
+        """Longest tests are spread first, so shards end within one test of each other."""
+        durations = {"a": 10, "b": 6, "c": 5, "d": 4, "e": 1}
+
+        shards = plan_shards(list(durations), durations, 2)
+
+        assert [shard.nodeids for shard in shards] == [["a", "d"], ["b", "c", "e"]]
+        assert [shard.expected for shard in shards] == [14, 12]
+
+    def test_plan_is_deterministic_and_complete(self):
+        """Every agent computes the same plan, and every test lands in exactly one shard in collection order."""
+        nodeids = [f"t{number}" for number in range(20)]
+        durations = {nodeid: 1.0 for nodeid in nodeids}
+
+        first = plan_shards(nodeids, durations, 3)
+        second = plan_shards(nodeids, durations, 3)
+
+        assert [s.nodeids for s in first] == [s.nodeids for s in second]
+        assert sorted(n for s in first for n in s.nodeids) == sorted(nodeids)
+        for shard in first:
+            assert shard.nodeids == sorted(shard.nodeids, key=nodeids.index)
+
+    def test_more_shards_than_tests(self):
+        """Surplus shards are empty rather than an error."""
+        shards = plan_shards(["a", "b"], {"a": 1, "b": 2}, 4)
+
+        assert [len(shard.nodeids) for shard in shards] == [1, 1, 0, 0]
+
+    def test_unknown_tests_count_as_the_median(self):
+        """Tests without history get the median of the known durations."""
+        history = {"test_x::test_a": [1.0, 3.0], "test_x::test_b": [5.0], "test_x::test_c": [9.0]}
+
+        durations = estimate_durations(["test_x.py::test_a", "test_x.py::test_new"], history)
+
+        assert durations == {"test_x.py::test_a": 2.0, "test_x.py::test_new": 5.0}
+
+    def test_parse_shard(self):
+        assert parse_shard("2/4") == (2, 4)
+        for value in ("0/4", "5/4", "2", None):
+            with pytest.raises(ValueError):
+                parse_shard(value)
+
+    def test_empty_shard_is_not_a_failure(self):
+        """An empty shard of a non-empty selection exits 0; an empty selection still exits 5."""
+        selector = ShardSelector(2, 2, durations_path="/nonexistent")
+        selector.collected = 1
+        session = FakeSession(pytest.ExitCode.NO_TESTS_COLLECTED)
+        selector.pytest_sessionfinish(session, session.exitstatus)
+        assert session.exitstatus == pytest.ExitCode.OK
+
+        selector.collected = 0
+        session = FakeSession(pytest.ExitCode.NO_TESTS_COLLECTED)
+        selector.pytest_sessionfinish(session, session.exitstatus)
+        assert session.exitstatus == pytest.ExitCode.NO_TESTS_COLLECTED
@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from selenium.common.exceptions import NoSuchElementException
+
+from selenium_tests.perf.soak import OperatorSession, SoakStats, format_sweep
+
+class FakePage:
+    """Stands in for UserManagementPage: each flow either raises or answers with the given statuses."""
+
+    def __init__(self, statuses=(), error=None):
+        self.statuses = statuses
+        self.error = error
+        self.refreshed = 0
+
+    @contextmanager
+    def capture_network(self):
+        yield [SimpleNamespace(status=status) for status in self.statuses]
+
+    def add_user(self, name, email, age):
+        if self.error:
+            raise self.error
+
+    def delete_user(self, row):
+        if self.error:
+            raise self.error
+
+    def get_alert_text(self):
+        return None
+
+    def refresh_page(self):
+        self.refreshed += 1
+
+def session(page):
+    operator = OperatorSession(None, None, "http://app", ["a@soak.test"], {"add": 1}, seed=0)
+    operator.page = page
+    return operator
+
+class TestSoak:
+    """Classification of operation outcomes into app errors, harness errors and incidents."""
+
+    def test_webdriver_failure_is_a_harness_error(self):
+        """A locator that matches nothing says nothing about the app."""
+        operator = session(FakePage(error=NoSuchElementException("form button")))
+
+        operator._perform("add", 0)
+
+        assert operator.stats.harness_errors["add"] == 1
+        assert operator.stats.errors["add"] == 0
+        assert operator.page.refreshed == 1
+
+    def test_http_errors_are_app_errors_and_incidents(self):
+        operator = session(FakePage(statuses=[500, 200]))
+        operator._perform("add", 0)
+        operator.page = FakePage(statuses=[404])
+        operator._perform("delete", 3)
+
+        assert operator.stats.errors == {"add": 1, "edit": 0, "delete": 1}
+        assert sum(operator.stats.harness_errors.values()) == 0
+        assert operator.stats.incidents["duplicate_rejected"] == 1
+        assert operator.stats.incidents["stale_target"] == 1
+
+    def test_summary_reports_both_rates(self):
+        stats, other = SoakStats(), SoakStats()
+        for _ in range(4):
+            stats.histograms["add"].record_seconds(0.1)
+        stats.harness_errors["add"] = 1
+        other.histograms["edit"].record_seconds(0.1)
+        other.errors["edit"] = 1
+        stats.merge(other)
+
+        summary = stats.summary(elapsed=5)
+
+        assert summary["operations"] == 5
+        assert summary["error_rate"] == 0.2
+        assert summary["harness_error_rate"] == 0.2
+        assert "harn %" in format_sweep([dict(summary, sessions=1)])
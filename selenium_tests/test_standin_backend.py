@@ -0,0 +1,136 @@
+import pytest
+import requests
+
+from selenium_tests.api_client import UsersApi
+from selenium_tests.standin_backend import StandinBackend
+
+@pytest.fixture
+def backend():
+    """Stand-in backend on a free port, fresh for every test."""
+    with StandinBackend(port=0) as backend:
+        yield backend
+
+@pytest.fixture
+def api(backend):
+    """API client pointed at the stand-in backend."""
+    api = UsersApi(backend.url)
+    yield api
+    api.close()
+
+class TestStandinBackend:
+    """
+    Checks that the stand-in matches the routes and responses of
+    server/routes/api.js and server/controllers/userController.js.
+    """
+
+    def test_create_and_list_users(self, api):
+        """Created users come back in insertion order with Mongo-style ids."""
+        first = api.create_user("John Doe", "john@test.com", "25")
+        second = api.create_user("Jane Doe", "jane@test.com", 30)
+
+        assert len(first["_id"]) == 24
+        assert first["age"] == 25, "Age should be cast to a number like the User schema does"
+        assert first["__v"] == 0
+        assert [u["email"] for u in api.list_users()] == ["john@test.com", "jane@test.com"]
+        assert api.list_users(limit=1) == [first]
+        assert second["name"] == "Jane Doe"
+
+    def test_duplicate_email_returns_500(self, backend, api):
+        """The unique email index rejects duplicates with the controller's 500 response."""
+        api.create_user("John Doe", "john@test.com", 25)
+
+        response = requests.post(f"{backend.url}/addUser", json={"name": "Jane", "email": "john@test.com", "age": 30})
+
+        assert response.status_code == 500
+        assert response.json() == {"error": "Internal Server Error"}
+        assert len(api.list_users()) == 1
+
+    def test_json_that_is_not_an_object(self, backend, api):
+        """Like express.json(): bare values are a 400, arrays carry no fields and fail validation."""
+        url = f"{backend.url}/addUser"
+
+        for body in ("5", '"x"', "null"):
+            response = requests.post(url, data=body, headers={"Content-Type": "application/json"})
+            assert response.status_code == 400
+        assert requests.post(url, json=[1, 2]).status_code == 500
+        assert requests.put(f"{backend.url}/users/{'0' * 24}", data="true",
+                            headers={"Content-Type": "application/json"}).status_code == 400
+        assert api.list_users() == []
+
+    def test_update_returns_previous_document(self, backend, api):
+        """PUT responds with the document as it was before the update (findByIdAndUpdate default)."""
+        user = api.create_user("John Doe", "john@test.com", 25)
+
+        response = requests.put(f"{backend.url}/users/{user['_id']}", json={"name": "John Updated", "email": "new@test.com", "age": 26})
+
+        assert response.status_code == 200
+        assert response.json() == {"message": "User updated successfully", "updatedUser": user}
+        assert api.list_users()[0]["email"] == "new@test.com"
+        # The old email is free again
+        api.create_user("Someone", "john@test.com", 40)
+
+    def test_update_and_delete_missing_user(self, backend, api):
+        """Unknown ids give 404, malformed ids give 500, as with Mongoose casting."""
+        missing = "0" * 24
+
+        assert api.update_user(missing, "A", "a@test.com", 1) is False
+        assert api.delete_user(missing) is False
+        assert requests.delete(f"{backend.url}/users/not-an-id").status_code == 500
+
+    def test_delete_user(self, backend, api):
+        """DELETE removes the user and returns it."""
+        user = api.create_user("John Doe", "john@test.com", 25)
+
+        response = requests.delete(f"{backend.url}/users/{user['_id']}")
+
+        assert response.json() == {"message": "User deleted successfully", "deletedUser": user}
+        assert api.list_users() == []
+
+    def test_cors_preflight(self, backend):
+        """Preflight requests are answered like the cors() middleware."""
+        response = requests.options(
+            f"{backend.url}/addUser",
+            headers={"Origin": "http://localhost:5173", "Access-Control-Request-Headers": "content-type"},
+        )
+
+        assert response.status_code == 204
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+        assert response.headers["Access-Control-Allow-Headers"] == "content-type"
+
+    def test_concurrent_seeding(self, api):
+        """Bulk creation through the pooled client keeps every email unique."""
+        users = [{"name": f"User {i}", "email": f"user{i}@test.com", "age": 20 + i % 50} for i in range(200)]
+
+        ids = api.create_users(users)
+
+        assert len(set(ids)) == 200
+        assert len(api.list_users()) == 200
+        assert api.delete_users(ids) == 200
+        assert api.list_users() == []
+
+    def test_partial_seeding_reports_created_ids(self, api, monkeypatch):
+        """Whatever fails, the ids that were created are attached to the error for cleanup."""
+        api.create_user("Taken", "taken@test.com", 30)
+        users = [{"name": "New", "email": "new@test.com", "age": 30},
+                 {"name": "Dup", "email": "taken@test.com", "age": 30}]
+
+        with pytest.raises(requests.HTTPError) as failure:
+            api.create_users(users)
+        assert [user["_id"] for user in api.list_users() if user["email"] == "new@test.com"] == failure.value.created_ids
+
+        create_user = api.create_user
+        monkeypatch.setattr(api, "create_user", lambda name, email, age: (
+            {} if name == "Broken" else create_user(name, email, age)
+        ))
+        with pytest.raises(KeyError) as failure:
+            api.create_users([{"name": "Other", "email": "other@test.com", "age": 30},
+                              {"name": "Broken", "email": "broken@test.com", "age": 30}])
+        assert len(failure.value.created_ids) == 1
+
+    def test_injected_latency(self, backend, api):
+        """Every response is delayed by the configured latency."""
+        backend.latency_ms = 50
+
+        response = api.session.get(f"{backend.url}/users")
+
+        assert response.elapsed.total_seconds() >= 0.05
@@ -0,0 +1,97 @@
+import pytest
+
+from selenium_tests.pages.table_snapshot import TableDiff, TableSnapshot, UserRow
+from selenium_tests.pages.user_management_page import CELL_SEPARATOR, ROW_SEPARATOR, UserManagementPage
+
+def row(index, user_id, name="Name", email=None, age="30 Year's"):
+    return UserRow(index, user_id, name, email or f"{user_id}@test.com", age)
+
+class ScriptedDriver:
+    """Answers every execute_script call with a fixed result."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def execute_script(self, script, *args):
+        return self.result
+
+class TestTableDiff:
+    """Matching of rows by id between two table states."""
+
+    def test_added_removed_and_modified(self):
+        """Rows are matched by id; only their cells decide whether they changed."""
+        before = [row(0, "a"), row(1, "b"), row(2, "c")]
+        after = [row(0, "d"), row(1, "a"), row(2, "c", name="Renamed")]
+
+        diff = TableDiff.between(before, after)
+
+        assert diff.added == [row(0, "d")]
+        assert diff.removed == [row(1, "b")]
+        assert diff.modified == [(row(2, "c"), row(2, "c", name="Renamed"))]
+
+    def test_moved_rows_are_not_changes(self):
+        """A row pushed down by a new row above it keeps its id and cells."""
+        before = TableSnapshot([row(0, "a"), row(1, "b")])
+        after = TableSnapshot([row(0, "b"), row(1, "a")])
+
+        diff = before.diff(after)
+
+        assert not diff
+        assert "+0 -0 ~0" in repr(diff)
+
+    def test_restricted_to_owned_rows(self):
+        """Changes to rows the test doesn't own are left out."""
+        diff = TableDiff(
+            added=[row(0, "mine-new"), row(1, "theirs-new")],
+            removed=[row(5, "mine-old"), row(6, "theirs-old")],
+            modified=[(row(2, "x", email="mine@test.com"), row(2, "x", name="New", email="mine@test.com")),
+                      (row(3, "y"), row(3, "y", name="New"))],
+        )
+
+        own = diff.restricted_to(ids=["mine-new", "mine-old"], emails=["mine@test.com"])
+
+        assert [r.id for r in own.added] == ["mine-new"]
+        assert [r.id for r in own.removed] == ["mine-old"]
+        assert [after.id for _, after in own.modified] == ["x"]
+
+    def test_diff_table_unpacks_browser_result(self):
+        """Rows packed by DIFF_TABLE_JS come back as UserRows with integer indexes."""
+        def pack(r):
+            return CELL_SEPARATOR.join([str(r.index), r.id, r.name, r.email, r.age])
+
+        before, after = row(4, "c"), row(2, "c", name="Renamed")
+        page = UserManagementPage(ScriptedDriver({
+            "added": [pack(row(0, "d"))],
+            "removed": [pack(row(1, "b"))],
+            "modified": [pack(before) + ROW_SEPARATOR + pack(after)],
+        }))
+
+        diff = page.diff_table()
+
+        assert diff.added == [row(0, "d")]
+        assert diff.removed == [row(1, "b")]
+        assert diff.modified == [(before, after)]
+
+    def test_diff_table_without_baseline(self):
+        """A page load drops the baseline; diffing then fails loudly."""
+        page = UserManagementPage(ScriptedDriver(None))
+
+        with pytest.raises(RuntimeError, match="capture_table"):
+            page.diff_table()
+
+class TestTableSnapshot:
+    """Reading the whole table."""
+
+    def test_snapshot_is_one_round_trip(self):
+        """snapshot() reads every row with a single script call, however long the table."""
+        packed = [CELL_SEPARATOR.join([f"id{n}", "Name", f"user{n}@test.com", "30 Year's"]) for n in range(1200)]
+        driver = ScriptedDriver({"total": 1200, "rows": ROW_SEPARATOR.join(packed)})
+        calls = []
+        execute_script = driver.execute_script
+        driver.execute_script = lambda script, *args: calls.append(args) or execute_script(script, *args)
+
+        snapshot = UserManagementPage(driver).snapshot()
+
+        assert calls == [(0, None)]
+        assert len(snapshot) == 1200
+        assert snapshot.find("user1199@test.com") == row(1199, "id1199", email="user1199@test.com")
@@ -0,0 +1,73 @@
+import pytest
+
+from selenium_tests.telemetry import (
+    BUDGET_OUTCOMES, budget_violations, connect, find_slowdowns, load_series,
+    mann_whitney_greater, merge_databases,
+)
+
+def record_run(db, results):
+    """Insert one run; `results` is {nodeid: (outcome, call_s)}."""
+    run_id = db.execute("INSERT INTO runs (started) VALUES (0)").lastrowid
+    db.executemany(
+        "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(run_id, nodeid, outcome, 0.0, call_s, 0.0, None) for nodeid, (outcome, call_s) in results.items()],
+    )
+    return run_id
+
+class TestTelemetry:
+    """Slowdown statistics, budgets and merging of recorded runs."""
+
+    def test_mann_whitney_known_value(self):
+        """Matches the normal approximation with continuity correction worked by hand."""
+        assert mann_whitney_greater([4, 5, 6], [1, 2, 3]) == pytest.approx(0.0404, abs=1e-4)
+
+    def test_mann_whitney_direction_and_ties(self):
+        """Small p only when `recent` is larger; identical samples are never significant."""
+        assert mann_whitney_greater([10, 11, 12, 13, 14], list(range(10))) < 0.01
+        assert mann_whitney_greater(list(range(10)), [10, 11, 12, 13, 14]) > 0.99
+        assert mann_whitney_greater([1, 1, 1], [1, 1, 1]) == 1.0
+
+    def test_find_slowdowns_needs_significance_and_size(self):
+        """A consistent 50% slowdown is flagged; noise and small shifts are not."""
+        baseline = [1.0, 1.1, 0.9, 1.05, 0.95] * 4
+        series = {
+            "slower": {"call_s": list(enumerate(baseline + [1.5, 1.55, 1.45, 1.6, 1.5]))},
+            "noisy": {"call_s": list(enumerate(baseline + [0.9, 1.6, 1.0, 0.95, 1.05]))},
+            "slightly": {"call_s": list(enumerate(baseline + [1.05, 1.06, 1.04, 1.07, 1.05]))},
+        }
+
+        slowdowns = find_slowdowns(series, recent=5, baseline=20)
+
+        assert [(nodeid, name) for nodeid, name, *_ in slowdowns] == [("slower", "call_s")]
+
+    def test_too_few_runs_are_not_judged(self):
+        series = {"new": {"call_s": [(1, 1.0), (2, 1.0), (3, 9.0)]}}
+
+        assert find_slowdowns(series, recent=5) == []
+
+    def test_budgets_catch_failed_runs(self):
+        """A test that went over budget and then failed is reported; trends still use passed runs only."""
+        db = connect(":memory:")
+        record_run(db, {"t::a": ("passed", 1.0), "t::b": ("passed", 1.0)})
+        record_run(db, {"t::a": ("failed", 30.0), "t::b": ("skipped", 0.0)})
+        budgets = {"t::*": {"call_s": 5}}
+
+        assert budget_violations(load_series(db), budgets) == []
+        violations = budget_violations(load_series(db, outcomes=BUDGET_OUTCOMES), budgets)
+        assert violations == ["t::a call_s: 30.00 > 5 (t::*)"]
+
+    def test_merge_databases(self, tmp_path):
+        """Shard databases are appended under new run ids with their results and metrics."""
+        shard = connect(str(tmp_path / "shard.sqlite"))
+        with shard:
+            run_id = record_run(shard, {"t::a": ("passed", 2.0)})
+            shard.execute("INSERT INTO metrics VALUES (?, 't::a', 'load_event_ms', 120)", (run_id,))
+        shard.close()
+        db = connect(":memory:")
+        record_run(db, {"t::a": ("passed", 1.0)})
+
+        assert merge_databases(db, [str(tmp_path / "shard.sqlite")]) == 1
+
+        series = load_series(db)["t::a"]
+        assert series["call_s"] == [(1, 1.0), (2, 2.0)]
+        assert series["load_event_ms"] == [(2, 120.0)]
@@ -12,18 +12,18 @@ from selenium.common.exceptions import TimeoutException
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from selenium_tests.pages.user_management_page import UserManagementPage
 
-@pytest.fixture(scope="session")
-def test_data():
-    """Test data for user management tests."""
+@pytest.fixture
+def test_data(unique_email):
+    """Test data for user management tests, namespaced per worker and test."""
     return {
         "valid_user": {
             "name": "John Doe",
-            "email": "john.doe@gmail.com",
+            "email": unique_email("john.doe@gmail.com"),
             "age": "25"
         },
         "duplicate_email": {
             "name": "Jane Doe",
-            "email": "john.doe@test.com",
+            "email": unique_email("john.doe@gmail.com"),  # Same email as valid_user
             "age": "30"
         },
         "invalid_user": {
@@ -33,7 +33,7 @@ def test_data():
         },
         "updated_user": {
             "name": "John Updated",
-            "email": "john.updated@test.com",
+            "email": unique_email("john.updated@test.com"),
             "age": "26"
         }
     }
@@ -44,19 +44,13 @@ class TestUserManagement:
     Contains 10+ comprehensive test cases covering all functionality.
     """
     
-    def setup_method(self):
-        """Setup method run before each test."""
-        time.sleep(2)  # Wait between tests
-    
     def test_01_page_load_and_elements_present(self, driver, base_url):
         """
         Test Case 1: Verify page loads correctly and all essential elements are present.
         """
-        # Navigate to the application
-        driver.get(base_url)
-        
-        # Create page object
+        # Create page object and navigate to the application
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Verify page title
         assert "DevOps Assignment 2" in driver.title
@@ -78,15 +72,16 @@ class TestUserManagement:
         """
         Test Case 2: Add a new user with valid data successfully.
         """
-        driver.get(base_url)
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Get initial user count
         initial_count = page.get_users_count()
         
-        # Add new user
+        # Add new user: one POST, and no refetch of the table
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        with page.network_budget(max_requests=1, max_kb=2):
+            page.add_user(user["name"], user["email"], user["age"])
         
         # Wait for user to appear in table
         assert page.wait_for_user_to_appear(user["email"]), "User should appear in table"
@@ -110,16 +105,16 @@ class TestUserManagement:
         assert form_values["email"] == "", "Email field should be cleared"
         assert form_values["age"] == "", "Age field should be cleared"
     
-    def test_03_add_user_with_duplicate_email(self, driver, base_url, test_data):
+    @pytest.mark.contract
+    def test_03_add_user_with_duplicate_email(self, page, base_url, test_data, seed_users):
         """
         Test Case 3: Attempt to add user with duplicate email and verify error handling.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
-        
-        # Add first user
+        # Create the first user through the API
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        seed_users([user])
+        
+        page.navigate(base_url)
         
         # Wait for first user to appear
         assert page.wait_for_user_to_appear(user["email"])
@@ -129,18 +124,12 @@ class TestUserManagement:
         page.add_user(duplicate_user["name"], duplicate_user["email"], duplicate_user["age"])
         
         # Check for alert message
-        alert = driver.switch_to.alert
-        assert alert is not None, "Alert should appear for duplicate email"
-        assert "Email already exists" in alert.text, "Alert should mention duplicate email"
-        alert.accept()
+        alert_text = page.get_alert_text()
+        assert alert_text is not None, "Alert should appear for duplicate email"
+        assert "Email already exists" in alert_text, "Alert should mention duplicate email"
         
         # Verify only one user with that email exists
-        user_count = page.get_users_count()
-        email_count = 0
-        for i in range(user_count):
-            user_data_from_table = page.get_user_data_from_table(i)
-            if user_data_from_table and user_data_from_table["email"] == user["email"]:
-                email_count += 1
+        email_count = sum(1 for row in page.snapshot() if row.email == user["email"])
         
         assert email_count == 1, "Only one user with duplicate email should exist"
     
@@ -148,8 +137,8 @@ class TestUserManagement:
         """
         Test Case 4: Attempt to add user with invalid data and verify validation.
         """
-        driver.get(base_url)
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Get initial user count
         initial_count = page.get_users_count()
@@ -168,16 +157,16 @@ class TestUserManagement:
         final_count = page.get_users_count()
         assert final_count == initial_count, "User count should not change for invalid data"
     
-    def test_05_edit_existing_user(self, driver, base_url, test_data):
+    @pytest.mark.contract
+    def test_05_edit_existing_user(self, page, base_url, test_data, seed_users):
         """
         Test Case 5: Edit an existing user and verify changes are saved.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
-        
-        # Add a user first
+        # Create a user through the API first
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        seed_users([user])
+        
+        page.navigate(base_url)
         
         # Wait for user to appear
         assert page.wait_for_user_to_appear(user["email"])
@@ -198,7 +187,8 @@ class TestUserManagement:
         # Update user data
         updated_user = test_data["updated_user"]
         page.fill_user_form(updated_user["name"], updated_user["email"], updated_user["age"])
-        page.submit_form()
+        with page.network_budget(max_requests=2):  # PUT plus the refetch of the table
+            page.submit_form()
         
         # Wait for updated user to appear
         assert page.wait_for_user_to_appear(updated_user["email"])
@@ -212,36 +202,37 @@ class TestUserManagement:
         assert updated_data["email"] == updated_user["email"]
         assert updated_data["age"] == updated_user["age"] + " Year's"
     
-    def test_06_delete_existing_user(self, driver, base_url, test_data):
+    @pytest.mark.contract
+    def test_06_delete_existing_user(self, page, base_url, test_data, seed_users):
         """
         Test Case 6: Delete an existing user and verify removal.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
-        
-        # Add a user first
+        # Create a user through the API first
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        user_ids = seed_users([user])
+        
+        page.navigate(base_url)
         
         # Wait for user to appear
         assert page.wait_for_user_to_appear(user["email"])
         
-        # Get user count before deletion
-        initial_count = page.get_users_count()
-        
         # Find user row and delete
         user_row_index = page.find_user_by_email(user["email"])
         assert user_row_index >= 0, "User should be found for deletion"
         
         # Click delete button
-        page.delete_user(user_row_index)
+        with page.track_changes() as changes:
+            with page.network_budget(max_requests=2):  # DELETE plus the refetch of the table
+                page.delete_user(user_row_index)
+            
+            # Wait for user to disappear
+            assert page.wait_for_user_to_disappear(user["email"]), "User should be removed from table"
         
-        # Wait for user to disappear
-        assert page.wait_for_user_to_disappear(user["email"]), "User should be removed from table"
-        
-        # Verify user count decreased
-        final_count = page.get_users_count()
-        assert final_count == initial_count - 1, f"User count should decrease from {initial_count} to {initial_count - 1}"
+        # The delete refetches the whole table, so the diff also holds rows other
+        # workers changed meanwhile; judge only the rows this test owns
+        own = changes.restricted_to(ids=user_ids, emails=[user["email"]])
+        assert [row.email for row in own.removed] == [user["email"]], f"The user should be removed: {changes!r}"
+        assert not own.added and not own.modified, f"Nothing else of this test's should change: {changes!r}"
         
         # Verify user is not in table
         user_row_index_after = page.find_user_by_email(user["email"])
@@ -251,8 +242,8 @@ class TestUserManagement:
         """
         Test Case 7: Test form validation and clearing functionality.
         """
-        driver.get(base_url)
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Test form clearing
         page.fill_user_form("Test Name", "test@email.com", "25")
@@ -271,47 +262,43 @@ class TestUserManagement:
         assert alert_text is not None, "Alert should appear for incomplete form"
         assert "Please fill in all fields" in alert_text, "Alert should mention missing fields"
     
-    def test_08_multiple_users_operations(self, driver, base_url):
+    def test_08_multiple_users_operations(self, driver, base_url, unique_email):
         """
         Test Case 8: Test operations with multiple users.
         """
-        driver.get(base_url)
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Add multiple users
         users = [
-            {"name": "User 1", "email": "user1@test.com", "age": "25"},
-            {"name": "User 2", "email": "user2@test.com", "age": "30"},
-            {"name": "User 3", "email": "user3@test.com", "age": "35"}
+            {"name": "User 1", "email": unique_email("user1@test.com"), "age": "25"},
+            {"name": "User 2", "email": unique_email("user2@test.com"), "age": "30"},
+            {"name": "User 3", "email": unique_email("user3@test.com"), "age": "35"}
         ]
         
-        for user in users:
-            page.add_user(user["name"], user["email"], user["age"])
-            assert page.wait_for_user_to_appear(user["email"]), f"User {user['email']} should appear"
-        
-        # Verify all users are in table
-        final_count = page.get_users_count()
-        assert final_count == len(users), f"Should have {len(users)} users in table"
-        
-        # Get all users data
-        all_users_data = page.get_all_users_data()
-        assert len(all_users_data) == len(users), "All users should be retrieved"
-        
-        # Verify each user data
-        for user in users:
-            user_found = any(u["email"] == user["email"] for u in all_users_data)
-            assert user_found, f"User {user['email']} should be in table data"
+        with page.track_changes() as changes:
+            for user in users:
+                page.add_user(user["name"], user["email"], user["age"])
+                assert page.wait_for_user_to_appear(user["email"]), f"User {user['email']} should appear"
+        
+        # Verify exactly these users were added, with their data, and nothing else changed.
+        # Adding prepends the new row locally without refetching the table, so
+        # rows other workers change meanwhile never show up in this diff.
+        added = {row.email: (row.name, row.age) for row in changes.added}
+        expected = {user["email"]: (user["name"], f"{user['age']} Year's") for user in users}
+        assert added == expected, f"Exactly the new users should be added: {changes!r}"
+        assert not changes.removed and not changes.modified, f"Nothing else should change: {changes!r}"
     
-    def test_09_page_refresh_and_data_persistence(self, driver, base_url, test_data):
+    @pytest.mark.contract
+    def test_09_page_refresh_and_data_persistence(self, page, base_url, test_data, seed_users):
         """
         Test Case 9: Test data persistence after page refresh.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
-        
-        # Add a user
+        # Create a user through the API
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        seed_users([user])
+        
+        page.navigate(base_url)
         
         # Wait for user to appear
         assert page.wait_for_user_to_appear(user["email"])
@@ -329,16 +316,16 @@ class TestUserManagement:
         assert user_data_from_table["email"] == user["email"]
         assert user_data_from_table["age"] == user["age"] + " Year's"
     
-    def test_10_api_integration_verification(self, driver, base_url, api_url, test_data):
+    def test_10_api_integration_verification(self, driver, base_url, api_url, test_data, seed_users):
         """
         Test Case 10: Verify API integration by checking data consistency between UI and API.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
-        
-        # Add user through UI
+        # Create user through the API
         user = test_data["valid_user"]
-        page.add_user(user["name"], user["email"], user["age"])
+        user_id = seed_users([user])[0]
+        
+        page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Wait for user to appear in UI
         assert page.wait_for_user_to_appear(user["email"])
@@ -346,6 +333,7 @@ class TestUserManagement:
         # Get user data from UI
         user_row_index = page.find_user_by_email(user["email"])
         ui_user_data = page.get_user_data_from_table(user_row_index)
+        assert ui_user_data["id"] == user_id, "UI should show the id returned by the API"
         
         # Verify user exists in API
         try:
@@ -354,9 +342,9 @@ class TestUserManagement:
             
             api_users = response.json()
             api_user = None
-            for user in api_users:
-                if user.get("email") == user["email"]:
-                    api_user = user
+            for candidate in api_users:
+                if candidate.get("email") == user["email"]:
+                    api_user = candidate
                     break
             
             assert api_user is not None, "User should exist in API response"
@@ -364,51 +352,56 @@ class TestUserManagement:
             # Verify data consistency
             assert api_user["name"] == ui_user_data["name"], "Name should match between UI and API"
             assert api_user["email"] == ui_user_data["email"], "Email should match between UI and API"
-            assert api_user["age"] == ui_user_data["age"] + " Year's", "Age should match between UI and API"
+            assert f"{api_user['age']} Year's" == ui_user_data["age"], "Age should match between UI and API"
             
         except requests.RequestException as e:
             pytest.fail(f"API request failed: {e}")
     
-    def test_11_edge_cases_and_error_handling(self, driver, base_url):
+    def test_11_edge_cases_and_error_handling(self, driver, base_url, unique_email):
         """
         Test Case 11: Test edge cases and error handling scenarios.
         """
-        driver.get(base_url)
         page = UserManagementPage(driver)
+        page.navigate(base_url)
         
         # Test with very long name
         long_name = "A" * 100
-        page.add_user(long_name, "longname@test.com", "25")
+        page.add_user(long_name, unique_email("longname@test.com"), "25")
         
         # Test with special characters in name
         special_name = "John O'Connor-Smith"
-        page.add_user(special_name, "special@test.com", "30")
+        page.add_user(special_name, unique_email("special@test.com"), "30")
         
         # Test with very young age
-        page.add_user("Young User", "young@test.com", "18")
+        page.add_user("Young User", unique_email("young@test.com"), "18")
         
         # Test with maximum age
-        page.add_user("Old User", "old@test.com", "70")
+        page.add_user("Old User", unique_email("old@test.com"), "70")
         
         # Verify all users were added
-        assert page.wait_for_user_to_appear("longname@test.com")
-        assert page.wait_for_user_to_appear("special@test.com")
-        assert page.wait_for_user_to_appear("young@test.com")
-        assert page.wait_for_user_to_appear("old@test.com")
+        assert page.wait_for_user_to_appear(unique_email("longname@test.com"))
+        assert page.wait_for_user_to_appear(unique_email("special@test.com"))
+        assert page.wait_for_user_to_appear(unique_email("young@test.com"))
+        assert page.wait_for_user_to_appear(unique_email("old@test.com"))
     
-    def test_12_performance_and_responsiveness(self, driver, base_url):
+    def test_12_performance_and_responsiveness(self, driver, base_url, test_data, seed_users):
         """
         Test Case 12: Test application performance and responsiveness.
         """
-        driver.get(base_url)
-        page = UserManagementPage(driver)
+        # At least one row, so the initial load has a table to render
+        seed_users([test_data["valid_user"]])
         
-        # Measure page load time
-        start_time = time.time()
-        page.wait_for_page_load()
-        load_time = time.time() - start_time
+        page = UserManagementPage(driver)
+        page.navigate(base_url)
         
-        assert load_time < 5, f"Page should load within 5 seconds, took {load_time:.2f} seconds"
+        # Measure page load with the browser's own Navigation/Resource Timing
+        metrics = page.get_performance_metrics()
+        metrics.assert_budget(
+            load_event_ms=5000,        # Page should load within 5 seconds
+            api_users_ms=1000,         # Initial users fetch should be fast
+            long_task_total_ms=1000,   # Main thread should not be blocked for long
+            table_render_ms=1000,      # Table rendering should be fast
+        )
         
         # Test form responsiveness
         start_time = time.time()
@@ -416,10 +409,3 @@ class TestUserManagement:
         form_fill_time = time.time() - start_time
         
         assert form_fill_time < 2, f"Form filling should be responsive, took {form_fill_time:.2f} seconds"
-        
-        # Test table rendering
-        start_time = time.time()
-        page.get_users_count()
-        table_render_time = time.time() - start_time
-        
-        assert table_render_time < 1, f"Table rendering should be fast, took {table_render_time:.2f} seconds" 
\ No newline at end of file
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from selenium_tests.wait_timeouts import WaitTimeouts, percentile
+
+def history_file(tmp_path, operations):
+    path = tmp_path / "wait_history.json"
+    path.write_text(json.dumps({"operations": operations}))
+    return str(path)
+
+class TestWaitTimeouts:
+    """Timeouts derived from the recorded wait history, and merging of that history."""
+
+    def test_percentile_is_nearest_rank(self):
+        assert percentile(list(range(1, 101)), 0.99) == 99
+        assert percentile([5, 1, 3], 0.99) == 5
+        assert percentile([7], 0.5) == 7
+
+    def test_defaults_without_enough_samples(self, tmp_path):
+        timeouts = WaitTimeouts(history_file(tmp_path, {"find_element": [100.0] * 19}))
+
+        assert timeouts.p99("find_element") is None
+        assert timeouts.timeout("find_element") == 10.0
+        assert timeouts.negative_timeout("find_element") == 1.0
+        assert timeouts.timeout("never_seen") == 10.0
+
+    def test_timeout_is_p99_times_factor_clamped(self, tmp_path):
+        """p99 x 3 within [5, 60] seconds."""
+        timeouts = WaitTimeouts(history_file(tmp_path, {
+            "fast": [100.0] * 20,
+            "medium": [1000.0] * 19 + [4000.0],
+            "slow": [30000.0] * 20,
+        }))
+
+        assert timeouts.timeout("fast") == 5.0
+        assert timeouts.timeout("medium") == pytest.approx(12.0)
+        assert timeouts.timeout("slow") == 60.0
+
+    def test_negative_timeout_is_p99_times_factor_clamped(self, tmp_path):
+        """p99 x 1.5 within [0.25, 2] seconds."""
+        timeouts = WaitTimeouts(history_file(tmp_path, {
+            "fast": [10.0] * 20,
+            "medium": [800.0] * 20,
+            "slow": [5000.0] * 20,
+        }))
+
+        assert timeouts.negative_timeout("fast") == 0.25
+        assert timeouts.negative_timeout("medium") == pytest.approx(1.2)
+        assert timeouts.negative_timeout("slow") == 2.0
+
+    def test_save_merges_with_other_workers(self, tmp_path):
+        """Samples saved by another worker since this one started are kept, not overwritten."""
+        path = history_file(tmp_path, {"find_element": [1.0, 2.0]})
+        first, second = WaitTimeouts(path), WaitTimeouts(path)
+        first.record("find_element", 0.003)
+        second.record("find_element", 0.004)
+        second.record("ui_idle", 0.5)
+
+        first.save()
+        second.save()
+
+        with open(path) as f:
+            operations = json.load(f)["operations"]
+        assert operations == {"find_element": [1.0, 2.0, 3.0, 4.0], "ui_idle": [500.0]}
+        assert first.history["find_element"] == [1.0, 2.0]  # Timeouts stay fixed during the run
+        assert first.new_samples == {}
+
+    def test_save_keeps_the_most_recent_samples(self, tmp_path):
+        path = history_file(tmp_path, {"find_element": [1.0, 2.0, 3.0]})
+        timeouts = WaitTimeouts(path, max_samples=4)
+        timeouts.record("find_element", 0.004)
+        timeouts.record("find_element", 0.005)
+
+        timeouts.save()
+
+        assert WaitTimeouts(path).history["find_element"] == [2.0, 3.0, 4.0, 5.0]
+
+    def test_save_without_a_history_file(self, tmp_path):
+        timeouts = WaitTimeouts(str(tmp_path / "missing" / "history.json"))
+        timeouts.save()  # No samples: nothing is written
+
+        timeouts = WaitTimeouts(str(tmp_path / "new.json"))
+        timeouts.record("find_element", 0.25)
+        timeouts.save()
+
+        assert WaitTimeouts(str(tmp_path / "new.json")).history == {"find_element": [250.0]}
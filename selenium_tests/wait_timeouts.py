@@ -0,0 +1,107 @@
+"""
+Wait timeouts learned from previous runs.
+
+Page objects record how long each kind of wait took when it succeeded
+(finding an element, the UI settling, a user appearing in the table, ...).
+The samples are kept per operation in a local JSON file, and each run
+derives its timeouts from what earlier runs saw:
+
+- waits for something expected to happen get p99 x `factor`, clamped to
+  [`minimum`, `maximum`], so slow environments get longer timeouts and
+  fast ones fail sooner
+- checks that something does *not* happen only wait as long as it would
+  usually take to happen: p99 x `negative_factor`, clamped to a much
+  shorter range
+
+Operations with fewer than `min_samples` samples fall back to the fixed
+defaults. A wait that times out records its timeout as a sample, so an
+environment that got slower pushes its timeouts up in later runs.
+"""
+
+import json
+import math
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(PACKAGE_DIR, ".wait_history.json")
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an unsorted list of numbers."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class WaitTimeouts:
+    """Per-operation latency history and the timeouts derived from it."""
+
+    def __init__(self, path=None, default=10.0, factor=3.0, minimum=5.0, maximum=60.0,
+                 negative_default=1.0, negative_factor=1.5, negative_minimum=0.25, negative_maximum=2.0,
+                 min_samples=20, max_samples=500):
+        self.path = path
+        self.default = default
+        self.factor = factor
+        self.minimum = minimum
+        self.maximum = maximum
+        self.negative_default = negative_default
+        self.negative_factor = negative_factor
+        self.negative_minimum = negative_minimum
+        self.negative_maximum = negative_maximum
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        # Timeouts stay fixed for the whole run; new samples only count next time
+        self.history = self._read() if path else {}
+        self.new_samples = {}
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f).get("operations", {})
+        except (OSError, ValueError):
+            return {}
+
+    def p99(self, operation):
+        """99th percentile of the recorded durations in seconds, or None without enough history."""
+        samples = self.history.get(operation, [])
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, 0.99) / 1000
+
+    def timeout(self, operation):
+        """Seconds to wait for something that is expected to happen."""
+        p99 = self.p99(operation)
+        if p99 is None:
+            return self.default
+        return min(self.maximum, max(self.minimum, p99 * self.factor))
+
+    def negative_timeout(self, operation):
+        """Seconds to wait before concluding that something is not going to happen."""
+        p99 = self.p99(operation)
+        if p99 is None:
+            return self.negative_default
+        return min(self.negative_maximum, max(self.negative_minimum, p99 * self.negative_factor))
+
+    def record(self, operation, seconds):
+        self.new_samples.setdefault(operation, []).append(round(seconds * 1000, 1))
+
+    def save(self):
+        """Append this run's samples to the history file; safe with several xdist workers."""
+        if not self.path or not self.new_samples:
+            return
+        with open(self.path + ".lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            history = self._read()
+            for operation, samples in self.new_samples.items():
+                # Keep only the most recent samples so the history follows the environment
+                history[operation] = (history.get(operation, []) + samples)[-self.max_samples:]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"operations": history}, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.new_samples = {}